@@ -0,0 +1,79 @@
+"""
+Shared helpers for the benchmarks. They are plain scripts (run them from the repository root,
+e.g. `python benchmarks/bench_scan.py`) and work on Linux as well as on Windows.
+"""
+import os
+import sys
+import time
+import types
+import atexit
+import shutil
+import tempfile
+from typing import Callable
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp(prefix='sm-bench-')
+atexit.register(shutil.rmtree, TMP, ignore_errors=True)
+
+sys.path.insert(0, ROOT)
+
+# Windows-only environment used by StartMenu.default_dirs and config
+for _var in ('SystemDrive', 'AppData', 'PROGRAMDATA'):
+    os.environ.setdefault(_var, os.path.join(TMP, _var.lower()))
+
+
+def import_menu() -> types.ModuleType:
+    """
+    Import cleaner.menu from the repository (importing it has no side effects and doesn't import the Qt GUI).
+    """
+    import cleaner.menu
+    return cleaner.menu
+
+
+def make_tree(root: str, folders: int, shortcuts: int, depth: int = 1, noise: int = 1) -> int:
+    """
+    Build a synthetic Start Menu root: `folders` top-level folders, each with `shortcuts` shortcuts spread over
+    `depth` nested levels plus `noise` non-shortcut files per level. Returns count of created entries.
+    """
+    created = 0
+
+    for f in range(folders):
+        path = os.path.join(root, f'Folder {f}')
+
+        for level in range(depth):
+            os.makedirs(path, exist_ok=True)
+            created += 1
+
+            for s in range(level, shortcuts, depth):
+                ext = '.url' if s % 5 == 0 else '.lnk'
+                open(os.path.join(path, f'Shortcut {s}{ext}'), 'wb').close()
+                created += 1
+
+            for n in range(noise):
+                open(os.path.join(path, f'readme {n}.txt'), 'wb').close()
+                created += 1
+
+            path = os.path.join(path, f'Level {level + 1}')
+
+    return created
+
+
+def best_of(fn: Callable, repeat: int = 5) -> float:
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def report(title: str, rows: list[tuple[str, float]], baseline: str = None):
+    print(f'\n{title}')
+    base = dict(rows).get(baseline) if baseline else None
+
+    for name, seconds in rows:
+        ratio = f'  x{base / seconds:.2f}' if base and seconds else ''
+        print(f'  {name:<32} {seconds * 1000:10.2f} ms{ratio}')
@@ -0,0 +1,144 @@
+"""
+Shortcut fixtures: Shell Link (MS-SHLLINK) binaries builder for fixtures and synthetic corpora, fixture checker.
+"""
+import os
+import json
+import ntpath
+import struct
+from typing import Callable
+
+from _common import TMP
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+LINK_CLSID = bytes.fromhex('0114020000000000c000000000000046')
+
+
+def _cstr(s: str) -> bytes:
+    return s.encode('ascii', 'replace') + b'\x00'
+
+
+def _wstr(s: str) -> bytes:
+    return s.encode('utf-16-le') + b'\x00\x00'
+
+
+def _link_info(local: str = None, network: str = None, suffix: str = '', unicode: bool = False) -> bytes:
+    header_size = 0x24 if unicode else 0x1C
+    volume_id = struct.pack('<4I', 0x11, 3, 0x1234ABCD, 0x10) + b'\x00'
+    body, flags = b'', 0
+    base_offset = net_offset = 0
+
+    if local is not None:
+        flags |= 0x1
+        body += volume_id
+        base_offset = header_size + len(body)
+        body += _cstr(local)
+
+    elif network is not None:
+        flags |= 0x2
+        net_offset = header_size + len(body)
+        body += struct.pack('<5I', 0x14 + len(_cstr(network)), 0x2, 0x14, 0, 0x00020000) + _cstr(network)
+
+    suffix_offset = header_size + len(body)
+    body += _cstr('' if unicode else suffix)
+
+    extra = b''
+    base_offset_u = suffix_offset_u = 0
+    if unicode:
+        if local is not None:
+            base_offset_u = header_size + len(body)
+            body += _wstr(local)
+        suffix_offset_u = header_size + len(body)
+        body += _wstr(suffix)
+        extra = struct.pack('<2I', base_offset_u, suffix_offset_u)
+
+    volume_id_offset = header_size if local is not None else 0
+    header = struct.pack('<7I', header_size + len(body), header_size, flags, volume_id_offset,
+                         base_offset, net_offset, suffix_offset) + extra
+    return header + body
+
+
+def build_lnk(target: str = None,
+              *,
+              network: str = None,
+              suffix: str = '',
+              unicode_info: bool = False,
+              id_list: bool = True,
+              name: str = None,
+              relative_path: str = None,
+              working_dir: str = None,
+              arguments: str = None,
+              icon_location: str = None,
+              icon_index: int = 0,
+              env_target: str = None,
+              extra_size: int = 0,
+              is_unicode: bool = True) -> bytes:
+    flags = 0
+    parts = []
+
+    if id_list:
+        flags |= 0x1
+        item = struct.pack('<H', 22) + b'\x1f\x50' + bytes(18)  # root folder shell item
+        parts.append(struct.pack('<H', len(item) + 2) + item + b'\x00\x00')
+
+    if target is not None or network is not None:
+        flags |= 0x2
+        parts.append(_link_info(target, network, suffix, unicode_info))
+
+    for flag, value in ((0x4, name), (0x8, relative_path), (0x10, working_dir), (0x20, arguments),
+                        (0x40, icon_location)):
+        if value is not None:
+            flags |= flag
+            data = value.encode('utf-16-le' if is_unicode else 'ascii')
+            parts.append(struct.pack('<H', len(value)) + data)
+
+    if is_unicode:
+        flags |= 0x80
+
+    if env_target is not None:
+        flags |= 0x200
+        ansi = env_target.encode('ascii').ljust(260, b'\x00')
+        wide = env_target.encode('utf-16-le').ljust(520, b'\x00')
+        parts.append(struct.pack('<2I', 0x314, 0xA0000001) + ansi + wide)
+
+    if extra_size:  # opaque PropertyStoreDataBlock, as large stores embedded by some installers
+        parts.append(struct.pack('<2I', 8 + extra_size, 0xA0000009) + bytes(extra_size))
+
+    parts.append(b'\x00\x00\x00\x00')  # TerminalBlock
+
+    header = struct.pack('<I16sIIQQQIiIHHII', 0x4C, LINK_CLSID, flags, 0x20, 0, 0, 0, 0, icon_index, 1, 0, 0, 0, 0)
+    return header + b''.join(parts)
+
+
+def check_fixtures(corpus: str, parse: Callable, error: type[Exception]):
+    """
+    Parse every file of fixtures/<corpus> and compare with its expected.json.
+    """
+    directory = os.path.join(FIXTURES, corpus)
+    os.environ['BENCH_LNK_ROOT'] = os.path.join(TMP, 'env-root')
+
+    with open(os.path.join(directory, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+
+    for name, fields in expected.items():
+        path = os.path.join(directory, name)
+
+        if 'error' in fields:
+            try:
+                parse(path)
+            except error:
+                continue
+
+            raise AssertionError(f'{name}: {error.__name__} expected')
+
+        if '{dir}' in fields['target']:
+            fields['target'] = os.path.normpath(fields['target'].format(dir=directory))
+
+        fields['target'] = ntpath.expandvars(fields['target'])
+        info = parse(path)
+        actual = {n: getattr(info, n) for n in fields}
+        assert actual == fields, f'{name}: {actual} != {fields}'
+
+    print(f'{len(expected)} {corpus} fixtures parsed as expected')
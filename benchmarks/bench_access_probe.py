@@ -0,0 +1,54 @@
+"""
+StartMenuDir accessibility check: the write probe (create and remove tmp.tmp) versus the read-only check
+(utils.can_write_dir), and StartMenu.update() with the short-lived result cache. The read-only check must leave
+the directory untouched (same listing and mtime).
+"""
+import os
+import argparse
+
+from _common import TMP, import_menu, best_of, report
+
+menu = import_menu()
+
+
+def probe(path: str, count: int, *, write_probe: bool, ttl: float = 0) -> list[bool]:
+    d = menu.StartMenuDir(path, 'user')
+    d.write_probe = write_probe
+    d.access_ttl = ttl
+    results = []
+
+    for _ in range(count):
+        d.update_accessibility()
+        results.append(d.is_accessible)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=1000)
+    args = parser.parse_args()
+
+    path = os.path.join(TMP, 'Programs')
+    os.makedirs(os.path.join(path, 'Folder'))
+    missing = os.path.join(TMP, 'missing')
+
+    assert all(probe(path, 3, write_probe=True)) and all(probe(path, 3, write_probe=False))
+    assert not any(probe(missing, 3, write_probe=True)) and not any(probe(missing, 3, write_probe=False))
+
+    mtime = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(mtime - 10 ** 9, mtime - 10 ** 9))  # so a write in the same clock tick would show up
+    mtime = os.stat(path).st_mtime_ns
+    probe(path, args.count, write_probe=False)
+    assert os.stat(path).st_mtime_ns == mtime and os.listdir(path) == ['Folder'], 'read-only check wrote'
+
+    report(f'{args.count} accessibility checks of a Start Menu dir', [
+        ('write probe (tmp.tmp)', best_of(lambda: probe(path, args.count, write_probe=True), 3)),
+        ('read-only check', best_of(lambda: probe(path, args.count, write_probe=False), 3)),
+        ('read-only check, 1 s cache', best_of(lambda: probe(path, args.count, write_probe=False, ttl=1), 3)),
+        ('missing dir, read-only check', best_of(lambda: probe(missing, args.count, write_probe=False), 3)),
+    ], baseline='write probe (tmp.tmp)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+menu.find_broken_shortcuts versus resolving every target and checking it by os.path.exists one by one.
+Shortcuts point to executables of synthetic "apps", a part of the apps is uninstalled (their directory is
+missing) and a part lost some files. A warm Linux page cache answers stat in ~1 us, so by default (local
+drives) targets are resolved and stat'ed serially; parallel stats (used for many targets on network drives) only
+pay off with a real latency: --stat-latency emulates it with a GIL-releasing sleep in every stat call.
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, report
+from _lnk import build_lnk
+
+menu = import_menu()
+
+
+def make_corpus(root: str, apps: int, shortcuts_per_app: int, removed_share: float) -> tuple[list, set]:
+    sm = os.path.join(root, 'Start Menu')
+    os.makedirs(sm)
+    shortcuts, expected = [], set()
+
+    for a in range(apps):
+        app_dir = os.path.join(root, 'Program Files', f'App {a}')
+        uninstalled = a < apps * removed_share
+        if not uninstalled:
+            os.makedirs(app_dir)
+
+        for s in range(shortcuts_per_app):
+            target = os.path.join(app_dir, f'tool {s}.exe')
+            lost = uninstalled or s == 0 and a % 7 == 0
+            if not lost:
+                open(target, 'wb').close()
+
+            path = os.path.join(sm, f'App {a} tool {s}.lnk')
+            with open(path, 'wb') as f:
+                f.write(build_lnk(target))
+
+            shortcuts.append(menu.StartMenuShortcut(path))
+            if lost:
+                expected.add(path)
+
+    return shortcuts, expected
+
+
+def count_stats(fn, latency: float = 0, repeat: int = 1) -> tuple[float, int, object]:  # -> best time, stats per call
+    calls = 0
+    stat = os.stat
+
+    def counting_stat(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if latency:
+            time.sleep(latency)
+        return stat(*args, **kwargs)
+
+    os.stat = counting_stat
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+
+        return best, calls // repeat, result
+    finally:
+        os.stat = stat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--apps', type=int, default=2000)
+    parser.add_argument('--shortcuts-per-app', type=int, default=10)
+    parser.add_argument('--removed-share', type=float, default=0.3)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stat-latency', type=float, default=0, help='microseconds added to every stat call')
+    args = parser.parse_args()
+
+    shortcuts, expected = make_corpus(os.path.join(TMP, 'corpus'), args.apps, args.shortcuts_per_app,
+                                      args.removed_share)
+
+    def naive():
+        return [r for r in menu.resolve_targets(shortcuts, mode='serial') if not os.path.exists(r.target)]
+
+    latency = args.stat_latency / 10 ** 6
+    naive_time, naive_stats, naive_broken = count_stats(naive, latency, args.repeat)
+    assert {r.shortcut.path for r in naive_broken} == expected
+    rows = [('resolve + os.path.exists', naive_time)]
+
+    for title, kwargs in (('default', {}), ('thread resolve', {'mode': 'thread'}),
+                          ('parallel stats', {'parallel': True})):
+        find = lambda: menu.find_broken_shortcuts(shortcuts, workers=args.workers, **kwargs)
+        seconds, stats, broken = count_stats(find, latency, args.repeat)
+        assert {r.shortcut.path for r in broken} == expected
+        rows.append((f'find_broken ({title})', seconds))
+
+    report(f'Find {len(expected)} broken of {len(shortcuts)} shortcuts ({naive_stats} vs {stats} stat calls, '
+           f'{args.workers} stat workers, +{args.stat_latency:g} us per stat)', rows, baseline='resolve + os.path.exists')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Startup time of the headless mode (`start.py --headless ... --dry-run` on an empty Start Menu) against a budget,
+and a check that PyQt6 is never imported by it (from `python -X importtime` output). Import of the GUI module
+is timed for comparison. Exits with 1 if the budget is exceeded.
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+from _common import ROOT, TMP, report
+
+
+def run(args: list[str]) -> tuple[float, str]:
+    env = dict(os.environ, SystemDrive=TMP, AppData=os.path.join(TMP, 'appdata'),
+               PROGRAMDATA=os.path.join(TMP, 'programdata'), QT_QPA_PLATFORM='offscreen')
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT, env=env, capture_output=True,
+                          text=True)
+    elapsed = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        raise RuntimeError(f'{args} failed:\n{proc.stderr[-2000:]}')
+
+    return elapsed, proc.stderr
+
+
+def imported(importtime: str) -> set[str]:
+    return {line.rsplit('|', 1)[-1].strip() for line in importtime.splitlines() if line.startswith('import time:')}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=400)
+    args = parser.parse_args()
+
+    headless = ['start.py', '--headless', '--folders', 'Nothing', '--remove', '--dry-run']
+    gui = ['-c', 'import cleaner.gui']
+
+    headless_time = min(run(headless)[0] for _ in range(args.repeat))
+    modules = imported(run(headless)[1])
+    assert not any(m.split('.')[0] in ('PyQt6', 'qt_material', 'winsound') for m in modules), 'GUI is imported'
+
+    try:
+        gui_time = min(run(gui)[0] for _ in range(args.repeat))
+    except RuntimeError as e:  # e.g. no winsound off Windows
+        print(f'GUI import is not timed: {str(e).splitlines()[-1]}')
+        gui_time = None
+
+    report(f'Startup, {len(modules)} modules imported by the headless mode (budget {args.budget_ms:g} ms)',
+           [('headless --dry-run', headless_time)] + ([('import cleaner.gui', gui_time)] if gui_time else []))
+
+    if headless_time * 1000 > args.budget_ms:
+        print(f'Headless startup {headless_time * 1000:.0f} ms exceeds the budget')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
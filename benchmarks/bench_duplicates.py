@@ -0,0 +1,92 @@
+"""
+menu.find_duplicate_shortcuts (one pass over a dict index) versus pairwise comparison of resolved targets on
+a menu where a part of the user-dir shortcuts duplicate the system-dir ones.
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, report
+from _lnk import build_lnk
+
+menu = import_menu()
+
+
+def make_menu(root: str, count: int, duplicate_share: float) -> list:
+    system, user = os.path.join(root, 'system'), os.path.join(root, 'user')
+    menu.StartMenu.default_dirs = type(menu.StartMenu.default_dirs)(
+        menu.StartMenuDir(system, 'system'), menu.StartMenuDir(user, 'user')
+    )
+    shortcuts = []
+    duplicates = int(count * duplicate_share / 2)
+
+    for i in range(count - duplicates):
+        folder = os.path.join(system if i % 2 else user, f'App {i // 10}')
+        os.makedirs(folder, exist_ok=True)
+
+        target = f'C:\\Program Files\\App {i // 10}\\tool {i % 10}.exe'
+        paths = [os.path.join(folder, f'Tool {i}.lnk')]
+        if i < duplicates:  # same shortcut in the other root, with different target case
+            other = os.path.join(user if i % 2 else system, f'App {i // 10}')
+            os.makedirs(other, exist_ok=True)
+            paths.append(os.path.join(other, f'Tool {i}.lnk'))
+
+        for n, p in enumerate(paths):
+            with open(p, 'wb') as f:
+                f.write(build_lnk(target.upper() if n else target, arguments='--run'))
+            shortcuts.append(menu.StartMenuShortcut(p))
+
+    return shortcuts
+
+
+def pairwise(shortcuts: list) -> list[list]:
+    resolved = [r for r in menu.resolve_targets(shortcuts, mode='serial') if r.target]
+    grouped, groups = set(), []
+
+    for i, a in enumerate(resolved):
+        if i in grouped:
+            continue
+
+        group = [a.shortcut]
+        for j in range(i + 1, len(resolved)):
+            b = resolved[j]
+            if a.target.lower() == b.target.lower() and a.info.arguments == b.info.arguments:
+                group.append(b.shortcut)
+                grouped.add(j)
+
+        if len(group) > 1:
+            groups.append(group)
+
+    return groups
+
+
+def timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--duplicate-share', type=float, default=0.2)
+    args = parser.parse_args()
+
+    shortcuts = make_menu(os.path.join(TMP, 'menu'), args.count, args.duplicate_share)
+
+    pairwise_time, expected = timed(lambda: pairwise(shortcuts))
+    index_time, groups = timed(lambda: menu.find_duplicate_shortcuts(shortcuts, mode='serial'))
+
+    system = menu.StartMenu.default_dirs.system.path
+    assert sorted(sorted(s.path for s in g) for g in expected) == sorted(sorted(s.path for s in g.shortcuts)
+                                                                         for g in groups)
+    assert all(g.keep.path.startswith(system) for g in groups), 'system-dir shortcut is suggested to keep'
+
+    report(f'Find {len(groups)} duplicate groups among {len(shortcuts)} shortcuts', [
+        ('pairwise comparison', pairwise_time),
+        ('find_duplicate_shortcuts', index_time),
+    ], baseline='pairwise comparison')
+
+
+if __name__ == '__main__':
+    main()
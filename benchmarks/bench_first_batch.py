@@ -0,0 +1,44 @@
+"""
+Time until the first folders batch of StartMenu.iter_folders is available (what the window shows first)
+compared with the full StartMenu.get_folders scan.
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, make_tree, best_of, report
+
+
+menu = import_menu()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=1000)
+    parser.add_argument('--shortcuts', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    roots = [os.path.join(TMP, 'system'), os.path.join(TMP, 'user')]
+    entries = sum(make_tree(r, args.folders, args.shortcuts, depth=2) for r in roots)
+    dirs = [menu.StartMenuDir(roots[0], 'system'), menu.StartMenuDir(roots[1], 'user')]
+    menu.StartMenu.default_dirs = dirs
+
+    def first_batch():
+        it = menu.StartMenu.iter_folders(dirs, batch_size=args.batch_size)
+        next(it)
+        it.close()
+
+    start = time.perf_counter()
+    batches = list(menu.StartMenu.iter_folders(dirs, batch_size=args.batch_size))
+    print(f'{len(batches)} batches in {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    report(f'Scan of {entries} entries', [
+        ('get_folders', best_of(menu.StartMenu.get_folders, args.repeat)),
+        ('iter_folders first batch', best_of(first_batch, args.repeat)),
+    ], baseline='get_folders')
+
+
+if __name__ == '__main__':
+    main()
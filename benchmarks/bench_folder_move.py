@@ -0,0 +1,60 @@
+"""
+StartMenuFolder.move: one rename of the whole folder (destination doesn't exist) versus the file by file
+utils.rmove_dir merge (destination exists), on deep trees.
+"""
+import os
+import time
+import shutil
+import argparse
+
+from _common import TMP, report
+
+os.environ['HOME'] = TMP  # freedesktop trash backend: trash on the same device, in a temp XDG_DATA_HOME
+os.environ['XDG_DATA_HOME'] = os.path.join(TMP, 'xdg')
+
+from _common import import_menu, make_tree
+
+menu = import_menu()
+
+
+def measure(args, merge: bool) -> float:
+    best = float('inf')
+
+    for _ in range(args.repeat):
+        root, dest = os.path.join(TMP, 'root'), os.path.join(TMP, 'dest')
+        for p in (root, dest, os.environ['XDG_DATA_HOME']):
+            shutil.rmtree(p, ignore_errors=True)
+
+        make_tree(root, args.folders, args.shortcuts, args.depth)
+        os.makedirs(dest)
+        folders = [menu.StartMenuFolder(os.path.join(root, n), shortcuts=[]) for n in os.listdir(root)]
+        if merge:
+            for f in folders:
+                os.makedirs(os.path.join(dest, f.name))
+
+        start = time.perf_counter()
+        for f in folders:
+            f.move(dest)
+        best = min(best, time.perf_counter() - start)
+
+        assert not os.listdir(root)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=50)
+    parser.add_argument('--shortcuts', type=int, default=40)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    report(f'Move {args.folders} folders (depth {args.depth}, {args.shortcuts} shortcuts each)', [
+        ('merge (rmove_dir)', measure(args, merge=True)),
+        ('rename (os.replace)', measure(args, merge=False)),
+    ], baseline='merge (rmove_dir)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+On-disk icon cache (cache.IconCache) across launches: the first (cold) launch renders every icon with the shell
+provider, a warm launch of an unchanged menu must get all of them from the cache without asking the provider.
+The provider is fake (fixed PNG-sized blobs, --extract-ms per call), so it runs on any platform; icons are keyed
+and stamped as gui.IconLoader does it.
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, report
+
+import_menu()
+from cleaner.cache import IconCache
+
+
+class FakeProvider:
+    def __init__(self, delay: float, blob_size: int):
+        self.delay = delay
+        self.blob_size = blob_size
+        self.calls = 0
+
+    def render(self, source: str) -> bytes:
+        self.calls += 1
+        time.sleep(self.delay)
+        return source.encode()[:self.blob_size].ljust(self.blob_size, b'\0')
+
+
+def make_targets(shortcuts: int) -> list[str]:
+    root = os.path.join(TMP, 'Program Files')
+    targets = []
+
+    for s in range(shortcuts):
+        app_dir = os.path.join(root, f'App {s // 3}')
+        os.makedirs(app_dir, exist_ok=True)
+        target = os.path.join(app_dir, 'app.exe' if s % 3 == 0 else 'uninstall.exe' if s % 3 == 1 else 'readme.txt')
+        with open(target, 'wb') as f:
+            f.write(b'MZ' * (s % 50 + 1))
+
+        targets.append(target)
+
+    return targets
+
+
+def key_of(target: str) -> tuple[str, int, int]:  # as IconLoader.keyOf and stampOf
+    if target.endswith('.exe'):
+        st = os.stat(target)
+        return f'path|{os.path.normcase(target)}', st.st_mtime_ns, st.st_size
+
+    return f'ext|{os.path.splitext(target)[1]}', 0, 0
+
+
+def launch(path: str, targets: list[str], provider: FakeProvider, budget: int) -> tuple[float, IconCache]:
+    start = time.perf_counter()
+    cache = IconCache(path, budget)
+    loaded = set()
+
+    for target in targets:
+        key, mtime_ns, size = key_of(target)
+        if key in loaded:  # shared in memory by IconLoader
+            continue
+
+        if cache.get(key, mtime_ns, size) is None:
+            cache.set(key, mtime_ns, size, provider.render(target))
+
+        loaded.add(key)
+
+    cache.save()
+    return time.perf_counter() - start, cache
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shortcuts', type=int, default=3000)
+    parser.add_argument('--extract-ms', type=float, default=2.0, help='simulated cost of one shell extraction')
+    parser.add_argument('--blob', type=int, default=1500, help='bytes of rendered icons (16 and 32 px PNG)')
+    args = parser.parse_args()
+
+    targets = make_targets(args.shortcuts)
+    path = os.path.join(TMP, 'icon-cache.sqlite')
+    budget = 16 << 20
+    provider = FakeProvider(args.extract_ms / 1000, args.blob)
+
+    cold, _ = launch(path, targets, provider, budget)
+    cold_calls, provider.calls = provider.calls, 0
+
+    warm, cache = launch(path, targets, provider, budget)
+    assert provider.calls == 0, f'warm launch asked the provider {provider.calls} times'
+    assert cache.misses == 0 and cache.hits == cold_calls, (cache.hits, cache.misses)
+
+    with open(targets[0], 'ab') as f:  # an updated app has a new icon
+        f.write(b'MZ')
+    launch(path, targets, provider, budget)
+    assert provider.calls == 1, provider.calls
+    provider.calls = 0
+
+    half = cold_calls * args.blob // 2
+    small = os.path.join(TMP, 'icon-cache-small.sqlite')
+    launch(small, targets, provider, half)
+    provider.calls = 0
+    _, cache = launch(small, targets, provider, half)
+    assert cache.total <= half, cache.total
+
+    report(f'{args.shortcuts} shortcuts, {cold_calls} distinct icons, {args.extract_ms} ms per extraction', [
+        ('cold launch (shell provider)', cold),
+        ('warm launch (disk cache)', warm),
+    ], baseline='cold launch (shell provider)')
+    print(f'\nCache file {os.path.getsize(path) >> 10} KiB; with a budget of half the icons a relaunch '
+          f'renders {provider.calls} icons again (LRU), keeping {cache.total >> 10} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Shortcuts icons: the former synchronous QFileIconProvider call for every shortcut while the list is built versus
+gui.IconLoader, which loads icons of painted rows only in a background thread and shares them by key (target path
+of .exe, extension of documents). Shell extraction is slow on Windows, so every extraction is charged
+--extract-ms in both variants. Needs the GUI dependencies (PyQt6, winsound on Windows).
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, report
+from _lnk import build_lnk
+
+
+def make_shortcuts(menu, apps: int) -> list:
+    root, sm = os.path.join(TMP, 'Program Files'), os.path.join(TMP, 'Programs')
+    folders = []
+
+    for a in range(apps):
+        app_dir, folder_dir = os.path.join(root, f'App {a}'), os.path.join(sm, f'App {a}')
+        os.makedirs(app_dir)
+        os.makedirs(folder_dir)
+        shortcuts = []
+
+        for name, target in (('App', 'app.exe'), ('Uninstall', 'uninstall.exe'), ('Readme', 'readme.txt'),
+                             ('Manual', 'manual.pdf')):
+            open(os.path.join(app_dir, target), 'wb').close()
+            path = os.path.join(folder_dir, f'{name} {a}.lnk')
+            with open(path, 'wb') as f:
+                f.write(build_lnk(os.path.join(app_dir, target)))
+
+            shortcuts.append(menu.StartMenuShortcut(path))
+
+        folders.append(menu.StartMenuFolder(folder_dir, shortcuts=shortcuts))
+
+    return folders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--apps', type=int, default=250, help='folders of 4 shortcuts')
+    parser.add_argument('--extract-ms', type=float, default=2.0, help='simulated cost of one shell extraction')
+    args = parser.parse_args()
+
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    menu = import_menu()
+    try:
+        from PyQt6 import QtWidgets as widgets, QtCore as core
+        from cleaner import gui
+    except ImportError as e:  # e.g. no winsound off Windows
+        return print(f'GUI is not available: {e}')
+
+    folders = make_shortcuts(menu, args.apps)
+    shortcuts = [s for f in folders for s in f.shortcuts]
+    app = widgets.QApplication([])
+    delay = args.extract_ms / 1000
+
+    # former way: an icon of every shortcut before the list is shown
+    provider = widgets.QFileIconProvider()
+    start = time.perf_counter()
+    for shortcut in shortcuts:
+        provider.icon(core.QFileInfo(shortcut.path)).pixmap(16)
+        time.sleep(delay)
+    sync_time = time.perf_counter() - start
+
+    # IconLoader: rows painted with placeholders at once, icons come later
+    render = gui.IconLoader.render
+    gui.IconLoader.render = lambda self, key, source: (time.sleep(delay), render(self, key, source))[1]
+
+    start = time.perf_counter()
+    view = widgets.QTreeView()
+    model = gui.ShortcutModel(view)
+    view.setModel(model)
+    view.setUniformRowHeights(True)
+    for folder in folders:
+        model.insertFolder(folder)
+    view.expandAll()
+    view.resize(250, 275)
+    view.show()
+    view.grab()
+    first_paint = time.perf_counter() - start
+
+    def wait_icons():
+        while model.iconRequests:
+            app.processEvents()
+            time.sleep(0.001)
+        view.grab()
+
+    wait_icons()
+    visible_icons = time.perf_counter() - start
+    visible_loads = model.iconLoader.loads
+
+    scrollbar = view.verticalScrollBar()
+    while scrollbar.value() < scrollbar.maximum():
+        scrollbar.setValue(scrollbar.value() + scrollbar.pageStep())
+        view.grab()
+        wait_icons()
+    all_icons = time.perf_counter() - start
+
+    loader = model.iconLoader
+    loader.stop()
+    assert loader.loads == len(set(loader.cache)) <= args.apps * 2 + 2, loader.loads
+
+    report(f'{len(shortcuts)} shortcuts, {args.extract_ms} ms per extraction', [
+        ('synchronous icons before showing', sync_time),
+        ('IconLoader: first paint', first_paint),
+        ('IconLoader: visible icons loaded', visible_icons),
+        ('IconLoader: scrolled to the end', all_icons),
+    ], baseline='synchronous icons before showing')
+    print(f'\nExtractions: synchronous {len(shortcuts)}, IconLoader {visible_loads} for the first page, '
+          f'{loader.loads} after scrolling ({loader.hits} cache hits)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold import of the non-GUI modules (`python -X importtime -c "import cleaner.menu"`) against a budget. Importing
+must have no side effects: no config / caches created in PROGRAMDATA, no Start Menu access probes, and neither
+the GUI (PyQt6) nor multiprocessing imported. Exits with 1 if the budget is exceeded.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+from _common import ROOT, TMP, report
+
+
+FORBIDDEN = ('PyQt6', 'qt_material', 'winsound', 'multiprocessing', 'cleaner.gui', 'cleaner.config')
+
+
+def importtime(module: str, env_dir: str) -> dict[str, int]:  # -> {module: cumulative us}
+    env = dict(os.environ, SystemDrive=env_dir, AppData=os.path.join(env_dir, 'appdata'),
+               PROGRAMDATA=os.path.join(env_dir, 'programdata'), PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=env_dir, env=env,
+                          capture_output=True, text=True)
+
+    if proc.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{proc.stderr[-2000:]}')
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('| imported package'):
+            _, cumulative, name = line.split('|')
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=150)
+    parser.add_argument('--top', type=int, default=8, help='heaviest imports to show')
+    args = parser.parse_args()
+
+    env_dir = os.path.join(TMP, 'env')
+    os.makedirs(env_dir)
+
+    runs = [importtime('cleaner.menu', env_dir) for _ in range(args.repeat)]
+    best = min(runs, key=lambda t: t['cleaner.menu'])
+
+    assert not os.listdir(env_dir), f'import has side effects: {os.listdir(env_dir)} created'
+    assert not [m for m in best if m.split('.')[0] in FORBIDDEN or m in FORBIDDEN], 'forbidden module imported'
+
+    heaviest = sorted((t, m) for m, t in best.items() if m != 'cleaner.menu')[-args.top:]
+    report(f'Import of cleaner.menu, {len(best)} modules (budget {args.budget_ms:g} ms)',
+           [('cleaner.menu', best['cleaner.menu'] / 1e6)] + [(f'  {m}', t / 1e6) for t, m in reversed(heaviest)])
+
+    if best['cleaner.menu'] / 1000 > args.budget_ms:
+        print(f'Import {best["cleaner.menu"] / 1000:.0f} ms exceeds the budget')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
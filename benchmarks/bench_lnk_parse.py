@@ -0,0 +1,79 @@
+"""
+.lnk parsing: the old whole-file struct/slicing get_link_target versus links.parse_lnk. First the fixture corpus
+(fixtures/lnk, see fixtures/make_fixtures.py) is checked against expected.json, then the speed is compared
+on the only variant the old parser supports (ANSI local path). parse_lnk decodes only the StringData the cleaner
+uses (relative path, arguments, icon location) and never reads past the sections it needs, which wins on files
+with large ExtraData.
+"""
+import os
+import struct
+import locale
+import argparse
+
+from _common import TMP, import_menu, best_of, report
+from _lnk import build_lnk, check_fixtures
+
+links = import_menu().links
+
+def legacy_get_link_target(path: str) -> str:  # StartMenuShortcut.get_link_target before links.py
+    with open(path, 'rb') as stream:
+        content = stream.read()
+        lflags = struct.unpack('I', content[0x14:0x18])[0]
+        position = 0x18
+        if (lflags & 0x01) == 1:
+            position = struct.unpack('H', content[0x4C:0x4E])[0] + 0x4E
+        last_pos = position
+        position += 0x04
+        length = struct.unpack('I', content[last_pos:position])[0]
+        position += 0x0C
+        lbpos = struct.unpack('I', content[position:position + 0x04])[0]
+        position = last_pos + lbpos
+        size = (length + last_pos) - position - 0x02
+        content = content[position:position + size].split(b'\x00', 1)
+        return content[-1].decode('utf-16' if len(content) > 1 else locale.getpreferredencoding(False))
+
+
+def make_corpus(directory: str, count: int, extra_size: int = 0) -> list[str]:
+    os.makedirs(directory)
+    paths = []
+
+    for i in range(count):
+        path = os.path.join(directory, f'Shortcut {i}.lnk')
+        with open(path, 'wb') as f:
+            f.write(build_lnk(f'C:\\Program Files\\App {i}\\app.exe', working_dir=f'C:\\Program Files\\App {i}',
+                              icon_location=f'C:\\Program Files\\App {i}\\app.ico', extra_size=extra_size))
+        paths.append(path)
+
+    return paths
+
+
+def compare(title: str, paths: list[str], repeat: int):
+    assert [legacy_get_link_target(p) for p in paths] == [links.parse_lnk(p).target for p in paths]
+    legacy = new = float('inf')
+
+    for _ in range(repeat):  # interleaved, a noisy moment doesn't favour one of them
+        legacy = min(legacy, best_of(lambda: [legacy_get_link_target(p) for p in paths], 1))
+        new = min(new, best_of(lambda: [links.parse_lnk(p) for p in paths], 1))
+
+    report(f'{title} ({len(paths) / legacy:.0f} vs {len(paths) / new:.0f} files/s)', [
+        ('legacy get_link_target', legacy),
+        ('links.parse_lnk', new),
+    ], baseline='legacy get_link_target')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--extra-size', type=int, default=64 * 1024,
+                        help='size of the ExtraData block in the "large" corpus')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    check_fixtures('lnk', lambda p: links.parse_lnk(p, all_strings=True), links.LinkParseError)
+    compare(f'Parse {args.count} small .lnk files', make_corpus(os.path.join(TMP, 'small'), args.count), args.repeat)
+    compare(f'Parse {args.count} .lnk files with {args.extra_size // 1024} KiB ExtraData',
+            make_corpus(os.path.join(TMP, 'large'), args.count, args.extra_size), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Scaling of folders merging (StartMenu.merge_folders) against the previous linear search loop.
+Time per folder should stay flat while the folders count grows.
+"""
+import argparse
+
+from _common import import_menu, best_of, report
+
+
+menu = import_menu()
+
+
+def legacy_merge(new_folders: list) -> list:
+    folders = []
+
+    for new_folder in new_folders:
+        for index, folder in enumerate(folders):
+            if folder.name == new_folder.name:
+                folders[index] = menu.StartMenuExtendedFolder([folder, new_folder])
+                break
+
+        else:
+            folders.append(new_folder)
+
+    folders.sort(key=lambda x: x.name.lower())
+    return folders
+
+
+def make_folders(count: int) -> list:
+    # half of the user root folders also exist in the system root
+    system = [menu.StartMenuFolder(f'system/Folder {i}', shortcuts=[]) for i in range(count // 2)]
+    user = [menu.StartMenuFolder(f'user/Folder {i}', shortcuts=[]) for i in range(count // 4, count // 4 + count // 2)]
+    return system + user
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        folders = make_folders(size)
+        assert [f.name for f in legacy_merge(folders)] == [f.name for f in menu.StartMenu.merge_folders(folders)]
+
+        legacy = best_of(lambda: legacy_merge(folders), args.repeat)
+        indexed = best_of(lambda: menu.StartMenu.merge_folders(folders), args.repeat)
+        report(f'{size} folders (time per folder: legacy {legacy / size * 1e6:.2f} us, '
+               f'indexed {indexed / size * 1e6:.2f} us)', [
+            ('enumerate loop', legacy),
+            ('name-keyed index', indexed),
+        ], baseline='enumerate loop')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Memory of the scanned data model: the former dict-backed StartMenuShortcut / StartMenuFolder (full path, name and
+extension strings in each object __dict__) versus the __slots__ ones with interned extensions, measured by
+tracemalloc per 10k shortcuts of a terminal-server-like menu (many users, same folder layout). Access time of the
+path is shown too: it is stored, a path joined from interned parts took ~1.5x less memory but was ~9x slower to read.
+"""
+import os
+import gc
+import argparse
+import tracemalloc
+
+from _common import TMP, import_menu, best_of, report
+
+menu = import_menu()
+
+
+class DictShortcut:  # former StartMenuShortcut fields
+    def __init__(self, ph: str):
+        self.path: str = ph
+        self.name, self.ext = os.path.splitext(os.path.basename(ph))
+
+
+class DictFolder:  # former StartMenuFolder fields
+    def __init__(self, path: str, *, shortcuts: list):
+        self.path: str = path
+        self.name = os.path.basename(path)
+        self.shortcuts = shortcuts
+
+
+def scanned_paths(users: int, folders: int, shortcuts: int):  # -> (folder path, shortcuts paths) as a scan gives
+    for u in range(users):
+        root = os.path.join(TMP, 'Users', f'user{u}', 'AppData', 'Roaming', 'Microsoft', 'Windows', 'Start Menu',
+                            'Programs')
+        for f in range(folders):
+            path = os.path.join(root, f'Vendor {f} Application Suite')
+            yield path, [os.path.join(path, 'Tools' if s % 2 else '', f'Application {f} tool {s}.lnk')
+                         for s in range(shortcuts)]
+
+
+def measure(shortcut_class, folder_class, args) -> tuple[int, list]:
+    gc.collect()
+    tracemalloc.start()
+    folders = [folder_class(path, shortcuts=[shortcut_class(p) for p in paths])
+               for path, paths in scanned_paths(args.users, args.folders, args.shortcuts)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, folders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--folders', type=int, default=40, help='folders per user')
+    parser.add_argument('--shortcuts', type=int, default=10, help='shortcuts per folder')
+    args = parser.parse_args()
+    count = args.users * args.folders * args.shortcuts
+
+    dict_size, dict_folders = measure(DictShortcut, DictFolder, args)
+    slots_size, slots_folders = measure(menu.StartMenuShortcut, menu.StartMenuFolder, args)
+
+    dict_shortcuts = [s for f in dict_folders for s in f.shortcuts]
+    slots_shortcuts = [s for f in slots_folders for s in f.shortcuts]
+    assert [s.path for s in dict_shortcuts] == [s.path for s in slots_shortcuts]
+    assert [(s.name, s.ext) for s in dict_shortcuts] == [(s.name, s.ext) for s in slots_shortcuts]
+    assert not hasattr(slots_shortcuts[0], '__dict__') and not hasattr(slots_folders[0], '__dict__')
+
+    print(f'\n{count} shortcuts in {len(dict_folders)} folders, memory per 10k shortcuts:')
+    for title, size in (('dict-backed', dict_size), ('__slots__', slots_size)):
+        print(f'  {title:<30}{size / count * 10000 / 1024:>10.0f} KiB  x{dict_size / size:.2f}')
+
+    report(f'Read .path of {count} shortcuts', [
+        ('dict-backed (stored)', best_of(lambda: [s.path for s in dict_shortcuts], 5)),
+        ('__slots__ (stored)', best_of(lambda: [s.path for s in slots_shortcuts], 5)),
+    ], baseline='dict-backed (stored)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Sequential versus parallel (SMCleaner workers) MOVE and REMOVE of whole folders of a synthetic tree.
+Parallel mode pays off when file operations wait on I/O (recycle bin shell operations, slow or network
+disks); on a page-cached Linux file system they are CPU-bound and threads mostly add overhead.
+REMOVE paths are collected by the folder threads and sent to the trash by the cleaner thread in common batches,
+so it makes as many send2trash calls as the sequential clean (they are counted).
+"""
+import os
+import shutil
+import argparse
+
+from _common import TMP, report
+
+os.environ['HOME'] = TMP  # freedesktop trash backend: trash on the same device, in a temp XDG_DATA_HOME
+os.environ['XDG_DATA_HOME'] = os.path.join(TMP, 'xdg')
+
+from _common import import_menu, make_tree, best_of
+
+menu = import_menu()
+menu.SMCleaner.LOG.WRITE_LOG_FILE = False
+menu.SMCleaner.LOG.setLevel('WARNING')
+
+send2trash_calls = 0
+
+
+def counted_send2trash(paths):
+    global send2trash_calls
+    send2trash_calls += 1
+    return send2trash(paths)
+
+
+send2trash, menu.utils.send2trash = menu.utils.send2trash, counted_send2trash
+
+
+def run(action_name: str, workers: int, args) -> tuple[float, int]:  # -> best time, send2trash calls per clean
+    root = os.path.join(TMP, 'root')
+    dest = os.path.join(TMP, 'dest')
+
+    def setup():
+        for p in (root, dest, os.environ['XDG_DATA_HOME']):  # empty trash too, it slows down with many items
+            shutil.rmtree(p, ignore_errors=True)
+        make_tree(root, args.folders, args.shortcuts, args.depth)
+        os.makedirs(dest)
+
+    def clean():
+        menu.StartMenu.default_dirs = [menu.StartMenuDir(root, 'user')]
+        folders = menu.StartMenu.get_folders()
+        action = menu.StartMenu.clean_action.move(dest) if action_name == 'move' else \
+            menu.StartMenu.clean_action.remove()
+        result = menu.StartMenu.clean(
+            action,
+            [menu.StartMenu.folder_to_clean(f, False, [], []) for f in folders],
+            workers=workers
+        )
+        assert not result.errors and result.cleaned_folders == args.folders, result
+
+    global send2trash_calls
+    total = 0.0
+    send2trash_calls = 0
+
+    for _ in range(args.repeat):
+        setup()
+        total = min(total, best_of(clean, 1)) if total else best_of(clean, 1)
+
+    return total, send2trash_calls // args.repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=200)
+    parser.add_argument('--shortcuts', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for action in ('move', 'remove'):
+        runs = [('sequential', run(action, 1, args))]
+        runs.extend((f'{w} workers', run(action, w, args)) for w in args.workers)
+        report(f'{action.upper()} {args.folders} folders ({args.shortcuts} shortcuts each)',
+               [(name, seconds) for name, (seconds, _) in runs], baseline='sequential')
+
+        if action == 'remove':
+            print('  send2trash calls: ' + ', '.join(f'{name} {calls}' for name, (_, calls) in runs))
+
+
+if __name__ == '__main__':
+    main()
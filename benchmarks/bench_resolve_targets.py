@@ -0,0 +1,61 @@
+"""
+menu.resolve_targets in serial, thread pool and process pool modes on a synthetic mixed .lnk / .url corpus.
+Pools only pay off with several CPUs and cold (slow) storage: on a warm page cache parsing is CPU-bound under
+the GIL, and the process pool also pays for worker start-up and pickling of the results.
+"""
+import os
+import argparse
+
+from _common import TMP, import_menu, best_of, report
+from _lnk import build_lnk
+
+menu = import_menu()
+
+
+def make_corpus(directory: str, count: int) -> list:
+    os.makedirs(directory)
+    shortcuts = []
+
+    for i in range(count):
+        if i % 5 == 0:
+            path = os.path.join(directory, f'Site {i}.url')
+            data = f'[InternetShortcut]\r\nURL=https://example.com/{i}\r\nIconIndex=0\r\n'.encode()
+        else:
+            path = os.path.join(directory, f'Shortcut {i}.lnk')
+            data = build_lnk(f'C:\\Program Files\\App {i}\\app.exe', working_dir=f'C:\\Program Files\\App {i}')
+
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        shortcuts.append(menu.StartMenuShortcut(path))
+
+    with open(os.path.join(directory, 'Broken.lnk'), 'wb') as f:  # errors are returned, not raised
+        f.write(b'broken')
+    shortcuts.append(menu.StartMenuShortcut(os.path.join(directory, 'Broken.lnk')))
+
+    return shortcuts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunksize', type=int, default=256)
+    args = parser.parse_args()
+
+    shortcuts = make_corpus(os.path.join(TMP, 'corpus'), args.count)
+    expected = menu.resolve_targets(shortcuts, mode='serial')
+    assert isinstance(expected[-1].error, ValueError) and all(r.info for r in expected[:-1])
+
+    rows = []
+    for mode in ('serial', 'thread', 'process'):
+        resolve = lambda: menu.resolve_targets(shortcuts, mode=mode, workers=args.workers, chunksize=args.chunksize)
+        assert [r.target for r in resolve()] == [r.target for r in expected]
+        rows.append((mode, best_of(resolve, 3)))
+
+    report(f'Resolve {len(shortcuts)} shortcut targets ({args.workers} workers, chunks of {args.chunksize})',
+           rows, baseline='serial')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+StartMenuShortcut.get_fpath / get_rpath, as SMCleaner.clean (saved shortcuts) and relative_move (applied ones)
+call them: the former os.path.commonpath loop over StartMenu.default_dirs versus the SM dir recorded by the scan,
+and versus the prefix lookup (StartMenu.find_dir) of shortcuts created without it.
+"""
+import os
+import argparse
+
+from _common import TMP, import_menu, best_of, report
+
+menu = import_menu()
+
+
+def commonpath_fpath(shortcut) -> str:  # former get_fpath
+    for d in menu.StartMenu.default_dirs:
+        if os.path.commonpath([d.path, shortcut.path]) == d.path:
+            return d.path
+
+    raise ValueError('StartMenuShortcut.path does not belong to any dir from DEFAULT_START_MENU_SHORTCUTS_DIRS')
+
+
+def commonpath_rpath(shortcut) -> str:  # former get_rpath
+    return shortcut.path[len(commonpath_fpath(shortcut)) + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shortcuts', type=int, default=50000)
+    args = parser.parse_args()
+
+    dirs = menu.StartMenu.default_dirs = type(menu.StartMenu.default_dirs)(
+        menu.StartMenuDir(os.path.join(TMP, 'ProgramData', 'Start Menu', 'Programs'), 'system'),
+        menu.StartMenuDir(os.path.join(TMP, 'AppData', 'Start Menu', 'Programs'), 'user'),
+    )
+    paths = [(dirs[i % 2], os.path.join(dirs[i % 2].path, f'Folder {i % 500}', 'Tools' if i % 3 else '',
+                                        f'Shortcut {i}.lnk')) for i in range(args.shortcuts)]
+    scanned = [menu.StartMenuShortcut(p, d) for d, p in paths]
+
+    def lookup(fpath, rpath, shortcuts):
+        for s in shortcuts:
+            fpath(s)
+            rpath(s)
+
+    former = [(commonpath_fpath(s), commonpath_rpath(s)) for s in scanned]
+    assert [(s.get_fpath(), s.get_rpath()) for s in scanned] == former
+    unscanned = [menu.StartMenuShortcut(p) for _, p in paths]
+    assert [(s.get_fpath(), s.get_rpath()) for s in unscanned] == former
+
+    fresh = iter([[menu.StartMenuShortcut(p) for _, p in paths] for _ in range(3)])  # a new list for each run
+    report(f'get_fpath + get_rpath of {args.shortcuts} shortcuts', [
+        ('os.path.commonpath loop', best_of(lambda: lookup(commonpath_fpath, commonpath_rpath, scanned), 3)),
+        ('dir recorded by the scan', best_of(lambda: lookup(menu.StartMenuShortcut.get_fpath,
+                                                            menu.StartMenuShortcut.get_rpath, scanned), 3)),
+        ('prefix lookup (first call)', best_of(lambda: lookup(menu.StartMenuShortcut.get_fpath,
+                                                              menu.StartMenuShortcut.get_rpath, next(fresh)), 3)),
+    ], baseline='os.path.commonpath loop')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare the single-pass os.scandir scanner with the previous listdir + isdir + os.walk scan. os.walk is scandir-based
+itself, so the gain is in the per-entry work: a suffix check instead of os.path.splitext and one os.path.join per
+directory instead of one per entry.
+"""
+import os
+import argparse
+
+from _common import TMP, import_menu, make_tree, best_of, report
+
+
+menu = import_menu()
+
+
+def legacy_scan(roots: list[str]) -> int:
+    count = 0
+
+    for root in roots:
+        for item in os.listdir(root):
+            full_path = os.path.join(root, item)
+
+            if not os.path.isdir(full_path):
+                continue
+
+            count += len([
+                os.path.join(dir_data[0], sc)
+                for dir_data in list(os.walk(full_path))
+                for sc in dir_data[2] if os.path.splitext(sc)[-1] in ('.lnk', '.url')
+            ])
+
+    return count
+
+
+def scandir_scan(roots: list[str]) -> int:
+    scanner = menu.SMScanner()
+    return sum(len(shortcuts) for root in roots for _, shortcuts in scanner.scan(root))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=1000, help='top-level folders per root')
+    parser.add_argument('--shortcuts', type=int, default=12, help='shortcuts per folder')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    roots = [os.path.join(TMP, 'system'), os.path.join(TMP, 'user')]
+    entries = sum(make_tree(r, args.folders, args.shortcuts, args.depth) for r in roots)
+
+    assert legacy_scan(roots) == scandir_scan(roots)
+    report(f'Scan of {entries} entries ({len(roots)} roots)', [
+        ('listdir + isdir + os.walk', best_of(lambda: legacy_scan(roots), args.repeat)),
+        ('SMScanner (os.scandir)', best_of(lambda: scandir_scan(roots), args.repeat)),
+    ], baseline='listdir + isdir + os.walk')
+
+
+if __name__ == '__main__':
+    main()
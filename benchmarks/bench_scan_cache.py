@@ -0,0 +1,75 @@
+"""
+Cold (empty ScanCache) versus warm (unchanged tree) scan with CachedSMScanner.
+Warm scan only stats directories and doesn't list them. Cold scan (first launch) also stats every directory
+and writes the cache, the write is shown separately.
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, make_tree, best_of, report
+
+
+menu = import_menu()
+
+
+def scan(scanner, roots: list[str]) -> int:
+    count = sum(len(shortcuts) for root in roots for _, shortcuts in scanner.scan(root))
+    scanner.commit()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=400)
+    parser.add_argument('--shortcuts', type=int, default=12)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    roots = [os.path.join(TMP, 'system'), os.path.join(TMP, 'user')]
+    entries = sum(make_tree(r, args.folders, args.shortcuts, args.depth) for r in roots)
+    cache_fp = os.path.join(TMP, 'scan-cache.json')
+
+    # listings of just modified directories aren't cached, so make the tree "old"
+    past = time.time() - 60
+    for root in roots:
+        for dir_path, _, _ in os.walk(root):
+            os.utime(dir_path, (past, past))
+
+    def cold(write: bool) -> float:  # best time of scans with an empty cache, with or without its write
+        best = float('inf')
+
+        for _ in range(args.repeat):
+            if os.path.exists(cache_fp):
+                os.remove(cache_fp)
+
+            scanner = menu.CachedSMScanner(menu.ScanCache(cache_fp))
+            start = time.perf_counter()
+            for root in roots:
+                for _ in scanner.scan(root):
+                    pass
+            if write:
+                scanner.commit()
+
+            best = min(best, time.perf_counter() - start)
+
+        return best
+
+    def warm():
+        return scan(menu.CachedSMScanner(menu.ScanCache(cache_fp)), roots)
+
+    expected = scan(menu.SMScanner(), roots)
+    assert scan(menu.CachedSMScanner(menu.ScanCache(cache_fp)), roots) == expected
+    assert warm() == expected
+
+    report(f'Scan of {entries} entries ({len(roots)} roots)', [
+        ('SMScanner (no cache)', best_of(lambda: scan(menu.SMScanner(), roots), args.repeat)),
+        ('CachedSMScanner cold', cold(write=False)),
+        ('CachedSMScanner cold + write', cold(write=True)),
+        ('CachedSMScanner warm', best_of(warm, args.repeat)),
+    ], baseline='SMScanner (no cache)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Mixed .lnk / .url corpus through links.parse_shortcut, and the .url parser versus configparser.
+"""
+import os
+import argparse
+import configparser
+
+from _common import TMP, import_menu, best_of, report
+from _lnk import build_lnk, check_fixtures
+
+links = import_menu().links
+
+
+def configparser_parse_url(path: str) -> str:
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.read(path, encoding='utf-8-sig')
+    return parser.get('InternetShortcut', 'URL', fallback='')
+
+
+def make_corpus(directory: str, count: int) -> tuple[list[str], list[str]]:
+    os.makedirs(directory)
+    lnk_paths, url_paths = [], []
+
+    for i in range(count):
+        if i % 5 == 0:
+            path = os.path.join(directory, f'Site {i}.url')
+            data = (f'[{{000214A0-0000-0000-C000-000000000046}}]\r\nProp3=19,11\r\n[InternetShortcut]\r\nIDList=\r\n'
+                    f'URL=https://example.com/{i}\r\nIconIndex=0\r\nIconFile=C:\\Sites\\{i}.ico\r\n').encode()
+            url_paths.append(path)
+        else:
+            path = os.path.join(directory, f'Shortcut {i}.lnk')
+            data = build_lnk(f'C:\\Program Files\\App {i}\\app.exe', working_dir=f'C:\\Program Files\\App {i}')
+            lnk_paths.append(path)
+
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    return lnk_paths, url_paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+
+    check_fixtures('url', links.parse_url, links.LinkParseError)
+    lnk_paths, url_paths = make_corpus(os.path.join(TMP, 'corpus'), args.count)
+    paths = sorted(lnk_paths + url_paths)
+
+    assert [configparser_parse_url(p) for p in url_paths] == [links.parse_url(p).target for p in url_paths]
+
+    configparser_time = best_of(lambda: [configparser_parse_url(p) for p in url_paths], 3)
+    url_time = best_of(lambda: [links.parse_url(p) for p in url_paths], 3)
+    report(f'Parse {len(url_paths)} .url files ({len(url_paths) / configparser_time:.0f} vs '
+           f'{len(url_paths) / url_time:.0f} files/s)', [
+        ('configparser', configparser_time),
+        ('links.parse_url', url_time),
+    ], baseline='configparser')
+
+    mixed = best_of(lambda: [links.parse_shortcut(p) for p in paths], 3)
+    report(f'Parse {len(paths)} mixed shortcuts ({len(paths) / mixed:.0f} files/s)', [
+        ('links.parse_shortcut', mixed),
+    ])
+
+
+if __name__ == '__main__':
+    main()
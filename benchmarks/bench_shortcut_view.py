@@ -0,0 +1,128 @@
+"""
+Shortcut list with thousands of shortcuts: the former layout of widgets (a QLabel per folder and a QCheckBox with
+an icon per shortcut in a QVBoxLayout) versus the QTreeView over gui.ShortcutModel, in which only visible rows
+are painted. Each variant runs in its own process (offscreen Qt) to measure its peak memory, the time includes
+building, the first paint and scrolling to the end. Needs the GUI dependencies (PyQt6, winsound on Windows).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+from _common import ROOT, TMP, import_menu, report
+
+try:
+    import resource
+except ImportError:  # Windows, peak memory isn't measured
+    resource = None
+
+
+def peak_rss_kib() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+
+def build_widgets(folders: list, app) -> 'widgets.QScrollArea':
+    from PyQt6 import QtWidgets as widgets, QtCore as core
+
+    iconProvider = widgets.QFileIconProvider()
+    area, content, layout = widgets.QScrollArea(), widgets.QWidget(), widgets.QVBoxLayout()
+
+    for folder in folders:
+        layout.addWidget(widgets.QLabel(folder.name))
+
+        for shortcut in folder.shortcuts:
+            checkbox = widgets.QCheckBox(shortcut.name)
+            checkbox.setIcon(iconProvider.icon(core.QFileInfo(shortcut.path)))
+            layout.addWidget(checkbox)
+
+    layout.addStretch()
+    content.setLayout(layout)
+    area.setWidgetResizable(True)
+    area.setWidget(content)
+    return area
+
+
+def build_model_view(folders: list, app) -> 'widgets.QTreeView':
+    from PyQt6 import QtWidgets as widgets
+    from cleaner import gui  # imported before the measurements
+
+    view = widgets.QTreeView()
+    model = gui.ShortcutModel(view)
+    view.setModel(model)
+    view.setItemDelegate(gui.ShortcutDelegate(view))
+    view.setHeaderHidden(True)
+    view.setRootIsDecorated(False)
+    view.setUniformRowHeights(True)
+
+    for folder in folders:
+        model.insertFolder(folder)
+
+    view.expandAll()
+    return view
+
+
+def run_variant(variant: str, folders_count: int, shortcuts: int) -> dict:
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    menu = import_menu()
+    from PyQt6 import QtWidgets as widgets
+    if variant == 'model':
+        from cleaner import gui  # noqa: F401
+
+    root = os.path.join(TMP, 'Programs')
+    folders = [
+        menu.StartMenuFolder(os.path.join(root, f'Folder {f}'), shortcuts=[
+            menu.StartMenuShortcut(os.path.join(root, f'Folder {f}', f'Shortcut {s}.lnk')) for s in range(shortcuts)
+        ]) for f in range(folders_count)
+    ]
+
+    app = widgets.QApplication([])
+    rss = peak_rss_kib()
+    start = time.perf_counter()
+
+    view = (build_widgets if variant == 'widgets' else build_model_view)(folders, app)
+    view.resize(250, 275)
+    view.show()
+    app.processEvents()
+    view.grab()
+    built = time.perf_counter() - start
+
+    scrollbar = view.verticalScrollBar()
+    while scrollbar.value() < scrollbar.maximum():
+        scrollbar.setValue(scrollbar.value() + scrollbar.pageStep())
+        view.grab()
+
+    return {'built': built, 'total': time.perf_counter() - start,
+            'rss_kib': peak_rss_kib() - rss}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=500)
+    parser.add_argument('--shortcuts', type=int, default=10, help='shortcuts per folder')
+    parser.add_argument('--variant', choices=['widgets', 'model'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        return print(json.dumps(run_variant(args.variant, args.folders, args.shortcuts)))
+
+    results = {}
+    for variant in ('widgets', 'model'):
+        proc = subprocess.run([sys.executable, __file__, '--variant', variant, '--folders', str(args.folders),
+                               '--shortcuts', str(args.shortcuts)], cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:  # e.g. no winsound off Windows
+            return print(f'GUI is not available: {proc.stderr.strip().splitlines()[-1]}')
+
+        results[variant] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    title = f'{args.folders} folders, {args.folders * args.shortcuts} shortcuts'
+    report(f'{title}: build and first paint', [(v, r['built']) for v, r in results.items()], baseline='widgets')
+    report(f'{title}: build, paint and scroll to the end', [(v, r['total']) for v, r in results.items()],
+           baseline='widgets')
+    if resource:
+        print('\nPeak memory growth: ' + ', '.join(f'{v} {r["rss_kib"] / 1024:.1f} MiB' for v, r in results.items()))
+
+
+if __name__ == '__main__':
+    main()
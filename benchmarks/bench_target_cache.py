@@ -0,0 +1,71 @@
+"""
+menu.resolve_targets without a cache, with an empty cache.TargetCache (parse and store) and with a warm one
+(loaded from disk by a new instance, as on the next application start, no shortcut is opened).
+"""
+import os
+import time
+import argparse
+
+from _common import TMP, import_menu, report
+from bench_resolve_targets import make_corpus
+
+menu = import_menu()
+TargetCache = menu.TargetCache
+
+
+def timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+
+    shortcuts = make_corpus(os.path.join(TMP, 'corpus'), args.count)
+    db = os.path.join(TMP, 'target-cache.sqlite')
+
+    parsed = []
+    parse_shortcut = menu.links.parse_shortcut
+    menu.links.parse_shortcut = lambda p: parsed.append(p) or parse_shortcut(p)
+
+    no_cache, expected = timed(lambda: menu.resolve_targets(shortcuts, mode='serial'))
+    def resolve_cold():
+        cache = TargetCache(db)
+        resolved = menu.resolve_targets(shortcuts, mode='serial', cache=cache)
+        cache.save()
+        return resolved
+
+    cold, _ = timed(resolve_cold)
+
+    parsed.clear()
+    warm_cache = None
+
+    def warm():
+        nonlocal warm_cache
+        warm_cache = TargetCache(db)
+        return menu.resolve_targets(shortcuts, mode='serial', cache=warm_cache)
+
+    warm_time, resolved = timed(warm)
+    assert [r.target for r in resolved] == [r.target for r in expected]
+    assert parsed == [shortcuts[-1].path], 'only the broken (not cached) shortcut is opened again'
+
+    removed = {s.path for s in shortcuts[:-1:10]}  # removed shortcuts are evicted
+    for p in removed:
+        os.remove(p)
+    menu.resolve_targets(shortcuts, mode='serial', cache=warm_cache)
+    warm_cache.save()
+    assert len(TargetCache(db).entries) == len(shortcuts) - 1 - len(removed)
+
+    size = sum(os.path.getsize(p) for p in (db, db + '-wal') if os.path.exists(p))
+    report(f'Resolve {len(shortcuts)} shortcuts (warm hit rate {warm_cache.hit_rate:.0%}, cache {size // 1024} KiB)', [
+        ('no cache', no_cache),
+        ('empty cache (parse + save)', cold),
+        ('warm cache (load + stat)', warm_time),
+    ], baseline='no cache')
+
+
+if __name__ == '__main__':
+    main()
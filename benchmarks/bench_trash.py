@@ -0,0 +1,67 @@
+"""
+Per-item send2trash calls versus utils.TrashBatch. Trash goes to a temp XDG_DATA_HOME (freedesktop backend
+on Linux), so the real trash isn't touched. The freedesktop backend moves a list of paths one by one, so both
+are expected to be on par here (batching saves only per-call overhead). Batching targets Windows, where each
+send2trash call is one shell file operation (IFileOperation). This run doesn't measure that.
+"""
+import os
+import argparse
+
+from _common import TMP, best_of, report
+
+os.environ['HOME'] = TMP  # freedesktop backend puts trash on the home device
+os.environ['XDG_DATA_HOME'] = os.path.join(TMP, 'xdg')
+
+import send2trash  # after XDG_DATA_HOME is set
+from _common import import_menu
+
+utils = import_menu().utils
+
+
+def make_files(directory: str, count: int) -> list[str]:
+    os.makedirs(directory)
+    prefix = os.path.basename(directory)  # names are unique in the trash, so it doesn't look for free names
+    paths = [os.path.join(directory, f'{prefix} shortcut {i}.lnk') for i in range(count)]
+
+    for p in paths:
+        open(p, 'wb').close()
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    repeat = 5
+    per_item_runs = iter([make_files(os.path.join(TMP, f'per-item {i}'), args.count) for i in range(repeat)])
+    batched_runs = iter([make_files(os.path.join(TMP, f'batched {i}'), args.count) for i in range(repeat)])
+    per_item_paths, batched_paths, errors = [], [], []
+
+    def trash_per_item():
+        per_item_paths.extend(paths := next(per_item_runs))
+        for p in paths:
+            send2trash.send2trash(p)
+
+    def trash_batched():
+        batched_paths.extend(paths := next(batched_runs))
+        trash = utils.TrashBatch(args.batch_size)
+        for p in paths:
+            trash.add(p, lambda e: e and errors.append(e))
+        trash.flush()
+
+    per_item = best_of(trash_per_item, repeat)
+    batched = best_of(trash_batched, repeat)
+
+    assert not errors and not any(map(os.path.exists, per_item_paths + batched_paths))
+    report(f'Trash {args.count} files (backend: {send2trash.send2trash.__module__}, '
+           f'{args.count / per_item:.0f} vs {args.count / batched:.0f} files/s)', [
+        ('send2trash per item', per_item),
+        (f'TrashBatch (size {args.batch_size})', batched),
+    ], baseline='send2trash per item')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Watching the Start Menu dirs: an installer-like burst of shortcuts (files created in a new folder tree) through
+the platform backend and EventCoalescer must result in one rescan of one folder, and the rescan of changed
+folders (StartMenu.scan_folders) is compared with the full scan done by the refresh button.
+"""
+import os
+import time
+import argparse
+import threading
+
+from _common import TMP, import_menu, make_tree, best_of, report
+
+menu = import_menu()
+from cleaner import watch
+
+
+def install(root: str, name: str, count: int, delay: float, finished: list[float]):
+    path = os.path.join(root, name)
+    os.makedirs(os.path.join(path, 'Tools'))
+
+    for i in range(count):
+        open(os.path.join(path, 'Tools' if i % 2 else '', f'Shortcut {i}.lnk'), 'wb').close()
+        time.sleep(delay)
+
+    finished.append(time.perf_counter())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shortcuts', type=int, default=200, help='shortcuts created by the installer')
+    parser.add_argument('--delay', type=float, default=0.001, help='seconds between created shortcuts')
+    parser.add_argument('--folders', type=int, default=500)
+    args = parser.parse_args()
+
+    roots = [os.path.join(TMP, 'system'), os.path.join(TMP, 'user')]
+    for root in roots:
+        make_tree(root, args.folders // 2, 10, depth=2)
+
+    menu.StartMenu.default_dirs = type(menu.StartMenu.default_dirs)(
+        menu.StartMenuDir(roots[0], 'system'), menu.StartMenuDir(roots[1], 'user')
+    )
+
+    # coalescing on a fake clock: one event per 1 ms
+    clock = [0.0]
+    coalescer = watch.EventCoalescer(roots, clock=lambda: clock[0])
+    flushes = 0
+    for i in range(args.shortcuts):
+        coalescer.add(os.path.join(roots[1], 'Installer', f'Shortcut {i}.lnk'))
+        clock[0] += 0.001
+        flushes += coalescer.flush() is not None
+
+    clock[0] += coalescer.quiet
+    flushes += coalescer.flush() is not None
+    assert flushes == 1, flushes
+
+    paths = [os.path.join(roots[i % 2], f'Folder {i % 50}', f'Shortcut {i}.lnk') for i in range(100000)]
+    add_time = best_of(lambda: [coalescer.add(p) for p in paths], 3)
+    coalescer.changes, coalescer.events = watch.WatchChanges(), 0
+
+    # real backend
+    if (backend := watch.get_backend(roots)) is None:
+        print('No watch backend on this platform, only coalescing is measured')
+        latency = None
+    else:
+        watcher = watch.Watcher(roots, backend)
+        events = []
+        watcher.coalescer.add = lambda p, add=watcher.coalescer.add: (events.append(p), add(p))
+
+        finished, batches, latency = [], [], None
+        installer = threading.Thread(target=install,
+                                     args=(roots[1], 'Installer', args.shortcuts, args.delay, finished))
+        installer.start()
+        while (changes := watcher.poll(1.0)) is not None or installer.is_alive():
+            if changes is not None:
+                batches.append(changes)
+                latency = time.perf_counter() - finished[0] if finished else None
+
+        installer.join()
+        watcher.close()
+        assert all(b.keys == {'installer'} and not b.full for b in batches), batches
+        print(f'\n{backend.__class__.__name__}: {len(events)} events of {args.shortcuts} created shortcuts '
+              f'-> {len(batches)} rescan(s) of {sorted(set().union(*(b.keys for b in batches)))}')
+
+    assert len(menu.StartMenu.scan_folders({'installer'})[0].shortcuts) == args.shortcuts
+
+    report(f'Rescan of {len(roots)} roots, {args.folders} folders', [
+        ('full scan (refresh)', best_of(menu.StartMenu.get_folders, 5)),
+        ('scan_folders of 1 folder', best_of(lambda: menu.StartMenu.scan_folders({'installer'}), 5)),
+    ], baseline='full scan (refresh)')
+    report('Watch overhead', [(f'coalesce {len(paths)} events', add_time)] +
+           ([('last shortcut created -> changes', latency)] if latency is not None else []))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Regenerate the shortcut fixture corpora (lnk/ and url/ with their expected.json): `python benchmarks/fixtures/make_fixtures.py`.
+In expected targets `{dir}` stands for the fixtures directory and %BENCH_LNK_ROOT% is expanded by the benchmark.
+"""
+import os
+import sys
+import json
+import struct
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _lnk import build_lnk
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# shell-*.lnk are assembled field by field as Explorer lays them out (item IDs, VolumeID, every ExtraData block it
+# writes), without _lnk.build_lnk, so the parser is not only checked against our own writer. They are not
+# captured on Windows: replace them by copies of Explorer-made shortcuts when some are at hand.
+
+def _shell_lnk(flags: int, id_list: bytes, link_info: bytes, strings: list[str], extra: list[bytes],
+               icon_index: int = 0) -> bytes:
+    header = struct.pack('<I16sIIQQQIiIHHII', 0x4C, bytes.fromhex('0114020000000000c000000000000046'), flags,
+                         0x20, 0x1D9A1F2B3C4D5E6F, 0x1DA0C0FFEE123456, 0x1D9A1F2B3C4D5E6F, 0x3A400, icon_index,
+                         1, 0, 0, 0, 0)
+    string_data = b''.join(struct.pack('<H', len(s)) + s.encode('utf-16-le') for s in strings)
+    return header + id_list + link_info + string_data + b''.join(extra) + bytes(4)
+
+
+def _id_list(*names: str) -> bytes:  # My Computer, C:\, then a folder item per name and a file item for the last
+    items = [bytes.fromhex('1f50e04fd020ea3a6910a2d808002b30309d'), b'/C:\\' + bytes(19)]
+
+    for i, name in enumerate(names, 1):
+        is_file = i == len(names)
+        short = name.encode('ascii', 'replace')[:12] + b'\x00'
+        short += bytes(len(short) % 2)
+        items.append(struct.pack('<BBIIH', 0x32 if is_file else 0x31, 0, 0x3A400 if is_file else 0, 0x56A1B2C3,
+                                 0x20 if is_file else 0x10) + short)
+
+    data = b''.join(struct.pack('<H', len(item) + 2) + item for item in items) + bytes(2)
+    return struct.pack('<H', len(data)) + data
+
+
+def _volume_id(label: str) -> bytes:
+    data = label.encode('ascii') + b'\x00'
+    return struct.pack('<4I', 0x10 + len(data), 3, 0x5A3C91E2, 0x10) + data
+
+
+def _block(signature: int, data: bytes) -> bytes:
+    return struct.pack('<2I', 8 + len(data), signature) + data
+
+
+def _env_block(target: str) -> bytes:  # the rest of the fixed buffers is not cleared by the shell
+    ansi = target.encode('ascii') + b'\x00' + b'\xcd' * 8
+    wide = target.encode('utf-16-le') + b'\x00\x00' + b'\xcd' * 8
+    return _block(0xA0000001, ansi.ljust(260, b'\x00') + wide.ljust(520, b'\x00'))
+
+
+_SPECIAL_FOLDER = _block(0xA0000005, struct.pack('<2I', 0x26, 0x51))  # CSIDL_PROGRAM_FILES
+_KNOWN_FOLDER = _block(0xA000000B, bytes.fromhex('b6637e905fc2a54ea9e11d1c50b0a20e') + struct.pack('<I', 0x51))
+_PROPERTY_STORE = _block(0xA0000009, struct.pack('<II', 0x1C, 0x53505331) + bytes.fromhex(
+    '30f125b7ef471a10a5f102608c9eebac') + bytes(4) + bytes(4))  # one empty storage, then the terminal one
+_TRACKER = _block(0xA0000003, struct.pack('<II', 0x58, 0) + b'workstation-01'.ljust(16, b'\x00') + bytes(64))
+
+
+def _unicode_local_info(path: str) -> bytes:  # not ANSI path: LinkInfoHeaderSize 0x24 with the Unicode offsets
+    volume = _volume_id('Windows')
+    base = 0x24 + len(volume)
+    ansi = path.encode('ascii', 'replace') + b'\x00'
+    suffix = base + len(ansi)
+    base_u = suffix + 1
+    wide = path.encode('utf-16-le') + b'\x00\x00'
+    suffix_u = base_u + len(wide)
+    body = volume + ansi + b'\x00' + wide + b'\x00\x00'
+    return struct.pack('<9I', 0x24 + len(body), 0x24, 0x1, 0x24, base, 0, suffix, base_u, suffix_u) + body
+
+
+def _unicode_network_info(share: str, device: str, suffix: str) -> bytes:  # mapped drive of a non-ANSI share
+    net_name = share.encode('ascii', 'replace') + b'\x00'
+    device_name = device.encode('ascii') + b'\x00'
+    net_name_u = share.encode('utf-16-le') + b'\x00\x00'
+    device_name_u = device.encode('utf-16-le') + b'\x00\x00'
+    names = (net_name, device_name, net_name_u, device_name_u)
+    offsets = [0x1C + sum(map(len, names[:i])) for i in range(4)]
+    net = struct.pack('<7I', 0x1C + sum(map(len, names)), 0x3, offsets[0], offsets[1], 0x00020000, *offsets[2:])
+    net += b''.join(names)
+    suffix_ansi = suffix.encode('ascii', 'replace') + b'\x00'
+    suffix_u = 0x24 + len(net) + len(suffix_ansi)
+    body = net + suffix_ansi + suffix.encode('utf-16-le') + b'\x00\x00'
+    return struct.pack('<9I', 0x24 + len(body), 0x24, 0x2, 0, 0, 0x24, 0x24 + len(net), 0, suffix_u) + body
+
+
+LNK_FIXTURES = {
+    'ansi-local.lnk': (
+        build_lnk('C:\\Program Files\\App\\app.exe', working_dir='C:\\Program Files\\App'),
+        {'target': 'C:\\Program Files\\App\\app.exe', 'working_dir': 'C:\\Program Files\\App'}
+    ),
+    'ansi-local-no-idlist.lnk': (
+        build_lnk('C:\\Tools\\tool.exe', id_list=False),
+        {'target': 'C:\\Tools\\tool.exe'}
+    ),
+    'ansi-local-suffix.lnk': (
+        build_lnk('C:\\Program Files\\', suffix='App\\app.exe'),
+        {'target': 'C:\\Program Files\\App\\app.exe'}
+    ),
+    'unicode-local.lnk': (
+        build_lnk('C:\\Programme\\Äpp\\äpp.exe', unicode_info=True, arguments='--start'),
+        {'target': 'C:\\Programme\\Äpp\\äpp.exe', 'arguments': '--start'}
+    ),
+    'network.lnk': (
+        build_lnk(network='\\\\server\\share', suffix='dir\\app.exe'),
+        {'target': '\\\\server\\share\\dir\\app.exe'}
+    ),
+    'ansi-strings.lnk': (
+        build_lnk('C:\\App\\app.exe', name='App', icon_location='C:\\App\\app.ico', icon_index=2, is_unicode=False),
+        {'target': 'C:\\App\\app.exe', 'description': 'App', 'icon_location': 'C:\\App\\app.ico', 'icon_index': 2}
+    ),
+    'env-only.lnk': (
+        build_lnk(env_target='%BENCH_LNK_ROOT%\\app.exe', id_list=False),
+        {'target': '%BENCH_LNK_ROOT%\\app.exe'}
+    ),
+    'relative-only.lnk': (
+        build_lnk(relative_path='..\\App\\app.exe', id_list=False),
+        {'target': '{dir}/../App/app.exe'}
+    ),
+    'shell-unicode-local.lnk': (
+        _shell_lnk(0x800FF, _id_list('Programme', 'Ärger', 'ÄrgerApp.exe'),
+                   _unicode_local_info('C:\\Programme\\Ärger\\ÄrgerApp.exe'),
+                   ['Ärger App', '..\\..\\..\\..\\..\\Programme\\Ärger\\ÄrgerApp.exe', 'C:\\Programme\\Ärger',
+                    '/safe', 'C:\\Programme\\Ärger\\ÄrgerApp.exe'],
+                   [_SPECIAL_FOLDER, _KNOWN_FOLDER, _PROPERTY_STORE, _TRACKER]),
+        {'target': 'C:\\Programme\\Ärger\\ÄrgerApp.exe', 'arguments': '/safe',
+         'icon_location': 'C:\\Programme\\Ärger\\ÄrgerApp.exe', 'description': 'Ärger App',
+         'working_dir': 'C:\\Programme\\Ärger'}
+    ),
+    'shell-network.lnk': (
+        _shell_lnk(0x8009A, b'', _unicode_network_info('\\\\fileserver\\Büro', 'Z:', 'Tools\\tool.exe'),
+                   ['..\\Tools\\tool.exe', 'Z:\\Tools'], [_PROPERTY_STORE, _TRACKER]),
+        {'target': '\\\\fileserver\\Büro\\Tools\\tool.exe', 'working_dir': 'Z:\\Tools'}
+    ),
+    'shell-env.lnk': (
+        _shell_lnk(0x802C1, _id_list('App', 'app.exe'), b'', ['%BENCH_LNK_ROOT%\\App\\app.ico'],
+                   [_SPECIAL_FOLDER, _env_block('%BENCH_LNK_ROOT%\\App\\app.exe'), _KNOWN_FOLDER, _PROPERTY_STORE,
+                    _TRACKER], icon_index=1),
+        {'target': '%BENCH_LNK_ROOT%\\App\\app.exe', 'icon_location': '%BENCH_LNK_ROOT%\\App\\app.ico',
+         'icon_index': 1}
+    ),
+    'truncated.lnk': (
+        build_lnk('C:\\App\\app.exe', unicode_info=True)[:100],
+        {'error': 'LinkParseError'}
+    ),
+    'not-a-link.lnk': (
+        bytes(80),
+        {'error': 'LinkParseError'}
+    ),
+}
+
+
+URL_FIXTURES = {
+    'simple.url': (
+        b'[InternetShortcut]\r\nURL=https://example.com/\r\n',
+        {'target': 'https://example.com/'}
+    ),
+    'icon.url': (
+        b'[{000214A0-0000-0000-C000-000000000046}]\r\nProp3=19,11\r\n[InternetShortcut]\r\nIDList=\r\n'
+        b'URL=steam://rungameid/440\r\nIconIndex=0\r\nHotKey=0\r\nIconFile=C:\\Games\\tf.ico\r\n',
+        {'target': 'steam://rungameid/440', 'icon_location': 'C:\\Games\\tf.ico', 'icon_index': 0}
+    ),
+    'case-and-spaces.url': (
+        b'[internetshortcut]\n url = https://example.org/a=b \nWorkingDirectory=C:\\Docs\nIconIndex=3\n',
+        {'target': 'https://example.org/a=b', 'working_dir': 'C:\\Docs', 'icon_index': 3}
+    ),
+    'utf8-bom.url': (
+        '\ufeff[InternetShortcut]\r\nURL=https://example.com/café\r\n'.encode('utf-8'),
+        {'target': 'https://example.com/café'}
+    ),
+    'wide-section.url': (
+        b'[InternetShortcut]\r\nURL=https://example.com/caf?\r\n'
+        b'[InternetShortcut.W]\r\nURL=https://example.com/caf+AOk-\r\n',
+        {'target': 'https://example.com/café'}
+    ),
+    'no-url.url': (
+        b'[Other]\r\nURL=https://example.com/\r\n',
+        {'target': ''}
+    ),
+}
+
+
+def write_corpus(directory: str, fixtures: dict):
+    os.makedirs(directory, exist_ok=True)
+
+    for name, (data, _) in fixtures.items():
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(data)
+
+    with open(os.path.join(directory, 'expected.json'), 'w', encoding='utf-8') as f:
+        json.dump({name: expected for name, (_, expected) in fixtures.items()}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main():
+    write_corpus(os.path.join(DIR, 'lnk'), LNK_FIXTURES)
+    write_corpus(os.path.join(DIR, 'url'), URL_FIXTURES)
+
+
+if __name__ == '__main__':
+    main()
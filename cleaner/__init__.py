@@ -1,16 +1,44 @@
+import os
 import sys
+import importlib
 
 from . import log
 
 LOG = log.getLogger(__name__)
 LOG.setLevel(log.logging.INFO)  # log level for application
 
-from .config import CONFIG
-from .menu import StartMenu
-from .gui import MainWindow, widgets, load_fonts, InaccessibleDirsWarning
 
+_GUI_NAMES = ('MainWindow', 'widgets', 'load_fonts', 'InaccessibleDirsWarning')
 
-def set_excepthook(app: gui.widgets.QApplication):
+
+def init():
+    """
+    Set up app data (config, scan and target caches), called once by start.py before the GUI and by cli.main.
+    Importing the package and its modules has no side effects.
+    """
+    from .config import CONFIG
+    from .cache import ScanCache, TargetCache
+    from .menu import StartMenu, CachedSMScanner
+
+    StartMenu.scanner = CachedSMScanner(ScanCache(os.path.join(CONFIG.dir, 'scan-cache.json')))
+    StartMenu.target_cache = TargetCache(os.path.join(CONFIG.dir, 'target-cache.sqlite'))
+
+
+def __getattr__(name: str):  # GUI (PyQt6) is imported on first use, headless mode (cli.py) never imports it
+    if name == 'gui' or name in _GUI_NAMES:
+        gui = importlib.import_module('.gui', __name__)
+        return gui if name == 'gui' else getattr(gui, name)
+
+    if name == 'CONFIG':
+        return importlib.import_module('.config', __name__).CONFIG
+
+    if name == 'StartMenu':
+        return importlib.import_module('.menu', __name__).StartMenu
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def set_excepthook(app: 'widgets.QApplication'):
     def excepthook(cls, e, tb):
         LOG.critical('App error:', exc_info=(cls, e, tb))
         LOG.warning('App was closed by critical error')
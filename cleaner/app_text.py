@@ -63,6 +63,17 @@ class EN:
     INFO = 'Info'
     CHANGE_LANGUAGE = 'Change language'
     DONT_SHOW_ANYMORE = 'Don\'t show anymore'
+    CLEANING = 'Cleaning...'
+    CANCEL = 'Cancel'
+    CLEAN_CANCELLED = 'Cleaning was cancelled. Result - {cleanedFolders} folders were cleaned and ' \
+                      '{appliedShortcuts} shortcuts were {actionText}'
+    SELECT_BROKEN_SHORTCUTS = 'Select broken shortcuts'
+    BROKEN_SHORTCUTS_SELECTED = 'Were selected {count} broken shortcuts (their targets don\'t exist)'
+    NO_BROKEN_SHORTCUTS = 'No broken shortcuts'
+    SELECT_DUPLICATE_SHORTCUTS = 'Select duplicate shortcuts'
+    DUPLICATE_SHORTCUTS_SELECTED = 'Were selected {count} duplicate shortcuts of {groups} groups ' \
+                                   '(one shortcut of each group is left to keep)'
+    NO_DUPLICATE_SHORTCUTS = 'No duplicate shortcuts'
 
 
 class RU:
@@ -125,6 +136,17 @@ class RU:
     INFO = 'Информация'
     CHANGE_LANGUAGE = 'Изменить язык'
     DONT_SHOW_ANYMORE = 'Не показывать больше'
+    CLEANING = 'Очистка...'
+    CANCEL = 'Отмена'
+    CLEAN_CANCELLED = 'Очистка была отменена. Результат - было очищено {cleanedFolders} папок, ' \
+                      '{appliedShortcuts} ярлыков было {actionText}'
+    SELECT_BROKEN_SHORTCUTS = 'Выбрать битые ярлыки'
+    BROKEN_SHORTCUTS_SELECTED = 'Было выбрано {count} битых ярлыков (их таргеты не существуют)'
+    NO_BROKEN_SHORTCUTS = 'Нет битых ярлыков'
+    SELECT_DUPLICATE_SHORTCUTS = 'Выбрать дубликаты ярлыков'
+    DUPLICATE_SHORTCUTS_SELECTED = 'Было выбрано {count} дубликатов ярлыков из {groups} групп ' \
+                                   '(один ярлык каждой группы оставлен)'
+    NO_DUPLICATE_SHORTCUTS = 'Нет дубликатов ярлыков'
 
 
 class _text:
@@ -0,0 +1,337 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Optional, Iterable
+
+from .log import getLogger
+from .links import ShortcutInfo
+
+
+LOG = getLogger(__name__)
+
+
+class ScanCache:
+    """
+    On-disk cache of directories listings (subdirectories and shortcuts names) validated by directory mtime.
+    Directory mtime changes when an entry is added, removed or renamed in it, so an unchanged directory
+    doesn't need to be listed again.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dirs: dict[str, list] = self._load()  # path: [mtime_ns, dirs, shortcuts]
+        self.seen: set[str] = set()
+        self.is_changed = False
+
+    def _load(self) -> dict[str, list]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+
+        except FileNotFoundError:
+            return {}
+
+        except (OSError, ValueError) as e:
+            LOG.warning(f'Failed to load scan cache ({e.__class__.__name__}: {e})')
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return {}
+
+        dirs = data.get('dirs')
+        if not isinstance(dirs, dict) or not all(self._is_entry(e) for e in dirs.values()):
+            LOG.warning('Failed to load scan cache (malformed entries), it is rebuilt')
+            return {}
+
+        return dirs
+
+    @staticmethod
+    def _is_entry(entry) -> bool:  # [mtime_ns, dirs, shortcuts]
+        return (isinstance(entry, list) and len(entry) == 3 and isinstance(entry[0], int)
+                and isinstance(entry[1], list) and isinstance(entry[2], list))
+
+    def get(self, path: str, mtime_ns: int) -> Optional[tuple[list[str], list[str]]]:
+        self.seen.add(path)
+        entry = self.dirs.get(path)
+
+        if entry is None or entry[0] != mtime_ns:
+            return None
+
+        return entry[1], entry[2]
+
+    def set(self, path: str, mtime_ns: int, dirs: list[str], shortcuts: list[str]):
+        self.seen.add(path)
+        self.dirs[path] = [mtime_ns, dirs, shortcuts]
+        self.is_changed = True
+
+    def save(self, *, prune: bool = False):
+        """
+        :param prune: drop directories which weren't seen since the last save (removed ones), only after a scan
+                      of all roots
+        """
+        if prune and (removed := self.dirs.keys() - self.seen):  # seen also has not cached (just modified) dirs
+            for p in removed:
+                del self.dirs[p]
+
+            self.is_changed = True
+
+        self.seen = set()
+        if not self.is_changed:
+            return
+
+        tmp_path = self.path + '.tmp'
+        try:
+            # dumps() uses the C encoder, dump() encodes by chunks in Python and made a cold scan ~30% slower
+            data = json.dumps({'version': self.VERSION, 'dirs': self.dirs}, separators=(',', ':'))
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+
+            os.replace(tmp_path, self.path)  # a crash while writing doesn't leave a broken cache
+
+        except OSError as e:
+            return LOG.warning(f'Failed to save scan cache ({e.__class__.__name__}: {e})')
+
+        self.is_changed = False
+        LOG.debug(f'Save scan cache ({len(self.dirs)} dirs)')
+
+
+class TargetCache:
+    """
+    Persistent (sqlite) cache of parsed shortcuts (links.ShortcutInfo) keyed by (path, size, mtime_ns), so an
+    unchanged shortcut isn't opened again. Rows are loaded once, new ones are written by save().
+    """
+    VERSION = 1
+    FIELDS = ShortcutInfo.__slots__
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._changed: dict[str, tuple] = {}  # path: row
+        self._removed: set[str] = set()
+        self._db = self._connect()
+        self.entries: dict[str, tuple] = self._load()  # path: (size, mtime_ns, *FIELDS)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False)  # used under self._lock only
+            db.execute('PRAGMA journal_mode = WAL')
+            db.execute('PRAGMA synchronous = NORMAL')  # losing last saves of a cache is harmless
+
+            if db.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+                db.execute('DROP TABLE IF EXISTS targets')
+                db.execute(f'CREATE TABLE targets (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, '
+                           f'{", ".join(self.FIELDS)}) WITHOUT ROWID')
+                db.execute(f'PRAGMA user_version = {self.VERSION}')
+                db.commit()
+
+            return db
+
+        except sqlite3.Error as e:
+            LOG.warning(f'Failed to open target cache ({e.__class__.__name__}: {e})')
+            return None
+
+    def _load(self) -> dict[str, tuple]:
+        if self._db is None:
+            return {}
+
+        try:
+            return {row[0]: row[1:] for row in self._db.execute('SELECT * FROM targets')}
+
+        except sqlite3.Error as e:
+            LOG.warning(f'Failed to load target cache ({e.__class__.__name__}: {e})')
+            return {}
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[ShortcutInfo]:
+        with self._lock:
+            entry = self.entries.get(path)
+
+            if entry is None or entry[0] != size or entry[1] != mtime_ns:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return ShortcutInfo(*entry[2:])
+
+    def set(self, path: str, size: int, mtime_ns: int, info: ShortcutInfo):
+        entry = (size, mtime_ns, *(getattr(info, f) for f in self.FIELDS))
+        with self._lock:
+            self.entries[path] = entry
+            self._changed[path] = entry
+            self._removed.discard(path)
+
+    def evict(self, path: str):
+        with self._lock:
+            if self.entries.pop(path, None) is not None:
+                self._removed.add(path)
+                self._changed.pop(path, None)
+
+    def retain(self, paths: Iterable[str]):
+        """
+        Evict entries of all shortcuts except the given (existing) ones.
+        """
+        paths = set(paths)
+        with self._lock:  # entries are set by other threads meanwhile (e.g. icons loader)
+            for p in self.entries.keys() - paths:
+                del self.entries[p]
+                self._removed.add(p)
+                self._changed.pop(p, None)
+
+    def save(self):
+        with self._lock:
+            if self._db is None or not (self._changed or self._removed):
+                return
+
+            try:
+                with self._db:  # one transaction
+                    self._db.executemany('DELETE FROM targets WHERE path = ?', ((p,) for p in self._removed))
+                    placeholders = ', '.join('?' * (len(self.FIELDS) + 3))
+                    self._db.executemany(f'INSERT OR REPLACE INTO targets VALUES ({placeholders})',
+                                         ((p, *e) for p, e in self._changed.items()))
+
+            except sqlite3.Error as e:
+                return LOG.warning(f'Failed to save target cache ({e.__class__.__name__}: {e})')
+
+            LOG.debug(f'Save target cache: {len(self._changed)} written, {len(self._removed)} evicted, '
+                      f'hit rate {self.hit_rate:.0%} ({self.hits} of {self.hits + self.misses})')
+            self._changed.clear()
+            self._removed.clear()
+
+
+class IconCache:
+    """
+    Persistent (sqlite) cache of rendered icons (opaque blobs) keyed by an icon key and (mtime_ns, size) of the
+    file the icon is taken from. Least recently used icons are evicted by save() once their total size is over
+    the byte budget. Only the index (without blobs) is kept in memory.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, budget: int):
+        self.path = path
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._changed: dict[str, tuple] = {}  # key: (mtime_ns, size, data)
+        self._used: dict[str, int] = {}  # key: tick of the last use, not saved yet
+        self._db = self._connect()
+        self.entries: dict[str, list] = self._load()  # key: [mtime_ns, size, used tick, blob length]
+        self.total = sum(e[3] for e in self.entries.values())
+        self._tick = max((e[2] for e in self.entries.values()), default=0)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False)  # used under self._lock only
+            db.execute('PRAGMA journal_mode = WAL')
+            db.execute('PRAGMA synchronous = NORMAL')
+
+            if db.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+                db.execute('DROP TABLE IF EXISTS icons')
+                db.execute('CREATE TABLE icons (key TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, '
+                           'used INTEGER, data BLOB)')
+                db.execute(f'PRAGMA user_version = {self.VERSION}')
+                db.commit()
+
+            return db
+
+        except sqlite3.Error as e:
+            LOG.warning(f'Failed to open icon cache ({e.__class__.__name__}: {e})')
+            return None
+
+    def _load(self) -> dict[str, list]:
+        if self._db is None:
+            return {}
+
+        try:
+            return {row[0]: list(row[1:]) for row in
+                    self._db.execute('SELECT key, mtime_ns, size, used, length(data) FROM icons')}
+
+        except sqlite3.Error as e:
+            LOG.warning(f'Failed to load icon cache ({e.__class__.__name__}: {e})')
+            return {}
+
+    def get(self, key: str, mtime_ns: int, size: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self.entries.get(key)
+
+            if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                self.misses += 1
+                return None
+
+            if key in self._changed:
+                data = self._changed[key][2]
+            else:
+                try:
+                    row = self._db.execute('SELECT data FROM icons WHERE key = ?', (key,)).fetchone()
+                except sqlite3.Error as e:
+                    LOG.warning(f'Failed to read icon cache ({e.__class__.__name__}: {e})')
+                    row = None
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                data = row[0]
+
+            self.hits += 1
+            self._tick += 1
+            entry[2] = self._used[key] = self._tick
+            return data
+
+    def set(self, key: str, mtime_ns: int, size: int, data: bytes):
+        with self._lock:
+            if (old := self.entries.get(key)) is not None:
+                self.total -= old[3]
+
+            self._tick += 1
+            self.entries[key] = [mtime_ns, size, self._tick, len(data)]
+            self._changed[key] = (mtime_ns, size, data)
+            self._used.pop(key, None)
+            self.total += len(data)
+
+    def _evict_over_budget(self) -> list[str]:
+        if self.total <= self.budget:
+            return []
+
+        evicted = []
+        for key in sorted(self.entries, key=lambda k: self.entries[k][2]):
+            self.total -= self.entries.pop(key)[3]
+            self._changed.pop(key, None)
+            self._used.pop(key, None)
+            evicted.append(key)
+
+            if self.total <= self.budget:
+                return evicted
+
+        return evicted
+
+    def save(self):
+        with self._lock:
+            evicted = self._evict_over_budget()
+            if self._db is None or not (self._changed or self._used or evicted):
+                return
+
+            try:
+                with self._db:  # one transaction
+                    self._db.executemany('DELETE FROM icons WHERE key = ?', ((k,) for k in evicted))
+                    self._db.executemany('INSERT OR REPLACE INTO icons VALUES (?, ?, ?, ?, ?)',
+                                         ((k, m, s, self.entries[k][2], d) for k, (m, s, d) in self._changed.items()))
+                    self._db.executemany('UPDATE icons SET used = ? WHERE key = ?',
+                                         ((t, k) for k, t in self._used.items()))
+
+            except sqlite3.Error as e:
+                return LOG.warning(f'Failed to save icon cache ({e.__class__.__name__}: {e})')
+
+            LOG.debug(f'Save icon cache: {len(self._changed)} written, {len(evicted)} evicted, '
+                      f'{self.total >> 10} KiB of {self.budget >> 10} KiB, {self.hits} hits, {self.misses} misses')
+            self._changed.clear()
+            self._used.clear()
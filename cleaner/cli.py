@@ -0,0 +1,158 @@
+"""
+Headless clean (`start.py --headless ...`), never imports the GUI (PyQt6).
+"""
+import sys
+import json
+import fnmatch
+import argparse
+from typing import Optional
+
+from . import log, init
+from .menu import StartMenu, SMFolder, StartMenuShortcut
+
+
+LOG = log.getLogger(__name__)
+
+parser = argparse.ArgumentParser(
+    'start.py --headless',
+    description='Clean Start Menu folders without GUI and print the clean result as JSON.'
+)
+selection = parser.add_mutually_exclusive_group(required=True)
+selection.add_argument(
+    '--folders',
+    nargs='+',
+    metavar='NAME',
+    help='folders to clean entirely (all their shortcuts are applied and the folder is removed / moved), '
+         'names are case-insensitive and can be wildcards (e.g. "Java*")'
+)
+selection.add_argument(
+    '--rules',
+    metavar='FILE',
+    help='JSON rule file: {"folders": {"<name or wildcard>": {"apply": ["<shortcut name wildcard>", ...], '
+         '"keep_folder": false}, ...}, "empty_folders": false}. Shortcuts which are not matched by "apply" '
+         '(all by default) are moved out of the folder to the Start Menu root unless "keep_folder" is true'
+)
+action = parser.add_mutually_exclusive_group(required=True)
+action.add_argument('--remove', action='store_true', help='remove (send to recycle bin)')
+action.add_argument('--move', metavar='DIR', help='move to the directory')
+parser.add_argument('--empty-folders', action='store_true', help='also clean all empty folders')
+parser.add_argument('--workers', type=int, default=1, help='folders cleaned in parallel')
+parser.add_argument('--dry-run', action='store_true', help='print selected folders and shortcuts, don\'t clean')
+
+
+class RulesError(ValueError):
+    pass
+
+
+def _match(name: str, patterns: list[str]) -> bool:
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(name, p.lower()) for p in patterns)
+
+
+def load_rules(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            rules = json.load(f)
+
+    except (OSError, ValueError) as e:
+        raise RulesError(f'can\'t read rule file: {e}') from e
+
+    if not isinstance(rules, dict) or not isinstance(rules.setdefault('folders', {}), dict):
+        raise RulesError('rule file must be an object with "folders" object')
+
+    for name, rule in rules['folders'].items():
+        if not isinstance(rule, dict) or not isinstance(rule.get('apply', []), list):
+            raise RulesError(f'rule of "{name}" must be an object with "apply" list')
+
+        if not all(isinstance(p, str) for p in rule.get('apply', [])):
+            raise RulesError(f'"apply" of "{name}" must be a list of shortcut names')
+
+    return rules
+
+
+def _folder_rule(folder: SMFolder, rules: dict) -> Optional[dict]:
+    for pattern, rule in rules.get('folders', {}).items():
+        if _match(folder.name, [pattern]):
+            return rule
+
+    return None
+
+
+def _select_shortcuts(shortcuts: list[StartMenuShortcut], patterns: list[str]) -> tuple[list, list]:
+    apply, save = [], []
+
+    for s in shortcuts:
+        (apply if _match(s.name, patterns) or _match(s.name + s.ext, patterns) else save).append(s)
+
+    return apply, save
+
+
+def get_folders_to_clean(rules: dict) -> list[StartMenu.folder_to_clean]:
+    folders_to_clean = []
+
+    for folder in StartMenu.get_folders():
+        rule = _folder_rule(folder, rules)
+
+        if folder.is_empty():
+            if rule is not None and rule.get('keep_folder', False):  # the rule keeps it even with --empty-folders
+                continue
+
+            if rules.get('empty_folders') or rule is not None:
+                folders_to_clean.append(StartMenu.folder_to_clean(folder, False, [], []))
+
+            continue
+
+        if rule is None:
+            continue
+
+        apply, save = _select_shortcuts(folder.shortcuts, rule.get('apply', ['*']))
+        is_kept = bool(rule.get('keep_folder', False))
+
+        if not apply and is_kept:
+            continue
+
+        folders_to_clean.append(StartMenu.folder_to_clean(folder, is_kept, apply, save))
+
+    return folders_to_clean
+
+
+def _describe(folders_to_clean: list[StartMenu.folder_to_clean]) -> list[dict]:
+    return [{
+        'folder': f.folder.name,
+        'paths': f.folder.get_paths(),
+        'keep_folder': f.is_kept,
+        'apply': [s.path for s in f.shortcuts_to_apply],
+        'save': [s.path for s in f.shortcuts_to_save]
+    } for f in folders_to_clean]
+
+
+def main(argv: list[str] = None) -> int:
+    args = parser.parse_args(argv)
+
+    try:
+        rules = load_rules(args.rules) if args.rules else {'folders': {name: {} for name in args.folders}}
+    except RulesError as e:
+        parser.error(str(e))
+
+    rules['empty_folders'] = rules.get('empty_folders', False) or args.empty_folders
+    init()  # app data only once the arguments are valid
+
+    for d in StartMenu.default_dirs:
+        if not d.is_accessible:
+            LOG.warning(f'Start Menu dir "{d.path}" is inaccessible and will be skipped (run as admin)')
+
+    folders_to_clean = get_folders_to_clean(rules)
+
+    if args.dry_run:
+        print(json.dumps({'folders': _describe(folders_to_clean)}, indent=2, ensure_ascii=False))
+        return 0
+
+    action = StartMenu.clean_action.move(args.move) if args.move else StartMenu.clean_action.remove()
+    result = StartMenu.clean(action, folders_to_clean, workers=args.workers)
+
+    print(json.dumps(result.as_dict(), indent=2, ensure_ascii=False))
+    return 1 if result.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
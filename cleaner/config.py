@@ -9,8 +9,10 @@ LOG = getLogger(__name__)
 
 class Config(configparser.ConfigParser):
     def __init__(self):
-        super().__init__({'lang': 'en', 'warn_inaccessible_dirs': 'true'}, default_section='opt')
-        self.path = os.path.join(os.getenv('PROGRAMDATA'), 'SMCleaner', 'config.ini')
+        super().__init__({'lang': 'en', 'warn_inaccessible_dirs': 'true', 'clean_workers': '1', 'icon_cache_mb': '16'},
+                         default_section='opt')
+        self.dir = os.path.join(os.getenv('PROGRAMDATA'), 'SMCleaner')  # app data directory
+        self.path = os.path.join(self.dir, 'config.ini')
 
         if not os.path.exists(self.path):
             if not os.path.exists(dirs := os.path.dirname(self.path)):
@@ -29,4 +31,10 @@ class Config(configparser.ConfigParser):
         LOG.debug(f'Save config / [opt]: {self.items("opt")}')
 
 
-CONFIG = Config()
+def __getattr__(name: str):  # CONFIG (file I/O) is created on first use, not on import
+    if name == 'CONFIG':
+        global CONFIG
+        CONFIG = Config()
+        return CONFIG
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,8 +1,14 @@
 import os
+import bisect
+import ntpath
+import struct
+import threading
 import winsound
 import subprocess
 from enum import Enum
-from typing import Optional
+from collections import OrderedDict, deque
+from typing import Optional, Callable
+from concurrent.futures import Future
 from abc import ABC, abstractmethod
 
 from PyQt6 import QtWidgets as widgets
@@ -11,9 +17,12 @@ from PyQt6 import QtGui as gui
 import qt_material  # after PyQt !
 
 from . import log
+from . import watch
+from .cache import IconCache
 from .config import CONFIG
 from .app_text import TEXT
-from .menu import StartMenuShortcut, SMFolder, StartMenu
+from .menu import StartMenuShortcut, SMFolder, StartMenuExtendedFolder, SMCleaner, StartMenu, resolve_targets, \
+    find_broken_shortcuts, find_duplicate_shortcuts
 from .utils import resource_path, HTML, validate_filename, FILENAME_FORBIDDEN_CHARACTERS
 
 
@@ -213,6 +222,7 @@ class NewShortcutButton(widgets.QPushButton):
         }""")
         self.setCursor(gui.QCursor(core.Qt.CursorShape.PointingHandCursor))
         self.setToolTip(TEXT.ADD_NEW_SHORTCUT_TOOL_TIP)
+        self.iconProvider = widgets.QFileIconProvider()  # own one, IconLoader's provider is used by its thread
 
     def mousePressEvent(self, event: gui.QMouseEvent) -> None:
         if event.button() != core.Qt.MouseButton.LeftButton:
@@ -226,8 +236,7 @@ class NewShortcutButton(widgets.QPushButton):
         if not targetPath:
             return
 
-        iconProvider = widgets.QFileIconProvider()
-        dialog = NewShortcutInputDialog(icon=iconProvider.icon(core.QFileInfo(targetPath)))
+        dialog = NewShortcutInputDialog(icon=self.iconProvider.icon(core.QFileInfo(targetPath)))
 
         LOG.debug('Execute "New shortcut" dialog')
         if not (name := dialog.get_validated_name(dialog.exec(), dialog.textValue())):
@@ -300,77 +309,663 @@ class LanguageButton(widgets.QPushButton):
         LOG.debug(f'Switch to "{lang}" lang')
         CONFIG['opt']['lang'] = lang
         CONFIG.save()
-        self.mainWindow.refresh()
+        self.mainWindow.rebuild()
+
+
+def resolveTargetPath(shortcut: StartMenuShortcut) -> Optional[str]:  # file target of .lnk, resolved on demand
+    resolved = resolve_targets([shortcut], mode='serial', cache=StartMenu.target_cache)[0]
+    if resolved.error:
+        LOG.debug(f'Shortcut\'s "{shortcut.name}" target is not resolved: {resolved.error!r}')
+
+    isFileTarget = resolved.target and shortcut.ext.lower() == '.lnk'  # .url target is URL
+    return os.path.normpath(resolved.target) if isFileTarget else None
+
+
+def packImages(images: list[gui.QImage]) -> bytes:  # -> PNGs, each prefixed with its length
+    parts = []
+    for image in images:
+        data = core.QByteArray()
+        buffer = core.QBuffer(data)
+        buffer.open(core.QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, 'PNG')
+        parts.append(struct.pack('<I', data.size()) + data.data())
+
+    return b''.join(parts)
+
+
+def unpackImages(data: bytes) -> list[gui.QImage]:
+    images, offset = [], 0
+    while offset < len(data):
+        length, = struct.unpack_from('<I', data, offset)
+        images.append(gui.QImage.fromData(data[offset + 4:offset + 4 + length], 'PNG'))
+        offset += 4 + length
+
+    return images
+
+
+class IconLoader(core.QThread):
+    """
+    Shortcuts icons loaded on demand (ShortcutModel asks only for painted rows) in a background thread, newest
+    requests first. Icons are kept in an LRU cache by key - target path of files with own icons (.exe, .ico ...),
+    extension of other files - so shortcuts with identical icons share one QIcon, which is loaded once.
+    Rendered icons are also saved in diskCache, so next launches don't ask the shell for unchanged files icons.
+    """
+    OWN_ICON_EXTENSIONS = frozenset(('', '.exe', '.ico', '.dll', '.cpl', '.msc', '.scr', '.lnk'))
+    SIZES = (16, 32)
+    maxsize = 512  # cached icons
+    maxRequests = 256  # older requests (rows scrolled away) are dropped
+
+    loaded = core.pyqtSignal(str)  # path of a shortcut which icon is in the cache now
+    _rendered = core.pyqtSignal(str, object, list)  # shortcut path, icon key, QImage of each size (empty if shared)
+
+    diskCache: Optional[IconCache] = None  # created with the loader, under the app data dir
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'IconLoader':  # shared by all models, created on first use (needs QApplication)
+        if cls._instance is None:
+            if cls.diskCache is None:
+                cls.diskCache = IconCache(os.path.join(CONFIG.dir, 'icon-cache.sqlite'),
+                                          CONFIG['opt'].getint('icon_cache_mb') << 20)
 
+            cls._instance = cls()
+            widgets.QApplication.instance().aboutToQuit.connect(cls._instance.stop)
+            cls._instance.start()
 
-class StartMenuShortcutGUI(widgets.QCheckBox):
-    iconProvider = widgets.QFileIconProvider()
+        return cls._instance
 
-    def __init__(self, shortcut: StartMenuShortcut, *args, **kwargs):
+    def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.provider = widgets.QFileIconProvider()
+        self.placeholder = self.provider.icon(widgets.QFileIconProvider.IconType.File)
+        self.cache: OrderedDict[tuple, gui.QIcon] = OrderedDict()
+        self.keys: dict[str, tuple] = {}  # shortcut path: icon key
+        self.loading: set[tuple] = set()  # keys rendered but not cached yet
+        self.requests: deque[StartMenuShortcut] = deque()
+        self.requested: set[str] = set()
+        self.condition = threading.Condition()  # guards all above, cache and keys are changed in the GUI thread
+        self.hits = self.loads = 0
+        self._rendered.connect(self._store)
+
+    def icon(self, shortcut: StartMenuShortcut) -> Optional[gui.QIcon]:  # -> None if it's requested, see loaded
+        with self.condition:
+            if (key := self.keys.get(shortcut.path)) is not None and (icon := self.cache.get(key)) is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return icon
+
+            if shortcut.path not in self.requested:
+                self.requested.add(shortcut.path)
+                self.requests.append(shortcut)
+
+                if len(self.requests) > self.maxRequests:
+                    self.requested.discard(self.requests.popleft().path)
+
+                self.condition.notify()
+
+        return None
+
+    def keyOf(self, shortcut: StartMenuShortcut) -> tuple[tuple, str]:  # -> icon key, file to get the icon of
+        if shortcut.ext.lower() != '.lnk':  # .url icon is the browser one
+            return ('ext', shortcut.ext.lower()), shortcut.path
+
+        info = resolve_targets([shortcut], mode='serial', cache=StartMenu.target_cache)[0].info
+        if info is None:  # not parsed, the default shortcut icon
+            return ('ext', '.lnk'), shortcut.path
+
+        if not info.target:  # e.g. an advertised shortcut, its icon is in the shortcut
+            return ('path', os.path.normcase(shortcut.path)), shortcut.path
+
+        if info.icon_location:  # the shell gets it from the shortcut
+            return ('icon', ntpath.normcase(info.icon_location), info.icon_index), shortcut.path
+
+        if info.target.startswith('\\\\'):  # network target isn't touched, it can block for long
+            return ('network',), info.target
+
+        ext = ntpath.splitext(info.target)[1].lower()
+        if ext in self.OWN_ICON_EXTENSIONS:
+            return ('path', ntpath.normcase(info.target)), info.target
+
+        return ('ext', ext), info.target
+
+    def render(self, key: tuple, source: str) -> list[gui.QImage]:
+        if key[0] == 'network':
+            icon = self.provider.icon(widgets.QFileIconProvider.IconType.Network)
+        else:
+            icon = self.provider.icon(core.QFileInfo(source))
+
+        return [icon.pixmap(size).toImage() for size in self.SIZES]
+
+    @staticmethod
+    def stampOf(key: tuple, source: str) -> tuple[int, int]:  # -> mtime_ns and size of the file with the icon
+        if key[0] not in ('path', 'icon'):  # icons of extensions and network aren't taken from a file
+            return 0, 0
+
+        try:
+            st = os.stat(source if key[0] == 'path' else os.path.expandvars(key[1]))
+        except OSError:  # e.g. missing target, its icon is cached until the file appears
+            return 0, 0
+
+        return st.st_mtime_ns, st.st_size
+
+    def load(self, key: tuple, source: str) -> list[gui.QImage]:  # from the disk cache, rendered on a miss
+        if self.diskCache is None:
+            return self.render(key, source)
+
+        diskKey, stamp = '|'.join(map(str, key)), self.stampOf(key, source)
+        if (data := self.diskCache.get(diskKey, *stamp)) is not None:
+            return unpackImages(data)
+
+        images = self.render(key, source)
+        self.diskCache.set(diskKey, *stamp, packImages(images))
+        return images
+
+    def run(self):
+        if os.name == 'nt':  # shell icons extraction needs COM initialized in the thread
+            import ctypes
+            ctypes.windll.ole32.CoInitializeEx(None, 0x2)  # COINIT_APARTMENTTHREADED
+
+        while True:
+            if not self.requests and self.diskCache is not None:  # idle, save newly rendered icons
+                self.diskCache.save()
+
+            with self.condition:
+                while not self.requests and not self.isInterruptionRequested():
+                    self.condition.wait()
+
+                if self.isInterruptionRequested():
+                    return
+
+                shortcut = self.requests.pop()
+
+            key, source = self.keyOf(shortcut)
+            with self.condition:
+                shared = key in self.cache or key in self.loading
+                if not shared:
+                    self.loading.add(key)
+
+            self._rendered.emit(shortcut.path, key, [] if shared else self.load(key, source))
+
+    def _store(self, path: str, key: tuple, images: list):
+        with self.condition:
+            if images:
+                icon = gui.QIcon()
+                for image in images:
+                    icon.addPixmap(gui.QPixmap.fromImage(image))
+
+                self.cache[key] = icon
+                self.loading.discard(key)
+                self.loads += 1
+
+                if len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+
+            self.keys[path] = key
+            self.requested.discard(path)
+
+        self.loaded.emit(path)
+
+    def stop(self):
+        self.requestInterruption()
+        with self.condition:
+            self.condition.notify_all()
+
+        self.wait()
+        if self.diskCache is not None:
+            self.diskCache.save()
+
+        LOG.debug(f'Icons: {self.loads} loaded, {self.hits} cache hits')
+
+
+class ShortcutModel(core.QAbstractItemModel):
+    """
+    Folders (top-level rows) and their shortcuts (child rows). Folders states are flags in a bytearray and
+    shortcuts checks are a bytearray per folder, instead of widgets attributes. Index of a shortcut keeps
+    (as internalId) id of its folder: folders rows shift on insert / remove, ids don't.
+    """
+    KEPT = 0x1
+    SKIPPED = 0x2
+    KEPT_BEFORE_SKIPPING = 0x4
+
+    keptColor = gui.QColor('#2979FF')
+    notKeptColor = gui.QColor('#54595d')
+
+    def __init__(self, parent: core.QObject = None):
+        super().__init__(parent)
+
+        self.folders: list[SMFolder] = []
+        self.keys: list[str] = []  # sorted keys of self.folders
+        self.shortcuts: list[list[StartMenuShortcut]] = []  # rows of each folder
+        self.states = bytearray()  # KEPT | SKIPPED | KEPT_BEFORE_SKIPPING of each folder
+        self.checks: list[bytearray] = []  # checked state of each folder shortcuts
+        self.ids: list[int] = []
+        self._rows: Optional[dict[int, int]] = None  # id: folder row, rebuilt after rows are inserted / removed
+        self._nextId = 1
+        self.iconRequests: dict[str, core.QPersistentModelIndex] = {}  # shortcut path: row waiting for its icon
+
+        self.iconLoader = IconLoader.instance()
+        self.iconLoader.loaded.connect(self.iconLoaded)
+
+    # QAbstractItemModel interface
+
+    def index(self, row: int, column: int, parent: core.QModelIndex = core.QModelIndex()) -> core.QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return core.QModelIndex()
+
+        return self.createIndex(row, column, self.ids[parent.row()] if parent.isValid() else 0)
+
+    def parent(self, index: core.QModelIndex = None):
+        if index is None:  # QObject.parent()
+            return super().parent()
+
+        if not index.isValid() or not index.internalId():
+            return core.QModelIndex()
 
-        self.shortcut = shortcut
-        rawPath = core.QFileInfo(self.shortcut.path).symLinkTarget()
-        self.targetPath = os.path.normpath(rawPath) if rawPath else None
+        return self.createIndex(self.folderRow(index), 0, 0)
 
-        self.updateUI()
+    def rowCount(self, parent: core.QModelIndex = core.QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self.folders)
 
-    def updateUI(self):
-        self.setText(self.shortcut.name)
-        self.setIcon(self.getIcon())
+        return 0 if parent.internalId() else len(self.shortcuts[parent.row()])
 
-    def getIcon(self) -> gui.QIcon:
-        return self.iconProvider.icon(core.QFileInfo(self.shortcut.path))
+    def columnCount(self, parent: core.QModelIndex = core.QModelIndex()) -> int:
+        return 1
 
-    def getTargetIcon(self) -> gui.QIcon:
-        if self.targetPath:
-            return self.iconProvider.icon(core.QFileInfo(self.targetPath))
+    def data(self, index: core.QModelIndex, role: int = core.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if not index.internalId():  # folder
+            if role == core.Qt.ItemDataRole.DisplayRole:
+                return self.folders[index.row()].name
+
+            if role == core.Qt.ItemDataRole.ForegroundRole:
+                return self.keptColor if self.isKept(index.row()) else self.notKeptColor
+
+            return None
+
+        row = self.folderRow(index)
+        if role == core.Qt.ItemDataRole.DisplayRole:
+            return self.shortcuts[row][index.row()].name
+
+        if role == core.Qt.ItemDataRole.CheckStateRole:
+            return core.Qt.CheckState.Checked if self.checks[row][index.row()] else core.Qt.CheckState.Unchecked
+
+        if role == core.Qt.ItemDataRole.DecorationRole:  # only for painted rows
+            shortcut = self.shortcuts[row][index.row()]
+            if (icon := self.iconLoader.icon(shortcut)) is not None:
+                return icon
+
+            self.iconRequests[shortcut.path] = core.QPersistentModelIndex(index)
+            return self.iconLoader.placeholder
+
+        return None
+
+    def setData(self, index: core.QModelIndex, value, role: int = core.Qt.ItemDataRole.EditRole) -> bool:
+        if role != core.Qt.ItemDataRole.CheckStateRole or not index.internalId():
+            return False
+
+        checked = value in (core.Qt.CheckState.Checked, core.Qt.CheckState.Checked.value)
+        self.setChecked(self.folderRow(index), index.row(), checked)
+        return True
+
+    def flags(self, index: core.QModelIndex) -> core.Qt.ItemFlag:
+        if not index.isValid():
+            return core.Qt.ItemFlag.NoItemFlags
+
+        if not index.internalId():
+            return core.Qt.ItemFlag.ItemIsEnabled
+
+        if self.isSkipped(self.folderRow(index)):
+            return core.Qt.ItemFlag.ItemIsUserCheckable
+
+        return core.Qt.ItemFlag.ItemIsEnabled | core.Qt.ItemFlag.ItemIsUserCheckable
+
+    def iconLoaded(self, path: str):
+        if (index := self.iconRequests.pop(path, None)) is not None and index.isValid():
+            index = core.QModelIndex(index)
+            self.dataChanged.emit(index, index, [core.Qt.ItemDataRole.DecorationRole])
+
+    # rows
+
+    def folderRow(self, index: core.QModelIndex) -> int:  # row of the index folder (of the folder itself too)
+        if not index.internalId():
+            return index.row()
+
+        if self._rows is None:
+            self._rows = {id_: row for row, id_ in enumerate(self.ids)}
+
+        return self._rows[index.internalId()]
+
+    def rowOf(self, key: str) -> Optional[int]:
+        row = bisect.bisect_left(self.keys, key)
+        return row if row < len(self.keys) and self.keys[row] == key else None
+
+    def shortcutAt(self, index: core.QModelIndex) -> Optional[StartMenuShortcut]:
+        return self.shortcuts[self.folderRow(index)][index.row()] if index.internalId() else None
+
+    def insertFolder(self, folder: SMFolder):
+        row = bisect.bisect(self.keys, folder.key)
+
+        self.beginInsertRows(core.QModelIndex(), row, row)
+        self.folders.insert(row, folder)
+        self.keys.insert(row, folder.key)
+        self.shortcuts.insert(row, folder.shortcuts)
+        self.states.insert(row, self.KEPT)
+        self.checks.insert(row, bytearray(len(folder.shortcuts)))
+        self.ids.insert(row, self._nextId)
+        self._nextId += 1
+        self._rows = None
+        self.endInsertRows()
+
+    def removeFolder(self, row: int):
+        self.beginRemoveRows(core.QModelIndex(), row, row)
+        for rows in (self.folders, self.keys, self.shortcuts, self.states, self.checks, self.ids):
+            del rows[row]
+
+        self._rows = None
+        self.endRemoveRows()
+
+    def updateFolder(self, row: int, folderDiff: StartMenu.folder_diff):
+        """
+        Replace rows of changed shortcuts, checks of unchanged ones are kept.
+        """
+        folderIndex = self.index(row, 0)
+        checks = self._checksOf(row, folderDiff.folder.shortcuts)
+
+        if self.shortcuts[row]:
+            self.beginRemoveRows(folderIndex, 0, len(self.shortcuts[row]) - 1)
+            self.shortcuts[row], self.checks[row] = [], bytearray()
+            self.endRemoveRows()
+
+        self.folders[row] = folderDiff.folder
+        if folderDiff.folder.shortcuts:
+            self.beginInsertRows(folderIndex, 0, len(folderDiff.folder.shortcuts) - 1)
+            self.shortcuts[row], self.checks[row] = folderDiff.folder.shortcuts, checks
+            self.endInsertRows()
+
+    def setFolder(self, row: int, folder: SMFolder):  # new object of an unchanged folder
+        self.checks[row] = self._checksOf(row, folder.shortcuts)
+        self.folders[row], self.shortcuts[row] = folder, folder.shortcuts
+
+    def _checksOf(self, row: int, shortcuts: list[StartMenuShortcut]) -> bytearray:  # by paths of current rows
+        checked = {s.path for s, c in zip(self.shortcuts[row], self.checks[row]) if c}
+        return bytearray(s.path in checked for s in shortcuts)
+
+    # states
+
+    def isKept(self, row: int) -> bool:
+        return bool(self.states[row] & self.KEPT)
+
+    def isSkipped(self, row: int) -> bool:
+        return bool(self.states[row] & self.SKIPPED)
+
+    def isChecked(self, row: int, shortcutRow: int) -> bool:
+        return bool(self.checks[row][shortcutRow])
+
+    def _setState(self, row: int, flag: int, value: bool):
+        self.states[row] = self.states[row] | flag if value else self.states[row] & ~flag
+
+    def setKept(self, row: int, value: bool):
+        self._setState(row, self.KEPT, value)
+        index = self.index(row, 0)
+        # noinspection PyUnresolvedReferences
+        self.dataChanged.emit(index, index, [core.Qt.ItemDataRole.ForegroundRole])
+
+    def setSkipped(self, row: int, value: bool):
+        self._setState(row, self.SKIPPED, value)
+
+        if value:
+            self.checks[row] = bytearray(len(self.shortcuts[row]))
+
+        if value and self.isKept(row):
+            self.setKept(row, False)
+            self._setState(row, self.KEPT_BEFORE_SKIPPING, True)
+
+        elif not value and self.states[row] & self.KEPT_BEFORE_SKIPPING:
+            self.setKept(row, True)
+            self._setState(row, self.KEPT_BEFORE_SKIPPING, False)
+
+        if self.shortcuts[row]:  # checks and enabled flags
+            parent = self.index(row, 0)
+            # noinspection PyUnresolvedReferences
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(len(self.shortcuts[row]) - 1, 0, parent))
+
+    def setChecked(self, row: int, shortcutRow: int, value: bool):
+        if self.isSkipped(row):
+            return
+
+        self.checks[row][shortcutRow] = value
+        index = self.index(shortcutRow, 0, self.index(row, 0))
+        # noinspection PyUnresolvedReferences
+        self.dataChanged.emit(index, index, [core.Qt.ItemDataRole.CheckStateRole])
+
+    def reverseKeptState(self, row: int):
+        self.setKept(row, not self.isKept(row))
+
+    def reverseSkippedState(self, row: int):
+        self.setSkipped(row, not self.isSkipped(row))
+
+    def allFoldersIsKept(self) -> bool:
+        return all(self.isKept(row) for row in range(len(self.folders)) if not self.isSkipped(row))
+
+    def setAllFoldersKept(self, value: bool):
+        for row in range(len(self.folders)):
+            if self.isKept(row) is not value and not self.isSkipped(row):
+                self.setKept(row, value)
+
+    def checkShortcuts(self, paths: set[str]):
+        for row, shortcuts in enumerate(self.shortcuts):
+            if self.isSkipped(row):
+                continue
+
+            for shortcutRow, shortcut in enumerate(shortcuts):
+                if shortcut.path in paths:
+                    self.setChecked(row, shortcutRow, True)
+
+    def notSkippedShortcuts(self) -> list[StartMenuShortcut]:
+        return [s for row, shortcuts in enumerate(self.shortcuts) if not self.isSkipped(row) for s in shortcuts]
+
+    def shortcutRenamed(self, index: core.QModelIndex):
+        # noinspection PyUnresolvedReferences
+        self.dataChanged.emit(index, index)
+
+
+class ShortcutDelegate(widgets.QStyledItemDelegate):
+    """
+    Whole row is clickable (as the checkbox / label widgets rows were): a click on a shortcut reverses its check,
+    a click on a folder reverses its kept state.
+    """
+    def __init__(self, parent: core.QObject = None):
+        super().__init__(parent)
+        self.pressed: Optional[core.QPersistentModelIndex] = None
+
+    def editorEvent(self, event: core.QEvent, model: ShortcutModel, option: widgets.QStyleOptionViewItem,
+                    index: core.QModelIndex) -> bool:
+        if event.type() not in (core.QEvent.Type.MouseButtonPress, core.QEvent.Type.MouseButtonRelease,
+                                core.QEvent.Type.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+
+        if event.button() != core.Qt.MouseButton.LeftButton:
+            return False
 
-        return self.getIcon()
+        if event.type() == core.QEvent.Type.MouseButtonPress:
+            self.pressed = core.QPersistentModelIndex(index)
+            return True
 
-    def openInExplorer(self):
-        subprocess.Popen(f'explorer.exe /select, "{self.shortcut.path}"', shell=True)
+        if event.type() == core.QEvent.Type.MouseButtonRelease and self.pressed == index:
+            self.pressed = None
+            row = model.folderRow(index)
 
-    def openTargetInExplorer(self):
-        subprocess.Popen(f'explorer.exe /select, "{self.targetPath}"', shell=True)
+            if index.internalId():
+                model.setChecked(row, index.row(), not model.isChecked(row, index.row()))
+
+            elif not model.isSkipped(row):
+                model.reverseKeptState(row)
+                LOG.debug(f'Set {"<keep>" if model.isKept(row) else "<unkeep>"} state to folder '
+                          f'"{model.folders[row].name}"')
+
+        return True
+
+
+class ScanWorker(core.QThread):
+    batchFound = core.pyqtSignal(list)
+
+    def run(self):
+        for batch in StartMenu.iter_folders():
+            if self.isInterruptionRequested():
+                return LOG.debug('Scan was interrupted')
+
+            self.batchFound.emit(batch)
+
+
+class ShortcutsSearchWorker(core.QThread):
+    found = core.pyqtSignal(list)
+
+    def __init__(self, search: Callable[[], list], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.search = search
+
+    def run(self):
+        self.found.emit(self.search())
+
+
+class WatchWorker(core.QThread):
+    changed = core.pyqtSignal(object)  # watch.WatchChanges
+
+    def __init__(self, roots: list[str], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.roots = roots
+
+    def run(self):
+        if (backend := watch.get_backend(self.roots)) is None:
+            return
+
+        watcher = watch.Watcher(self.roots, backend)
+        LOG.debug(f'Watch {self.roots} ({backend.__class__.__name__})')
+
+        try:
+            while not self.isInterruptionRequested():
+                if (changes := watcher.poll(0.2)) is not None:
+                    self.changed.emit(changes)
+        finally:
+            watcher.close()
+
+
+class ShortcutArea(widgets.QTreeView):
+    """
+    Folders and their shortcuts shown by ShortcutModel, only visible rows are painted.
+    """
+    scanFinished = core.pyqtSignal()
+    foldersChanged = core.pyqtSignal()  # by watched file system changes
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.folders: list[SMFolder] = []
+        self.emptyFolders: list[SMFolder] = []
+        self.scannedFolders: dict[str, SMFolder] = {}  # all found folders (including empty) by key
+
+        self.shortcutModel = ShortcutModel(self)
+        self.searchWorker: Optional[ShortcutsSearchWorker] = None
+        self.pendingChanges = watch.WatchChanges()  # watched changes which came during scan
+
+        self.scanProgressBar = widgets.QProgressBar(self)
+        self.scanProgressBar.setRange(0, 0)  # busy indicator
+        self.scanProgressBar.setTextVisible(False)
+        self.scanProgressBar.setFixedHeight(4)
+        self.setViewportMargins(0, self.scanProgressBar.height(), 0, 0)  # until scan is finished
+
+        self.setModel(self.shortcutModel)
+        self.setItemDelegate(ShortcutDelegate(self))
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(False)
+        self.setItemsExpandable(False)  # folders are always expanded
+        self.setIndentation(0)
+        self.setUniformRowHeights(True)
+        self.setSelectionMode(widgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setVerticalScrollBarPolicy(core.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setStyleSheet('QTreeView {background-color: #FFFFFF; border: 1px solid #2979FF;}')
+        # noinspection PyUnresolvedReferences
+        self.shortcutModel.rowsInserted.connect(self.expandInsertedFolders)
+
+        self.scanWorker = ScanWorker(self)
+        # noinspection PyUnresolvedReferences
+        self.scanWorker.batchFound.connect(self.addFolders)
+        # noinspection PyUnresolvedReferences
+        self.scanWorker.finished.connect(self.finishScan)
+
+        self.watchWorker = WatchWorker([d.path for d in StartMenu.default_dirs if d.is_accessible], self)
+        # noinspection PyUnresolvedReferences
+        self.watchWorker.changed.connect(self.applyWatchChanges)
+        # noinspection PyUnresolvedReferences
+        widgets.QApplication.instance().aboutToQuit.connect(self.stopWatch)
+
+        self.watchWorker.start()  # before the scan, so changes during it aren't lost
+        self.scanWorker.start()
+        LOG.debug('Start scan')
+
+    def resizeEvent(self, event: gui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self.scanProgressBar.setGeometry(self.frameWidth(), self.frameWidth(), self.viewport().width(),
+                                         self.scanProgressBar.height())
+
+    def expandInsertedFolders(self, parent: core.QModelIndex, first: int, last: int):
+        if not parent.isValid():
+            for row in range(first, last + 1):
+                self.expand(self.shortcutModel.index(row, 0))
 
     def contextMenuEvent(self, event: gui.QContextMenuEvent) -> None:
-        LOG.debug(f'Shortcut\'s "{self.shortcut.name}" context menu is called')
+        index = self.indexAt(event.pos())
+
+        if not index.isValid():
+            return
+
+        if index.internalId():
+            self.shortcutContextMenu(index, event.globalPos())
+        else:
+            self.folderContextMenu(index.row(), event.globalPos())
+
+    def shortcutContextMenu(self, index: core.QModelIndex, pos: core.QPoint):
+        shortcut = self.shortcutModel.shortcutAt(index)
+        LOG.debug(f'Shortcut\'s "{shortcut.name}" context menu is called')
         menu = widgets.QMenu(self)
         wrapContextMenuStyleSheet(menu)
 
         openInExplorerAction = gui.QAction(gui.QIcon(resource_path('icons/open-shortcut-directory.png')),
-                                       TEXT.OPEN_SHORTCUT_PATH, self)
+                                           TEXT.OPEN_SHORTCUT_PATH, self)
         openTargetInExplorerAction = gui.QAction(gui.QIcon(resource_path('icons/open-shortcut-target.png')),
-                                             TEXT.OPEN_TARGET_PATH, self)
+                                                 TEXT.OPEN_TARGET_PATH, self)
         renameAction = gui.QAction(gui.QIcon(resource_path('icons/rename-svgrepo-com.png')),
-                                       TEXT.RENAME, self)
+                                   TEXT.RENAME, self)
 
         menu.addActions([openInExplorerAction, openTargetInExplorerAction])
         menu.addSeparator()
         menu.addAction(renameAction)
 
-        action = menu.exec(event.globalPos())
+        action = menu.exec(pos)
 
         if action is openInExplorerAction:
-            LOG.debug(f'Open shortcut "{self.shortcut.name}" path')
-            self.openInExplorer()
+            LOG.debug(f'Open shortcut "{shortcut.name}" path')
+            subprocess.Popen(f'explorer.exe /select, "{shortcut.path}"', shell=True)
 
         elif action is openTargetInExplorerAction:
-            LOG.debug(f'Open shortcut "{self.shortcut.name}" target')
-            self.openTargetInExplorer()
+            LOG.debug(f'Open shortcut "{shortcut.name}" target')
+            subprocess.Popen(f'explorer.exe /select, "{resolveTargetPath(shortcut)}"', shell=True)
 
         elif action is renameAction:
             LOG.debug('"Rename shortcut" context menu action is pressed')
-            dialog = EnterShortcutNameDialog(TEXT.RENAME_SHORTCUT, TEXT.ENTER_NAME, icon=self.icon())
-            dialog.setTextValue(self.shortcut.name)
+            icon = self.shortcutModel.data(index, core.Qt.ItemDataRole.DecorationRole)
+            dialog = EnterShortcutNameDialog(TEXT.RENAME_SHORTCUT, TEXT.ENTER_NAME, icon=icon)
+            dialog.setTextValue(shortcut.name)
 
             if not (name := dialog.get_validated_name(dialog.exec(), dialog.textValue())):
                 return
 
-            old_name = self.shortcut.name
+            old_name = shortcut.name
             try:
-                self.shortcut.rename(name)
+                shortcut.rename(name)
             except OSError as e:
                 LOG.info(f'Failed to rename shortcut "{old_name}"')
                 if e.winerror == 5:
@@ -380,131 +975,189 @@ class StartMenuShortcutGUI(widgets.QCheckBox):
                     MessageBox.critical(TEXT.RENAME_SHORTCUT_ERROR.format(winerror=e.winerror), parent=dialog)
 
             else:
-                self.updateUI()
-                dialog.setWindowIcon(self.icon())
-                LOG.info(f'Shortcut "{old_name}" was renamed to "{self.shortcut.name}"')
+                self.shortcutModel.shortcutRenamed(index)
+                dialog.setWindowIcon(self.shortcutModel.data(index, core.Qt.ItemDataRole.DecorationRole))
+                LOG.info(f'Shortcut "{old_name}" was renamed to "{shortcut.name}"')
                 MessageBox.information(
                     TEXT.SHORTCUT_RENAMED.format(old_name=old_name, new_name=name),
                     TEXT.COMPLETE,
                     parent=dialog
                 )
 
+    def folderContextMenu(self, row: int, pos: core.QPoint):
+        model = self.shortcutModel
+        isKept, isSkipped = model.isKept(row), model.isSkipped(row)
+        menu = widgets.QMenu(self)
+        wrapContextMenuStyleSheet(menu)
 
-class StartMenuFolderGUI(widgets.QLabel):
-    def __init__(self,
-                 folder: SMFolder,
-                 guiShortcuts: list[StartMenuShortcutGUI],
-                 area: 'ShortcutArea',
-                 *args,
-                 **kwargs):
-        super().__init__(area, *args, **kwargs)
+        keepAction = gui.QAction(TEXT.UNKEEP_FOLDER if isKept else TEXT.KEEP_FOLDER, self)
 
-        self.folder = folder
-        self.guiShortcuts = guiShortcuts
-        self.area = area
+        keepAllFoldersAction = gui.QAction(self)
+        allFoldersIsKept = model.allFoldersIsKept()
+        keepAllFoldersAction.setText(TEXT.UNKEEP_ALL_FOLDERS if allFoldersIsKept else TEXT.KEEP_ALL_FOLDERS)
 
-        self.isKept = None
-        self.keptStyleSheet = 'color: #2979FF;'
-        self.notKeptStyleSheet = 'color: #54595d;'
+        skipAction = gui.QAction(TEXT.DONT_SKIP_FOLDER if isSkipped else TEXT.SKIP_FOLDER, self)
 
-        self.isSkipped = None
-        self.isKeptBeforeSkipping = None
+        selectBrokenAction = gui.QAction(TEXT.SELECT_BROKEN_SHORTCUTS, self)
+        selectDuplicatesAction = gui.QAction(TEXT.SELECT_DUPLICATE_SHORTCUTS, self)
+        for a in (selectBrokenAction, selectDuplicatesAction):
+            a.setDisabled(self.isScanning() or self.isSearching())
 
-        self.setText(self.folder.name)
-        self.setKeptState(True)
-        self.setSkippedState(False)
+        menu.addActions([
+            keepAction,
+            keepAllFoldersAction,
+            skipAction
+        ] if not isSkipped else [skipAction])
+        menu.addSeparator()
+        menu.addActions([selectBrokenAction, selectDuplicatesAction])
 
-    def setKeptState(self, value: bool):
-        self.isKept = value
-        self.setStyleSheet(self.keptStyleSheet if value else self.notKeptStyleSheet)
+        action = menu.exec(pos)
 
-    def setSkippedState(self, value: bool):
-        self.isSkipped = value
+        if not action:
+            return
 
-        for shortcut in self.guiShortcuts:
-            if value:
-                shortcut.setChecked(False)
-            shortcut.setDisabled(value)
+        elif action is keepAction:
+            model.reverseKeptState(row)
 
-        if value and self.isKept:
-            self.reverseKeptState()
-            self.isKeptBeforeSkipping = True
+        elif action is skipAction:
+            model.reverseSkippedState(row)
 
-        elif not value and self.isKeptBeforeSkipping:
-            self.reverseKeptState()
-            self.isKeptBeforeSkipping = None
+        elif action is keepAllFoldersAction:
+            model.setAllFoldersKept(not allFoldersIsKept)
 
-    def reverseKeptState(self):
-        self.setKeptState(not self.isKept)
+        elif action is selectBrokenAction:
+            self.selectBrokenShortcuts()
 
-    def reverseSkippedState(self):
-        self.setSkippedState(not self.isSkipped)
+        elif action is selectDuplicatesAction:
+            self.selectDuplicateShortcuts()
 
-    def contextMenuEvent(self, event: gui.QContextMenuEvent) -> None:
-        menu = widgets.QMenu(self)
-        wrapContextMenuStyleSheet(menu)
+    def isScanning(self) -> bool:
+        return self.scanWorker.isRunning()
 
-        keepAction = gui.QAction(TEXT.UNKEEP_FOLDER if self.isKept else TEXT.KEEP_FOLDER, self)
+    def stopScan(self):
+        self.scanWorker.requestInterruption()
+        self.scanWorker.wait()
 
-        keepAllFoldersAction = gui.QAction(self)
-        allFoldersIsKept = self.area.allFoldersIsKept()
-        keepAllFoldersAction.setText(TEXT.UNKEEP_ALL_FOLDERS if allFoldersIsKept else TEXT.KEEP_ALL_FOLDERS)
+        if self.searchWorker is not None:
+            self.searchWorker.wait()
 
-        skipAction = gui.QAction(TEXT.DONT_SKIP_FOLDER if self.isSkipped else TEXT.SKIP_FOLDER, self)
+        self.stopWatch()
 
-        menu.addActions([
-            keepAction,
-            keepAllFoldersAction,
-            skipAction
-        ] if not self.isSkipped else [skipAction])
+    def stopWatch(self):
+        self.watchWorker.requestInterruption()
+        self.watchWorker.wait()
 
-        action = menu.exec(event.globalPos())
+    def applyWatchChanges(self, changes: watch.WatchChanges):
+        self.pendingChanges.merge(changes)
 
-        if not action:
+        if self.isScanning():
+            return  # applied by finishScan
+
+        changes, self.pendingChanges = self.pendingChanges, watch.WatchChanges()
+        if changes.full:
+            StartMenu.update()
+            self.refresh()
+        else:
+            self.updateFolders(changes.keys)
+
+        # noinspection PyUnresolvedReferences
+        self.foldersChanged.emit()
+
+    def isSearching(self) -> bool:
+        return self.searchWorker is not None
+
+    def startSearch(self, search: Callable[[list[StartMenuShortcut]], list], onFound: Callable[[list], None]):
+        """
+        Run search over shortcuts of not skipped folders in a worker thread, onFound gets its result.
+        """
+        if self.isScanning() or self.isSearching():
             return
 
-        elif action is keepAction:
-            self.reverseKeptState()
+        shortcuts = self.shortcutModel.notSkippedShortcuts()
+        self.searchWorker = ShortcutsSearchWorker(lambda: search(shortcuts), self)
+        # noinspection PyUnresolvedReferences
+        self.searchWorker.found.connect(self.finishSearch)
+        # noinspection PyUnresolvedReferences
+        self.searchWorker.found.connect(onFound)
+        # noinspection PyUnresolvedReferences
+        self.searchWorker.finished.connect(self.searchWorker.deleteLater)
+        self.setCursor(gui.QCursor(core.Qt.CursorShape.BusyCursor))
+        self.searchWorker.start()
+        LOG.debug(f'Start search among {len(shortcuts)} shortcuts')
+
+    def finishSearch(self):
+        self.searchWorker = None
+        self.unsetCursor()
+
+    def selectBrokenShortcuts(self):
+        self.startSearch(lambda s: find_broken_shortcuts(s, cache=StartMenu.target_cache), self.checkBrokenShortcuts)
+
+    def checkBrokenShortcuts(self, broken: list[StartMenu.resolved_target]):
+        paths = {r.shortcut.path for r in broken}
+        self.shortcutModel.checkShortcuts(paths)
+
+        LOG.info(f'Found {len(paths)} broken shortcuts')
+        MessageBox.information(
+            TEXT.BROKEN_SHORTCUTS_SELECTED.format(count=len(paths)) if paths else TEXT.NO_BROKEN_SHORTCUTS,
+            parent=self
+        )
 
-        elif action is skipAction:
-            self.reverseSkippedState()
+    def selectDuplicateShortcuts(self):
+        self.startSearch(lambda s: find_duplicate_shortcuts(s, cache=StartMenu.target_cache),
+                         self.checkDuplicateShortcuts)
 
-        elif action is keepAllFoldersAction:
-            keptState = not allFoldersIsKept
+    def checkDuplicateShortcuts(self, groups: list[StartMenu.duplicate_group]):
+        paths = {s.path for g in groups for s in g.duplicates}  # suggested to keep ones stay unchecked
+        self.shortcutModel.checkShortcuts(paths)
 
-            for folder in self.area.guiFolders:
-                if folder.isKept is not keptState and not folder.isSkipped:
-                    folder.setKeptState(keptState)
+        LOG.info(f'Found {len(groups)} groups of duplicate shortcuts: ' +
+                 '; '.join(f'keep "{g.keep.path}" of {len(g.shortcuts)}' for g in groups))
+        MessageBox.information(
+            TEXT.DUPLICATE_SHORTCUTS_SELECTED.format(count=len(paths), groups=len(groups)) if groups
+            else TEXT.NO_DUPLICATE_SHORTCUTS,
+            parent=self
+        )
 
-    def mousePressEvent(self, event: gui.QMouseEvent):
-        if event.button() == core.Qt.MouseButton.LeftButton and not self.isSkipped:
-            self.reverseKeptState()
-            LOG.debug(f'Set {"<keep>" if self.isKept else "<unkeep>"} state to folder "{self.folder.name}"')
+    def addFolders(self, folders: list[SMFolder]):
+        """
+        Display a batch of found folders, same-named folders are merged into already displayed ones.
+        """
+        for folder in folders:
+            added = folder.shortcuts
+            if (scanned := self.scannedFolders.get(folder.key)) is not None:
+                folder = StartMenuExtendedFolder([scanned, folder])
 
+            self.scannedFolders[folder.key] = folder
+            if folder.is_empty():
+                continue
 
-class ShortcutArea(widgets.QScrollArea):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+            if scanned is None or scanned.is_empty():
+                self.shortcutModel.insertFolder(folder)
+            else:
+                row = self.shortcutModel.rowOf(folder.key)
+                self.shortcutModel.updateFolder(row, StartMenu.folder_diff(folder, added, []))
 
-        self.folders = StartMenu.get_folders()
-        self.emptyFolders = self.popEmptyFolders()
+    def finishScan(self):
+        folders = sorted(self.scannedFolders.values(), key=lambda x: x.key)
+        self.emptyFolders = self.popEmptyFolders(folders)
+        self.folders = folders
 
-        self.guiFolders: list[StartMenuFolderGUI] = []
-        self.initWidget = widgets.QWidget()
-        self.initLayout = widgets.QVBoxLayout()
+        self.scanProgressBar.hide()
+        self.setViewportMargins(0, 0, 0, 0)
+        LOG.info(f'Scan finished: {len(self.folders)} folders, {len(self.emptyFolders)} empty folders')
+        # noinspection PyUnresolvedReferences
+        self.scanFinished.emit()
 
-        self.setVerticalScrollBarPolicy(core.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.setWidgetResizable(True)
-        self.setStyleSheet('QScrollArea {background-color: #F0F0F0; border: 1px solid #2979FF;}')
-        self.initWidget.setStyleSheet('QWidget {background-color: #FFFFFF;}')
-        self.displayShortcuts()
+        if self.pendingChanges:
+            self.applyWatchChanges(watch.WatchChanges())
 
-    def popEmptyFolders(self) -> list[SMFolder]:
+    @staticmethod
+    def popEmptyFolders(folders: list[SMFolder]) -> list[SMFolder]:
         e, index = [], 0
 
-        while index < len(self.folders):
-            if self.folders[index].is_empty():
-                e.append(self.folders.pop(index))
+        while index < len(folders):
+            if folders[index].is_empty():
+                e.append(folders.pop(index))
                 continue
 
             index += 1
@@ -512,29 +1165,58 @@ class ShortcutArea(widgets.QScrollArea):
         return e
 
     def allFoldersIsKept(self) -> bool:
-        return all(folder.isKept for folder in self.guiFolders if not folder.isSkipped)
+        return self.shortcutModel.allFoldersIsKept()
+
+    def applyDiff(self, diff: StartMenu.menu_diff, folders: list[SMFolder]):
+        """
+        Update rows by diff of displayed folders and their new scan result (folders).
+        """
+        model = self.shortcutModel
 
-    def addWidget(self, widget: widgets.QWidget):
-        self.initLayout.addWidget(widget)
+        for folder in diff.removed:
+            model.removeFolder(model.rowOf(folder.key))
 
-    def setWidgets(self):
-        self.initLayout.addStretch()
-        self.initWidget.setLayout(self.initLayout)
-        self.setWidget(self.initWidget)
+        for folderDiff in diff.changed:
+            model.updateFolder(model.rowOf(folderDiff.folder.key), folderDiff)
 
-    def displayShortcuts(self):
-        for folder in self.folders:
-            guiFolder = StartMenuFolderGUI(folder, [], self)
-            self.addWidget(guiFolder)
+        for folder in diff.added:
+            model.insertFolder(folder)
 
-            for shortcut in folder.shortcuts:
-                guiShortcut = StartMenuShortcutGUI(shortcut, self)
-                self.addWidget(guiShortcut)
-                guiFolder.guiShortcuts.append(guiShortcut)
+        for folder in folders:  # unchanged folders get new objects too
+            if (row := model.rowOf(folder.key)) is not None and model.folders[row] is not folder:
+                model.setFolder(row, folder)
 
-            self.guiFolders.append(guiFolder)
+    def refresh(self):
+        """
+        Rescan SM dirs and update only changed rows, kept/skipped/checked states are kept.
+        """
+        if self.isScanning():
+            return LOG.debug('Skip refresh, scan is not finished')
 
-        self.setWidgets()
+        self.pendingChanges = watch.WatchChanges()
+        folders = StartMenu.get_folders()
+        emptyFolders = self.popEmptyFolders(folders)
+        diff = StartMenu.diff(self.folders, folders)
+        self.applyDiff(diff, folders)
+
+        self.folders, self.emptyFolders = folders, emptyFolders
+        LOG.info(f'Refresh shortcuts: {len(diff.added)} folders were added, {len(diff.removed)} removed, '
+                 f'{len(diff.changed)} changed')
+
+    def updateFolders(self, keys: set[str]):
+        """
+        Rescan only folders with the given keys (changed ones reported by watch), as refresh does for all.
+        """
+        folders = StartMenu.scan_folders(keys)
+        emptyFolders = self.popEmptyFolders(folders)
+        diff = StartMenu.diff([f for f in self.folders if f.key in keys], folders)
+        self.applyDiff(diff, folders)
+
+        self.folders = sorted([f for f in self.folders if f.key not in keys] + folders, key=lambda x: x.key)
+        self.emptyFolders = sorted([f for f in self.emptyFolders if f.key not in keys] + emptyFolders,
+                                   key=lambda x: x.key)
+        LOG.info(f'Update changed folders {sorted(keys)}: {len(diff.added)} were added, {len(diff.removed)} removed, '
+                 f'{len(diff.changed)} changed')
 
 
 class PathForMoveLabel(widgets.QLabel):
@@ -603,39 +1285,87 @@ class ApplyToEmptyFoldersCheckBox(widgets.QCheckBox):
     def __init__(self, emptyFolders: list[SMFolder], *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self.setEmptyFolders(emptyFolders)
+
+    def setEmptyFolders(self, emptyFolders: list[SMFolder]):
         self.emptyFolders = emptyFolders
 
         tip = TEXT.NO_EMPTY_FOLDERS if not self.emptyFolders else ', '.join(f'"{x.name}"' for x in self.emptyFolders)
         self.setToolTip(tip)
 
 
+class CleanProgressDialog(widgets.QProgressDialog):
+    folderHandled = core.pyqtSignal(int, str)
+    cleanFinished = core.pyqtSignal(Future)
+
+    def __init__(self, cleaner: SMCleaner, parent: widgets.QWidget = None):
+        super().__init__(TEXT.CLEANING, TEXT.CANCEL, 0, len(cleaner.folders2clean), parent)
+        self.cleaner = cleaner
+        # called from the clean thread, signal passes progress to the GUI thread
+        self.cleaner.progress = lambda handled, total, clean_f: self.folderHandled.emit(handled, clean_f.folder.name)
+
+        self.setWindowTitle(TEXT.MAINWINDOW_TITLE)
+        self.setWindowModality(core.Qt.WindowModality.WindowModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+
+        # noinspection PyUnresolvedReferences
+        self.folderHandled.connect(self.folderHandledEvent)
+        # noinspection PyUnresolvedReferences
+        self.canceled.connect(self.cancelEvent)
+
+    def start(self):
+        LOG.debug('Start async clean')
+        self.setValue(0)
+        future = self.cleaner.clean_async()
+        future.add_done_callback(self.cleanFinished.emit)
+
+    def folderHandledEvent(self, handled: int, folderName: str):
+        self.setValue(handled)
+        self.setLabelText(f'{TEXT.CLEANING}\n{folderName}')
+
+    def cancelEvent(self):
+        LOG.info('Cancel clean')
+        self.cleaner.cancel()
+
+    def finish(self):
+        # noinspection PyUnresolvedReferences
+        self.canceled.disconnect(self.cancelEvent)  # closing emits canceled
+        self.close()
+        self.deleteLater()
+
+
 class ApplyButton(widgets.QPushButton):
     def __init__(self, mainWindow: 'MainWindow', *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.mainWindow = mainWindow
+        self.progressDialog: Optional[CleanProgressDialog] = None
+        self.actionText = None
 
         self.setCursor(gui.QCursor(core.Qt.CursorShape.PointingHandCursor))
 
     def mousePressEvent(self, event: gui.QMouseEvent) -> None:
-        if event.button() != core.Qt.MouseButton.LeftButton:
+        if event.button() != core.Qt.MouseButton.LeftButton or self.progressDialog:
             return
 
         LOG.debug('"Apply" button is pressed')
 
         foldersToClean: list[StartMenu.folder_to_clean] = []
-        for guiFolder in self.mainWindow.shortcutArea.guiFolders:
-            if guiFolder.isSkipped:
+        model = self.mainWindow.shortcutArea.shortcutModel
+        for row, folder in enumerate(model.folders):
+            if model.isSkipped(row):
                 continue
 
-            folderToClean = StartMenu.folder_to_clean(guiFolder.folder, guiFolder.isKept, [], [])
+            folderToClean = StartMenu.folder_to_clean(folder, model.isKept(row), [], [])
             apply2Checked = self.mainWindow.applyToCheckedRadioButton.isChecked()
 
-            for guiShortcut in guiFolder.guiShortcuts:
-                if apply2Checked is guiShortcut.isChecked():
-                    folderToClean.shortcuts_to_apply.append(guiShortcut.shortcut)
+            for shortcutRow, shortcut in enumerate(model.shortcuts[row]):
+                if apply2Checked is model.isChecked(row, shortcutRow):
+                    folderToClean.shortcuts_to_apply.append(shortcut)
                 else:
-                    folderToClean.shortcuts_to_save.append(guiShortcut.shortcut)
+                    folderToClean.shortcuts_to_save.append(shortcut)
 
             if not folderToClean.shortcuts_to_apply and folderToClean.is_kept:
                 continue
@@ -655,12 +1385,24 @@ class ApplyButton(widgets.QPushButton):
                 return
 
             action = StartMenu.clean_action.move(path)
-            actionText = TEXT.MOVED
+            self.actionText = TEXT.MOVED
         else:
             action = StartMenu.clean_action.remove()
-            actionText = TEXT.REMOVED
+            self.actionText = TEXT.REMOVED
+
+        self.setDisabled(True)
+        cleaner = StartMenu.cleaner(action, foldersToClean, workers=CONFIG['opt'].getint('clean_workers'))
+        self.progressDialog = CleanProgressDialog(cleaner, self.mainWindow)
+        # noinspection PyUnresolvedReferences
+        self.progressDialog.cleanFinished.connect(self.cleanFinishedEvent)
+        self.progressDialog.start()
+
+    def cleanFinishedEvent(self, future: Future):
+        self.progressDialog.finish()
+        self.progressDialog = None
+        self.setDisabled(False)
 
-        cleanResult = StartMenu.clean(action, foldersToClean)
+        cleanResult: StartMenu.clean_result = future.result()
         if cleanResult.errors:
             MessageBox.warning(
                 TEXT.HAVE_CLEAN_ERRORS_WARNING.format(
@@ -668,16 +1410,16 @@ class ApplyButton(widgets.QPushButton):
                     log_fp=cleanResult.log_fp,
                     cleanedFolders=cleanResult.cleaned_folders,
                     appliedShortcuts=cleanResult.applied_shortcuts,
-                    actionText=actionText
+                    actionText=self.actionText
                 ),
                 parent=self
             )
         else:
             MessageBox.information(
-                TEXT.APPLY_CLEANED.format(
+                (TEXT.CLEAN_CANCELLED if cleanResult.cancelled else TEXT.APPLY_CLEANED).format(
                     cleanedFolders=cleanResult.cleaned_folders,
                     appliedShortcuts=cleanResult.applied_shortcuts,
-                    actionText=actionText
+                    actionText=self.actionText
                 ),
                 TEXT.COMPLETE,
                 parent=self
@@ -743,7 +1485,6 @@ class MaterialStylist(Stylist):
     def _apply(self):
         self.mw.setFixedSize(405, 317)
         self.mw.centralwidget.setStyleSheet('background-color: #EFEFF1')
-        self.mw.shortcutArea.initLayout.setSpacing(0)
 
         # for all users button
         NewShortcutInputDialog.forAllUsersCheckboxPosition = (118 if CONFIG['opt']['lang'] == 'ru' else 194,
@@ -821,6 +1562,11 @@ class MainWindow(widgets.QMainWindow):
         self.apply2EmptyFolders = ApplyToEmptyFoldersCheckBox(self.shortcutArea.emptyFolders, self.centralwidget)
 
         self.applyButton = ApplyButton(self, self.centralwidget)
+        self.applyButton.setDisabled(self.shortcutArea.isScanning())
+        # noinspection PyUnresolvedReferences
+        self.shortcutArea.scanFinished.connect(self.scanFinishedEvent)
+        # noinspection PyUnresolvedReferences
+        self.shortcutArea.foldersChanged.connect(self.foldersChangedEvent)
 
         self.retranslateUi()
         self.window_style.value(self.app, self).apply()  # apply styles for app and MainWindow
@@ -833,9 +1579,25 @@ class MainWindow(widgets.QMainWindow):
         return instance
 
     def refresh(self) -> 'MainWindow':
-        LOG.info('Update window')
+        LOG.info('Refresh window')
+
+        StartMenu.update()
+        self.shortcutArea.refresh()
+        self.apply2EmptyFolders.setEmptyFolders(self.shortcutArea.emptyFolders)
+        return self
+
+    def scanFinishedEvent(self):
+        self.apply2EmptyFolders.setEmptyFolders(self.shortcutArea.emptyFolders)
+        self.applyButton.setDisabled(False)
+
+    def foldersChangedEvent(self):
+        self.apply2EmptyFolders.setEmptyFolders(self.shortcutArea.emptyFolders)
+
+    def rebuild(self) -> 'MainWindow':  # recreate window (e.g. to apply a new language)
+        LOG.info('Rebuild window')
 
         pos = self.pos()
+        self.shortcutArea.stopScan()
         self.deleteLater()
 
         StartMenu.update()
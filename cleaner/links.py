@@ -0,0 +1,364 @@
+import os
+import ntpath
+import codecs
+import functools
+import struct
+import locale
+from typing import Callable
+
+
+ANSI_ENCODING = 'mbcs' if os.name == 'nt' else locale.getpreferredencoding(False)  # system default code page
+
+LINK_CLSID = bytes.fromhex('0114020000000000c000000000000046')  # 00021401-0000-0000-C000-000000000046
+HEADER_SIZE = 0x4C
+MAX_LNK_SIZE = 1 << 20  # sizes from a damaged file can't make the parser read more
+MAX_URL_SIZE = 64 << 10
+
+
+class LinkFlags:
+    HAS_LINK_TARGET_ID_LIST = 0x1
+    HAS_LINK_INFO = 0x2
+    HAS_NAME = 0x4
+    HAS_RELATIVE_PATH = 0x8
+    HAS_WORKING_DIR = 0x10
+    HAS_ARGUMENTS = 0x20
+    HAS_ICON_LOCATION = 0x40
+    IS_UNICODE = 0x80
+    FORCE_NO_LINK_INFO = 0x100
+    HAS_EXP_STRING = 0x200
+
+
+class LinkInfoFlags:
+    VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+    COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x2
+
+
+ENVIRONMENT_VARIABLE_DATA_BLOCK = 0xA0000001
+
+
+class LinkParseError(ValueError):
+    pass
+
+
+_HEADER = struct.Struct('<I16sI32xi16xH')  # HeaderSize, LinkCLSID, LinkFlags, ..., IconIndex, ..., IDListSize
+_UINT = struct.Struct('<I')
+_USHORT = struct.Struct('<H')
+_UINT_2 = struct.Struct('<2I')
+_UINT_3 = struct.Struct('<3I')
+_LINK_INFO = struct.Struct('<7I')
+_decode_ansi = codecs.getdecoder(ANSI_ENCODING)  # bound once, decoding by name looks the codec up each call
+_decode_utf16 = codecs.getdecoder('utf-16-le')
+_STRING_DATA_FLAGS = (LinkFlags.HAS_NAME, LinkFlags.HAS_RELATIVE_PATH, LinkFlags.HAS_WORKING_DIR,
+                      LinkFlags.HAS_ARGUMENTS, LinkFlags.HAS_ICON_LOCATION)
+_USED_STRINGS = LinkFlags.HAS_RELATIVE_PATH | LinkFlags.HAS_ARGUMENTS | LinkFlags.HAS_ICON_LOCATION
+_ALL_STRINGS = _USED_STRINGS | LinkFlags.HAS_NAME | LinkFlags.HAS_WORKING_DIR
+_STRING_DATA_MASK = sum(_STRING_DATA_FLAGS)
+_PRESENT_STRINGS = {  # LinkFlags & _STRING_DATA_MASK: ((index, flag) of present strings, ...)
+    mask: tuple((i, f) for i, f in enumerate(_STRING_DATA_FLAGS) if mask & f) for mask in range(_STRING_DATA_MASK + 1)
+}
+
+
+class ShortcutInfo:
+    """
+    Parsed shortcut (.lnk / .url) metadata.
+    """
+    __slots__ = ('target', 'arguments', 'working_dir', 'icon_location', 'icon_index', 'description', 'flags')
+
+    def __init__(self,
+                 target: str = '',
+                 arguments: str = '',
+                 working_dir: str = '',
+                 icon_location: str = '',
+                 icon_index: int = 0,
+                 description: str = '',
+                 flags: int = 0):
+        self.target = target
+        self.arguments = arguments
+        self.working_dir = working_dir
+        self.icon_location = icon_location
+        self.icon_index = icon_index
+        self.description = description
+        self.flags = flags
+
+    def __repr__(self):
+        fields = ', '.join(f'{n}={getattr(self, n)!r}' for n in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other):
+        if not isinstance(other, ShortcutInfo):
+            return NotImplemented
+
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+class _LnkReader:
+    """
+    Reads the file only as far as parsed sections need: a small .lnk is read by one call and parsed straight
+    from that buffer, the rest of a larger one is read only if its sections don't fit the first chunk.
+    """
+    CHUNK = 4096
+
+    def __init__(self, read: Callable[[int], bytes]):
+        self.read = read
+        self.buf = read(self.CHUNK)
+        self.is_complete = len(self.buf) < self.CHUNK  # EOF is reached
+
+    def need(self, end: int):
+        if end <= len(self.buf):
+            return
+
+        if end > MAX_LNK_SIZE:
+            raise LinkParseError(f'structure exceeds {MAX_LNK_SIZE} bytes')
+
+        if not self.is_complete:
+            self.buf += self.read(max(end - len(self.buf), self.CHUNK))
+
+        if end > len(self.buf):
+            raise LinkParseError('unexpected end of file')
+
+    def read_all(self) -> bool:  # -> whether something was read
+        if self.is_complete:
+            return False
+
+        self.buf += self.read(MAX_LNK_SIZE + 1 - len(self.buf))
+        self.is_complete = True
+
+        if len(self.buf) > MAX_LNK_SIZE:
+            raise LinkParseError(f'shell link exceeds {MAX_LNK_SIZE} bytes')
+
+        return True
+
+
+def _cstring(buf: bytes, offset: int, end: int) -> str:  # NUL-terminated ANSI string
+    stop = buf.find(0, offset, end)
+    return _decode_ansi(buf[offset:end if stop < 0 else stop], 'replace')[0]
+
+
+def _wstring(buf: bytes, offset: int, end: int) -> str:  # NUL-terminated UTF-16LE string
+    stop = offset
+
+    while True:
+        stop = buf.find(b'\x00\x00', stop, end)
+
+        if stop < 0:
+            stop = end - (end - offset) % 2
+            break
+
+        if (stop - offset) % 2 == 0:  # aligned to the string chars
+            break
+
+        stop += 1
+
+    return _decode_utf16(buf[offset:stop], 'replace')[0]
+
+
+def _parse_link_info(buf: bytes, start: int) -> str:
+    size, header_size, flags, _, base_offset, net_offset, suffix_offset = _LINK_INFO.unpack_from(buf, start)
+    end = start + size
+    if end > len(buf):
+        raise struct.error('LinkInfo exceeds the buffer')
+
+    base_offset_u = suffix_offset_u = 0
+    if header_size >= 0x24:
+        base_offset_u, suffix_offset_u = _UINT_2.unpack_from(buf, start + 0x1C)
+
+    if suffix_offset_u:
+        suffix = _wstring(buf, start + suffix_offset_u, end)
+    elif suffix_offset and start + suffix_offset < end and buf[start + suffix_offset]:  # usually an empty string
+        suffix = _cstring(buf, start + suffix_offset, end)
+    else:
+        suffix = ''
+
+    if flags & LinkInfoFlags.VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if base_offset_u:
+            return _wstring(buf, start + base_offset_u, end) + suffix
+
+        return _cstring(buf, start + base_offset, end) + suffix
+
+    if flags & LinkInfoFlags.COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX:
+        net_start = start + net_offset
+        _, _, net_name_offset = _UINT_3.unpack_from(buf, net_start)
+
+        if net_name_offset > 0x14:  # NetNameOffsetUnicode is present
+            net_name = _wstring(buf, net_start + _UINT.unpack_from(buf, net_start + 0x14)[0], end)
+        else:
+            net_name = _cstring(buf, net_start + net_name_offset, end)
+
+        return net_name + '\\' + suffix if suffix and not net_name.endswith('\\') else net_name + suffix
+
+    return ''
+
+
+def _parse_sections(buf: bytes, wanted: int) -> tuple[int, int, str, list[str], int]:
+    """
+    Parse header, LinkInfo and StringData of buf. Returns flags, icon index, LinkInfo target, StringData strings
+    (in _STRING_DATA_FLAGS order, only ones with a flag in wanted are decoded, others are empty) and the ExtraData
+    offset. Raises struct.error if the sections don't fit in buf.
+    """
+    header_size, clsid, flags, icon_index, id_list_size = _HEADER.unpack_from(buf)
+    if header_size != HEADER_SIZE or clsid != LINK_CLSID:
+        raise LinkParseError('not a shell link')
+
+    offset = HEADER_SIZE + 2 + id_list_size if flags & LinkFlags.HAS_LINK_TARGET_ID_LIST else HEADER_SIZE
+    target = ''
+
+    if flags & LinkFlags.HAS_LINK_INFO:
+        if not flags & LinkFlags.FORCE_NO_LINK_INFO:
+            target = _parse_link_info(buf, offset)
+
+        offset += _UINT.unpack_from(buf, offset)[0]
+
+    char_size, decode = (2, _decode_utf16) if flags & LinkFlags.IS_UNICODE else (1, _decode_ansi)
+    strings = ['', '', '', '', '']
+
+    for i, flag in _PRESENT_STRINGS[flags & _STRING_DATA_MASK]:
+        start = offset + 2
+        offset = start + _USHORT.unpack_from(buf, offset)[0] * char_size
+
+        if flag & wanted:
+            strings[i] = decode(buf[start:offset], 'replace')[0]  # checked by the offset test below
+
+    if offset > len(buf):
+        raise struct.error('StringData exceeds the buffer')
+
+    return flags, icon_index, target, strings, offset
+
+
+def _parse_env_target(r: _LnkReader, offset: int) -> str:
+    """
+    Find EnvironmentVariableDataBlock in ExtraData section and get its (unexpanded) target.
+    """
+    while True:
+        try:
+            r.need(offset + 8)
+        except LinkParseError:
+            return ''
+
+        size, signature = _UINT_2.unpack_from(r.buf, offset)
+        if size < 8:  # TerminalBlock
+            return ''
+
+        if signature == ENVIRONMENT_VARIABLE_DATA_BLOCK and size >= 0x314:
+            r.need(offset + 0x314)
+            return _wstring(r.buf, offset + 0x10C, offset + 0x314) or _cstring(r.buf, offset + 8, offset + 0x10C)
+
+        offset += size
+
+
+def parse_lnk_stream(stream, path: str = '', all_strings: bool = False) -> ShortcutInfo:
+    """
+    Parse Shell Link (MS-SHLLINK) binary from stream.
+
+    :param path: .lnk path, is used to resolve target from RelativePath if there is no LinkInfo
+    :param all_strings: decode description and working dir too, the cleaner doesn't use them
+    """
+    return _parse_lnk(_LnkReader(stream.read), path, all_strings)
+
+
+def _parse_lnk(r: _LnkReader, path: str, all_strings: bool) -> ShortcutInfo:
+    wanted = _ALL_STRINGS if all_strings else _USED_STRINGS
+
+    while True:
+        try:
+            flags, icon_index, target, strings, offset = _parse_sections(r.buf, wanted)
+            break
+        except struct.error:  # sections don't fit the first chunk
+            if not r.read_all():
+                raise LinkParseError('unexpected end of file') from None
+
+    description, relative, working_dir, arguments, icon_location = strings
+
+    if not target and flags & LinkFlags.HAS_EXP_STRING:
+        target = ntpath.expandvars(_parse_env_target(r, offset))  # %VAR% syntax on any platform
+
+    if not target and relative:
+        target = os.path.normpath(os.path.join(os.path.dirname(path), relative.replace('\\', os.sep)))
+
+    return ShortcutInfo(target, arguments, working_dir, icon_location, icon_index, description, flags)
+
+
+def parse_lnk(path: str, all_strings: bool = False) -> ShortcutInfo:
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))  # no file object, most links take one read
+    try:
+        return _parse_lnk(_LnkReader(functools.partial(os.read, fd)), path, all_strings)
+    finally:
+        os.close(fd)
+
+
+def _decode_url_file(data: bytes) -> str:
+    if data.startswith(b'\xef\xbb\xbf'):
+        return str(data[3:], 'utf-8', 'replace')
+
+    if data.startswith(b'\xff\xfe'):
+        return str(data[2:], 'utf-16-le', 'replace')
+
+    try:
+        return str(data, 'utf-8')
+    except UnicodeDecodeError:
+        return str(data, ANSI_ENCODING, 'replace')
+
+
+def parse_url_bytes(data: bytes) -> ShortcutInfo:
+    """
+    Parse Internet Shortcut (.url) INI content. Only [InternetShortcut] and [InternetShortcut.W] sections are read,
+    values of the last one (UTF-7, written by Windows for non-ANSI values) take precedence.
+    """
+    values = {}
+    wide = {}
+    section = None
+
+    for line in _decode_url_file(data).splitlines():
+        line = line.strip()
+
+        if line.startswith('['):
+            section = line.lower()
+            continue
+
+        if section == '[internetshortcut]':
+            target = values
+        elif section == '[internetshortcut.w]':
+            target = wide
+        else:
+            continue
+
+        key, sep, value = line.partition('=')
+        if sep:
+            target.setdefault(key.strip().lower(), value.strip())
+
+    for key, value in wide.items():
+        try:
+            values[key] = value.encode('ascii').decode('utf-7')
+        except UnicodeError:
+            pass
+
+    try:
+        icon_index = int(values.get('iconindex', 0))
+    except ValueError:
+        icon_index = 0
+
+    return ShortcutInfo(
+        target=values.get('url', ''),
+        working_dir=values.get('workingdirectory', ''),
+        icon_location=values.get('iconfile', ''),
+        icon_index=icon_index
+    )
+
+
+def parse_url(path: str) -> ShortcutInfo:
+    with open(path, 'rb') as f:
+        data = f.read(MAX_URL_SIZE + 1)
+
+    if len(data) > MAX_URL_SIZE:
+        raise LinkParseError(f'internet shortcut exceeds {MAX_URL_SIZE} bytes')
+
+    return parse_url_bytes(data)
+
+
+def parse_shortcut(path: str) -> ShortcutInfo:
+    """
+    Parse .lnk or .url shortcut by its extension.
+    """
+    if path[-4:].lower() == '.url':
+        return parse_url(path)
+
+    return parse_lnk(path)
@@ -52,7 +52,7 @@ class MainFormatter(logging.Formatter):
         super().__init__('[%(asctime)s] %(label)s%(message)s', '%H:%M:%S', *args, **kwargs)
 
     def format(self, record: logging.LogRecord) -> str:
-        folder, shortcut = (record.__dict__.pop(n, None) for n in ['folder_name', 'shortcut_name'])
+        folder, shortcut = (record.__dict__.get(n) for n in ['folder_name', 'shortcut_name'])
         record.label = f'{folder}:{shortcut} -> ' if folder and shortcut else f'{folder} -> ' if folder else ''
         return super().format(record)
 
@@ -124,3 +124,28 @@ class CleanLogger(logging.Logger):
             self.info(msg.format('Delete', 'reset'))
 
         self.file = None
+
+
+class FolderLogger(logging.LoggerAdapter):
+    """
+    Adds the folder name to records of a cleaned folder. Buffered logger keeps records until flush(),
+    so lines of folders which are cleaned in parallel aren't mixed.
+    """
+
+    def __init__(self, logger: logging.Logger, folder_name: str, *, buffered: bool = False):
+        super().__init__(logger, {'folder_name': folder_name})
+        self.records: Optional[list[tuple[int, str, tuple, dict]]] = [] if buffered else None
+
+    def log(self, level: int, msg, *args, **kwargs) -> None:
+        if self.records is None:
+            return super().log(level, msg, *args, **kwargs)
+
+        if self.isEnabledFor(level):
+            msg, kwargs = self.process(msg, kwargs)
+            self.records.append((level, msg, args, kwargs))
+
+    def flush(self) -> None:
+        records, self.records = self.records, []
+
+        for level, msg, args, kwargs in records or ():
+            self.logger.log(level, msg, *args, **kwargs)
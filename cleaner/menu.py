@@ -1,6 +1,14 @@
 import os
-import struct
-import locale
+import sys
+import time
+import ntpath
+import errno
+import shutil
+import functools
+import itertools
+import threading
+from typing import Iterator, Iterable, Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from collections import namedtuple
@@ -9,19 +17,37 @@ from send2trash import send2trash
 
 from . import log
 from . import utils
+from . import links
+from .cache import ScanCache, TargetCache
 
 
 class StartMenuDir(os.PathLike):
+    write_probe = False  # check access by creating and removing a temp file instead of the read-only check
+    access_ttl = 1.0  # seconds update_accessibility() reuses the last check for (0 - check every time)
+
     def __init__(self, path: str, type: str):
         self.path = path
+        self.prefix = os.path.join(path, '')  # with the trailing separator, paths inside it start with it
         self.type = type
-        self.is_accessible = self._check_on_accessible()
+        self._is_accessible: Optional[bool] = None  # checked on first access
+        self._checked_at = 0.0
+
+    @property
+    def is_accessible(self) -> bool:
+        if self._is_accessible is None:
+            self._is_accessible = self._check_on_accessible()
+
+        return self._is_accessible
 
     def _check_on_accessible(self) -> bool:
+        self._checked_at = time.monotonic()
+        return self._check_by_write() if self.write_probe else utils.can_write_dir(self.path)
+
+    def _check_by_write(self) -> bool:
         tmp_f = os.path.join(self.path, 'tmp.tmp')
 
         try:
-            open(tmp_f, mode='w')
+            open(tmp_f, mode='w').close()
             os.remove(tmp_f)
         except OSError:
             return False
@@ -35,10 +61,96 @@ class StartMenuDir(os.PathLike):
         return self.path
 
     def update_accessibility(self):
-        self.is_accessible = self._check_on_accessible()
+        if self._is_accessible is None or time.monotonic() - self._checked_at >= self.access_ttl:
+            self._is_accessible = self._check_on_accessible()
+
+
+class SMScanner:
+    """
+    Single-pass Start Menu walker: every directory is listed by one os.scandir call and
+    DirEntry cached type info is used instead of extra os.path.isdir / os.stat calls.
+    """
+    extensions = ('.lnk', '.url')
+
+    def list_dir(self, path: str) -> tuple[list[str], list[str]]:  # -> (subdirectories names, shortcuts names)
+        dirs, shortcuts = [], []
+
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(name)
+
+                elif name.endswith(self.extensions):  # ~2x cheaper than os.path.splitext per entry
+                    shortcuts.append(name)
+
+        return dirs, shortcuts
+
+    def walk(self, path: str) -> list[str]:
+        """
+        Get paths of all shortcuts inside path (including subdirectories), order is the same as os.walk gives.
+        """
+        shortcuts, stack = [], [path]
+
+        while stack:
+            current = stack.pop()
+            try:
+                dirs, names = self.list_dir(current)
+            except OSError:  # os.walk ignores errors too
+                continue
+
+            prefix = os.path.join(current, '')  # one join per directory, not per entry
+            shortcuts.extend(prefix + n for n in names)
+            stack.extend(prefix + d for d in reversed(dirs))
+
+        return shortcuts
+
+    def scan(self, root: str) -> Iterator[tuple[str, list[str]]]:
+        """
+        Walk root once and yield (top-level folder path, paths of its shortcuts) pairs.
+        """
+        try:
+            dirs, _ = self.list_dir(root)
+        except OSError:  # root is removed (or became inaccessible) after its accessibility check
+            return
+
+        for d in dirs:
+            path = os.path.join(root, d)
+            yield path, self.walk(path)
+
+    def commit(self, *, full: bool = True) -> None:  # called after a scan, full - all SM dirs were scanned
+        pass
+
+
+class CachedSMScanner(SMScanner):
+    """
+    SMScanner which lists only directories with changed mtime, the rest is taken from ScanCache.
+    """
+    RACY_NS = 2 * 10 ** 9  # listings of just modified directories aren't cached (mtime granularity)
+
+    def __init__(self, cache: ScanCache):
+        self.cache = cache
+
+    def list_dir(self, path: str) -> tuple[list[str], list[str]]:
+        mtime_ns = os.stat(path).st_mtime_ns
+
+        if (cached := self.cache.get(path, mtime_ns)) is not None:
+            return cached
+
+        dirs, shortcuts = super().list_dir(path)
+        if time.time_ns() - mtime_ns > self.RACY_NS:
+            self.cache.set(path, mtime_ns, dirs, shortcuts)
+
+        return dirs, shortcuts
+
+    def commit(self, *, full: bool = True) -> None:
+        self.cache.save(prune=full)
 
 
 class SMObject(ABC):
+    __slots__ = ()  # subclasses have no __dict__, a scan builds tens of thousands of them
+
     path: str
     name: str
 
@@ -52,18 +164,30 @@ class SMObject(ABC):
 
 
 class SMFolder(SMObject, ABC):
+    __slots__ = ()
+
     name: str
     shortcuts: list['StartMenuShortcut']
 
+    @property
+    def key(self) -> str:  # folders names are case-insensitive
+        return self.name.lower()
+
     def is_empty(self):
         return len(self.shortcuts) == 0
 
+    @abstractmethod
+    def get_paths(self) -> list[str]:
+        ...
+
 
 class StartMenuFolder(SMFolder):
+    __slots__ = ('path', 'name', 'shortcuts')
+
     def __init__(self, path: str, *, shortcuts: list['StartMenuShortcut'] = None):
         self.path: str = path
         self.name = os.path.basename(path)
-        self.shortcuts = self._get_shortcuts() if not shortcuts else shortcuts
+        self.shortcuts = self._get_shortcuts() if shortcuts is None else shortcuts
 
     def __repr__(self, indent: int = 4):
         indent_text = ' ' * indent
@@ -71,28 +195,48 @@ class StartMenuFolder(SMFolder):
         return f'\n{self.name}\n' + '\n'.join(indent_text + shortcut.name for shortcut in self.shortcuts)
 
     def _get_shortcuts(self) -> list['StartMenuShortcut']:
-        return [
-            StartMenuShortcut(os.path.join(dir_data[0], sc))
-            for dir_data in list(os.walk(self.path))
-            for sc in dir_data[2] if os.path.splitext(sc)[-1] in ('.lnk', '.url')
-        ]
+        return [StartMenuShortcut(p) for p in StartMenu.scanner.walk(self.path)]
 
     def update_shortcuts(self):
         self.shortcuts = self._get_shortcuts()
 
+    def get_paths(self) -> list[str]:
+        return [self.path]
+
     def copy(self):
         return type(self)(self.path, shortcuts=self.shortcuts)
 
+    def can_move_by_rename(self, new_p: str) -> bool:
+        """
+        Whole folder can be moved by one rename if there is no folder to merge with at the destination.
+        """
+        return not os.path.isdir(new_p)
+
     def move(self, path_to_directory: str) -> None:
         new_p = os.path.join(path_to_directory, self.name)
 
-        if os.path.exists(new_p):
+        if not self.can_move_by_rename(new_p):  # merge file by file, existing files aren't replaced
+            report = utils.rmove_dir(self.path, new_p, replace=False)
+            if not report.ok:
+                raise report.failed[0][1]
+
+            self.path = new_p
+            return
+
+        if os.path.lexists(new_p):
             try:
                 os.remove(new_p)
             except OSError:
                 return send2trash(self.path)
 
-        utils.rmove_dir(self.path, path_to_directory, replace=False)
+        try:
+            os.replace(self.path, new_p)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+            shutil.move(self.path, new_p)  # other volume, rename is impossible
+
         self.path = new_p
 
     def remove(self) -> None:
@@ -100,13 +244,15 @@ class StartMenuFolder(SMFolder):
 
 
 class StartMenuExtendedFolder(SMFolder):  # folder which exists in few start menu dirs
+    __slots__ = ('folders', 'name', 'shortcuts')
+
     def __init__(self, folders: list[SMFolder]):
         self.folders = []
         self.name = folders[0].name
         self.shortcuts = []
 
         for index, folder in enumerate(folders):
-            if self.name != folder.name:
+            if self.key != folder.key:
                 raise ValueError('folders names must be same')
 
             self.shortcuts.extend(folder.shortcuts)
@@ -116,6 +262,9 @@ class StartMenuExtendedFolder(SMFolder):  # folder which exists in few start men
             else:
                 self.folders.append(folder)
 
+    def get_paths(self) -> list[str]:
+        return [f.path for f in self.folders]
+
     def move(self, path_to_directory: str) -> None:
         for f in self.folders:
             f.move(path_to_directory)
@@ -126,32 +275,49 @@ class StartMenuExtendedFolder(SMFolder):  # folder which exists in few start men
 
 
 class StartMenuShortcut(SMObject):
-    def __init__(self, ph: str):
-        self.path: str = ph
-        self.name, self.ext = os.path.splitext(os.path.basename(ph))
+    """
+    The full path is stored, not joined from parts on each read: it is read in every hot loop (target resolving,
+    duplicates, icon keys). The extension is interned, there is no __dict__.
+    SM dir of the shortcut is recorded by the scan (or found on first need), so the clean loop doesn't look it up.
+    """
+    __slots__ = ('path', 'name', 'ext', '_root')
+
+    def __init__(self, ph: str, root: StartMenuDir = None):
+        self._root = root
+        self._set_path(ph)
+
+    def _set_path(self, ph: str):
+        name, ext = os.path.splitext(os.path.basename(ph))
+        self.path = ph
+        self.name = name
+        self.ext = sys.intern(ext)
+
+        if self._root is not None and not ph.startswith(self._root.prefix):  # moved out of its SM dir
+            self._root = None
 
     def __repr__(self):
         return self.path
 
     def rename(self, new_name: str):
-        self.move(os.path.split(self.path)[0], new_name)
+        self.move(os.path.dirname(self.path), new_name)
 
     def get_rpath(self):  # get relative path
-        fpath = self.get_fpath()
-        return self.path[len(fpath) + 1:]
+        return self.path[len(self.get_dir().prefix):]
 
     def get_fpath(self):  # get SM folder path
-        for d in StartMenu.default_dirs:
-            if os.path.commonpath([d.path, self.path]) == d.path:
-                return d.path
+        return self.get_dir().path
+
+    def get_dir(self) -> StartMenuDir:
+        if self._root is None:
+            self._root = StartMenu.find_dir(self.path)
 
-        raise ValueError('StartMenuShortcut.path does not belong to any dir from DEFAULT_START_MENU_SHORTCUTS_DIRS')
+        return self._root
 
     def move(self, path_to_directory: str, name: str = None):
         n = name if name else self.name
         new_p = os.path.join(path_to_directory, n + self.ext)
         os.replace(self.path, new_p)
-        self.__init__(new_p)
+        self._set_path(new_p)
 
     def relative_move(self, path_to_directory: str):
         new_path_to_dir = os.path.join(path_to_directory, os.path.split(self.get_rpath())[0])
@@ -163,30 +329,244 @@ class StartMenuShortcut(SMObject):
     def remove(self):
         send2trash(self.path)
 
+    def get_info(self) -> links.ShortcutInfo:
+        return links.parse_shortcut(self.path)
+
     def get_link_target(self) -> str:
-        with open(self.path, 'rb') as stream:
-            content = stream.read()
-            # skip first 20 bytes (HeaderSize and LinkCLSID)
-            # read the LinkFlags structure (4 bytes)
-            lflags = struct.unpack('I', content[0x14:0x18])[0]
-            position = 0x18
-            # if the HasLinkTargetIDList bit is set then skip the stored IDList
-            # structure and header
-            if (lflags & 0x01) == 1:
-                position = struct.unpack('H', content[0x4C:0x4E])[0] + 0x4E
-            last_pos = position
-            position += 0x04
-            # get how long the file information is (LinkInfoSize)
-            length = struct.unpack('I', content[last_pos:position])[0]
-            # skip 12 bytes (LinkInfoHeaderSize, LinkInfoFlags and VolumeIDOffset)
-            position += 0x0C
-            # go to the LocalBasePath position
-            lbpos = struct.unpack('I', content[position:position + 0x04])[0]
-            position = last_pos + lbpos
-            # read the string at the given position of the determined length
-            size = (length + last_pos) - position - 0x02
-            content = content[position:position + size].split(b'\x00', 1)
-            return content[-1].decode('utf-16' if len(content) > 1 else locale.getdefaultlocale()[1])
+        return self.get_info().target
+
+
+@dataclass
+class _ResolvedTarget:
+    shortcut: StartMenuShortcut
+    info: Optional[links.ShortcutInfo] = None
+    error: Optional[Exception] = None
+
+    @property
+    def target(self) -> Optional[str]:
+        return self.info.target if self.info else None
+
+
+def _parse_shortcuts(paths: list[str]) -> list[tuple[Optional[links.ShortcutInfo], Optional[Exception]]]:
+    results = []
+
+    for p in paths:
+        try:
+            results.append((links.parse_shortcut(p), None))
+        except Exception as e:
+            results.append((None, e))
+
+    return results
+
+
+def resolve_targets(shortcuts: Iterable[StartMenuShortcut],
+                    *,
+                    mode: str = 'thread',
+                    workers: int = None,
+                    chunksize: int = 256,
+                    cache: TargetCache = None) -> list[_ResolvedTarget]:
+    """
+    Parse shortcuts by chunks in "serial", "thread" or "process" mode. Results are in the input order, parse errors
+    are not raised but kept in _ResolvedTarget.error.
+
+    :param cache: shortcuts unchanged since they were cached (same size and mtime) aren't opened, new entries
+                  are saved by the caller (once per scan / search, not per call)
+    """
+    if mode not in ('serial', 'thread', 'process'):
+        raise ValueError(f'unknown resolve mode "{mode}"')
+
+    results = [_ResolvedTarget(s) for s in shortcuts]
+    to_parse = []
+    stats = []
+
+    for res in results:
+        if cache is not None:
+            try:
+                st = os.stat(res.shortcut.path)
+            except OSError as e:
+                res.error = e
+                cache.evict(res.shortcut.path)
+                continue
+
+            if (info := cache.get(res.shortcut.path, st.st_size, st.st_mtime_ns)) is not None:
+                res.info = info
+                continue
+
+            stats.append(st)
+
+        to_parse.append(res)
+
+    paths = [res.shortcut.path for res in to_parse]
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+
+    if mode == 'serial' or len(chunks) < 2:
+        parsed = map(_parse_shortcuts, chunks)
+
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # imports multiprocessing, so only when it's used
+
+        executor_class = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            parsed = list(executor.map(_parse_shortcuts, chunks))
+
+    for res, (info, e) in zip(to_parse, itertools.chain.from_iterable(parsed)):
+        res.info, res.error = info, e
+
+    if cache is not None:
+        for res, st in zip(to_parse, stats):
+            if res.info is not None:
+                cache.set(res.shortcut.path, st.st_size, st.st_mtime_ns, res.info)
+
+    return results
+
+
+def _exists(path: str) -> bool:
+    try:
+        os.stat(path)
+    except FileNotFoundError:  # NotADirectoryError / PermissionError and others don't prove absence
+        return False
+    except (OSError, ValueError):
+        return True
+
+    return True
+
+
+def _find_missing(groups: list[tuple[str, list[str]]]) -> list[str]:
+    """
+    Get missing targets of (directory, targets) groups, targets of a missing directory aren't stat'ed.
+    """
+    missing = []
+
+    for directory, targets in groups:
+        if directory and not _exists(directory):
+            missing.extend(targets)
+            continue
+
+        for t in targets:
+            try:
+                os.stat(t)
+            except FileNotFoundError:  # as _exists, inlined: it's called for most of targets
+                missing.append(t)
+            except (OSError, ValueError):
+                pass
+
+    return missing
+
+
+PARALLEL_STATS_MIN = 256  # directories, a stat pool for fewer ones costs more than it saves
+
+
+def find_broken_shortcuts(shortcuts: Iterable[StartMenuShortcut],
+                          *,
+                          mode: str = 'serial',
+                          parallel: bool = None,
+                          workers: int = 8,
+                          chunksize: int = 64,
+                          cache: TargetCache = None) -> list[_ResolvedTarget]:
+    """
+    Find .lnk shortcuts whose local target doesn't exist. Targets are resolved by resolve_targets and grouped
+    by directory, then checked in one pass: each directory is stat'ed once and its files only if it exists.
+    Unparsed shortcuts, network targets and targets on missing drives (e.g. unplugged removable drive)
+    aren't reported.
+
+    :param mode: resolve_targets mode, parsing of local shortcuts doesn't gain from threads
+    :param parallel: stat directories by chunks in `workers` threads, None - only when there are many of them
+                     on a network drive (a local stat is too fast to gain from threads)
+    """
+    lnk_shortcuts = (s for s in shortcuts if s.ext.lower() == '.lnk')
+    resolved: list[tuple[_ResolvedTarget, str]] = []
+    groups: dict[str, list[str]] = {}  # directory: its targets
+
+    for r in resolve_targets(lnk_shortcuts, mode=mode, cache=cache):
+        if (target := r.target) and not target.startswith(('\\\\', '//')):
+            resolved.append((r, target))
+            groups.setdefault(target.rpartition(os.sep)[0], []).append(target)
+
+    drives = {d: os.path.splitdrive(d)[0] + os.sep for d in groups}
+    live_drives = {drive for drive in set(drives.values()) if _exists(drive)}
+    checked = [(d, targets) for d, targets in groups.items() if drives[d] in live_drives]
+
+    if parallel is None:
+        parallel = len(checked) >= PARALLEL_STATS_MIN and any(map(utils.is_remote_drive, live_drives))
+
+    if parallel and len(checked) > chunksize:
+        chunks = [checked[i:i + chunksize] for i in range(0, len(checked), chunksize)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            broken = set(itertools.chain.from_iterable(executor.map(_find_missing, chunks)))
+    else:
+        broken = set(_find_missing(checked))
+
+    if cache is not None:
+        cache.save()
+
+    return [r for r, target in resolved if target in broken]
+
+
+@dataclass
+class _DuplicateGroup:
+    key: tuple[str, str]  # (normalized target, arguments)
+    keep: StartMenuShortcut  # suggested one to keep
+    duplicates: list[StartMenuShortcut]
+
+    @property
+    def shortcuts(self) -> list[StartMenuShortcut]:
+        return [self.keep, *self.duplicates]
+
+
+def _duplicate_key(resolved: _ResolvedTarget) -> Optional[tuple[str, str]]:
+    target = resolved.target.strip() if resolved.target else ''
+    if not target:
+        return None
+
+    if resolved.shortcut.ext.lower() == '.url':
+        target = target.rstrip('/')
+    else:
+        target = ntpath.normcase(ntpath.normpath(target))  # .lnk targets are Windows paths on any platform
+
+    return target, ' '.join(resolved.info.arguments.split())
+
+
+def _keep_priority(shortcut: StartMenuShortcut) -> tuple:
+    """
+    Shortcut of the system (all users) dir, then the least nested one, then the shortest name is suggested
+    to keep.
+    """
+    try:
+        fpath = shortcut.get_fpath()
+    except ValueError:
+        fpath, rpath = None, shortcut.path
+    else:
+        rpath = shortcut.get_rpath()
+
+    return fpath != StartMenu.default_dirs.system.path, rpath.count(os.sep), len(shortcut.name), shortcut.path
+
+
+def find_duplicate_shortcuts(shortcuts: Iterable[StartMenuShortcut],
+                             *,
+                             mode: str = 'thread',
+                             cache: TargetCache = None) -> list[_DuplicateGroup]:
+    """
+    Group shortcuts by normalized target and arguments (one pass with a dict index), groups of more than one
+    shortcut are returned in order of their first shortcut. Shortcuts without a resolved target are skipped.
+
+    :param mode: resolve_targets mode
+    """
+    index: dict[tuple[str, str], list[StartMenuShortcut]] = {}
+
+    for resolved in resolve_targets(shortcuts, mode=mode, cache=cache):
+        if (key := _duplicate_key(resolved)) is not None:
+            index.setdefault(key, []).append(resolved.shortcut)
+
+    if cache is not None:
+        cache.save()
+
+    groups = []
+    for key, group in index.items():
+        if len(group) > 1:
+            keep = min(group, key=_keep_priority)
+            groups.append(_DuplicateGroup(key, keep, [s for s in group if s is not keep]))
+
+    return groups
 
 
 class CleanError(Exception):
@@ -263,6 +643,29 @@ class _CleanResult:
     applied_shortcuts: int = 0
     errors: list[CleanError] = field(default_factory=lambda: [])
     log_fp: str = ''
+    cancelled: bool = False
+
+    def merge(self, other: '_CleanResult') -> None:
+        self.cleaned_folders += other.cleaned_folders
+        self.applied_shortcuts += other.applied_shortcuts
+        self.errors.extend(other.errors)
+
+    def as_dict(self) -> dict:  # JSON-serializable
+        return {
+            'cleaned_folders': self.cleaned_folders,
+            'applied_shortcuts': self.applied_shortcuts,
+            'errors': [e.represent() for e in self.errors],
+            'log_fp': self.log_fp,
+            'cancelled': self.cancelled
+        }
+
+
+@dataclass
+class _FolderRun:  # state of one folder cleaning
+    clean_f: _FolderToClean
+    log: log.FolderLogger
+    result: _CleanResult
+    trash: utils.TrashBatch
 
 
 class SMCleaner:
@@ -279,99 +682,252 @@ class SMCleaner:
     L_SHORTCUT_MOVED_OUT = 'Shortcut "{}" was moved out'
     L_FOLDER_HANDLED = 'Folder was {}'
     L_FOLDER_END = '-- Folder end --'
+    L_CLEAN_CANCELLED = 'Clean was cancelled ({} of {} folders were handled)'
     L_CLEAN_HANDLED = '{} folders were cleaned, {} shortcuts were {}'
     L_END_CLEAN = '=== END CLEAN ==='
 
-    def __init__(self, action: _CleanAction, folders_to_clean: list[_FolderToClean]):
+    TRASH_BATCH_SIZE = 256
+    CHUNKS_PER_WORKER = 4  # parallel clean submits folders by chunks, a task per folder costs more than a small one
+
+    def __init__(self,
+                 action: _CleanAction,
+                 folders_to_clean: list[_FolderToClean],
+                 *,
+                 progress: Callable[[int, int, _FolderToClean], None] = None,
+                 workers: int = 1):
+        """
+        :param progress: called after each handled folder with (handled count, total count, handled folder)
+        :param workers: count of threads which clean folders in parallel (1 - clean sequentially)
+        """
         if action not in self.actions.get_ints():
             raise ValueError('action should be equal _CleanAction actions')
 
         self.action = action
         self.folders2clean = folders_to_clean
+        self.progress = progress
+        self.workers = workers
         self.result: _CleanResult = _CleanResult(0, 0, [])
+        self.trash = utils.TrashBatch(self.TRASH_BATCH_SIZE)  # REMOVE action sends paths to recycle bin by batches
+        self._cancel_event = threading.Event()
 
-    def handle_e(self, e: CleanError, *, msg: str = None, extra: dict = None):
-        self.result.errors.append(e)
-        self.LOG.error('Have an error:' if msg is None else msg, exc_info=e, extra=extra)
+    def cancel(self) -> None:
+        """
+        Stop clean before the next folder (can be called from any thread), result will contain a partial run.
+        """
+        self._cancel_event.set()
 
-    def clean(self):
-        self.LOG.init_file()
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def handle_e(self, run: _FolderRun, e: CleanError, *, msg: str = None):
+        run.result.errors.append(e)
+        run.log.error('Have an error:' if msg is None else msg, exc_info=e)
 
-        is_move = self.action == self.actions.MOVE
+    def clean_folder(self, run: _FolderRun) -> None:
+        clean_f = run.clean_f
         is_remove = self.action == self.actions.REMOVE
         action_ps = self.action.data['ps']
 
-        self.LOG.info(self.L_START_CLEAN)
-        self.LOG.info(self.L_ACTION.format(self.action.name.upper()))
+        run.log.info(self.L_START_FOLDER)
 
-        for clean_f in self.folders2clean:  # todo: change extra to LoggerAdapter
-            extra = {'folder_name': clean_f.folder.name}
-            self.LOG.info(self.L_START_FOLDER)
-
-            # handle selected shortcuts
-            for clean_s in clean_f.shortcuts_to_apply:
-                try:
-                    if is_move:
-                        clean_s.relative_move(self.action.data['path'])
-
-                    elif is_remove:
-                        clean_s.remove()
-
-                except Exception as e:
-                    self.handle_e(
-                        ShortcutToApplyHandleError(e),
-                        msg=self.L_HAVE_ERROR_WITH_SHORTCUT.format(clean_s.name),
-                        extra=extra
-                    )
-                    continue
-
-                self.result.applied_shortcuts += 1
-                self.LOG.info(self.L_SHORTCUT_HANDLED.format(clean_s.name, action_ps), extra=extra)
-
-            # skip folder if it's kept
-            if clean_f.is_kept:
-                self.LOG.info(self.L_KEEP_FOLDER, extra=extra)
+        # handle selected shortcuts
+        for clean_s in clean_f.shortcuts_to_apply:
+            if is_remove:
+                run.trash.add(clean_s.path, functools.partial(self._shortcut_trashed, run, clean_s))
                 continue
 
-            # move out saved shortcuts
-            skip_folder = False
-            for saved_s in clean_f.shortcuts_to_save:
-                try:
-                    saved_s.move(saved_s.get_fpath())
-                    self.LOG.info(self.L_SHORTCUT_MOVED_OUT.format(saved_s.name), extra=extra)
-                    self.result.applied_shortcuts += 1
-
-                except OSError as e:
-                    self.handle_e(
-                        ShortcutToSaveHandleError(e),
-                        msg=self.L_HAVE_ERROR_WITH_SHORTCUT.format(saved_s.name),
-                        extra=extra
-                    )
-                    skip_folder = True
-                    break
-
-            if skip_folder:
+            try:
+                clean_s.relative_move(self.action.data['path'])
+
+            except Exception as e:
+                self.handle_e(
+                    run,
+                    ShortcutToApplyHandleError(e),
+                    msg=self.L_HAVE_ERROR_WITH_SHORTCUT.format(clean_s.name)
+                )
                 continue
 
-            # handle folder after saving remaining shortcuts (by moving out to common folder)
-            try:
-                if is_move:
-                    clean_f.folder.move(self.action.data['path'])
+            run.result.applied_shortcuts += 1
+            run.log.info(self.L_SHORTCUT_HANDLED.format(clean_s.name, action_ps))
 
-                elif is_remove:
-                    clean_f.folder.remove()
+        # skip folder if it's kept
+        if clean_f.is_kept:
+            return run.log.info(self.L_KEEP_FOLDER)
 
-                self.result.cleaned_folders += 1
-                self.LOG.info(self.L_FOLDER_HANDLED.format(action_ps), extra=extra)
-                self.LOG.info(self.L_FOLDER_END)
+        # move out saved shortcuts
+        for saved_s in clean_f.shortcuts_to_save:
+            try:
+                saved_s.move(saved_s.get_fpath())
+                run.log.info(self.L_SHORTCUT_MOVED_OUT.format(saved_s.name))
+                run.result.applied_shortcuts += 1
 
             except OSError as e:
-                self.handle_e(FolderHandleError(e), extra=extra)
+                return self.handle_e(
+                    run,
+                    ShortcutToSaveHandleError(e),
+                    msg=self.L_HAVE_ERROR_WITH_SHORTCUT.format(saved_s.name)
+                )
+
+        # handle folder after saving remaining shortcuts (by moving out to common folder)
+        if is_remove:
+            return self._trash_folder(run)
+
+        try:
+            clean_f.folder.move(self.action.data['path'])
+
+            run.result.cleaned_folders += 1
+            run.log.info(self.L_FOLDER_HANDLED.format(action_ps))
+            run.log.info(self.L_FOLDER_END)
+
+        except OSError as e:
+            self.handle_e(run, FolderHandleError(e))
+
+    def _shortcut_trashed(self, run: _FolderRun, clean_s: StartMenuShortcut, e: Optional[Exception]):
+        if e is not None:
+            return self.handle_e(
+                run,
+                ShortcutToApplyHandleError(e),
+                msg=self.L_HAVE_ERROR_WITH_SHORTCUT.format(clean_s.name)
+            )
+
+        run.result.applied_shortcuts += 1
+        run.log.info(self.L_SHORTCUT_HANDLED.format(clean_s.name, self.action.data['ps']))
+
+    def _trash_folder(self, run: _FolderRun):
+        paths = run.clean_f.folder.get_paths()
+        left, failed = len(paths), False
+
+        def trashed(e: Optional[Exception]):
+            nonlocal left, failed
+            left -= 1
+
+            if e is not None:
+                failed = True
+                self.handle_e(run, FolderHandleError(e))
+
+            if not left and not failed:  # all paths of (extended) folder were trashed
+                run.result.cleaned_folders += 1
+                run.log.info(self.L_FOLDER_HANDLED.format(self.action.data['ps']))
+                run.log.info(self.L_FOLDER_END)
+
+        for p in paths:
+            run.trash.add(p, trashed)
+
+    def _clean_sequentially(self):
+        """
+        Folders share one trash batch, so a folder is done only when the batch with its paths is sent: its log
+        is buffered and its progress is reported then, in folders order.
+        """
+        total, handled = len(self.folders2clean), 0
+        pending: list[_FolderRun] = []  # handled folders, some of their paths can wait in the trash batch
+
+        def finish_pending():
+            nonlocal handled
+            for run in pending:
+                run.log.flush()
+                handled += 1
+
+                if self.progress:
+                    self.progress(handled, total, run.clean_f)
+
+            pending.clear()
+
+        for index, clean_f in enumerate(self.folders2clean):
+            if self.is_cancelled():
+                self.trash.flush()
+                finish_pending()
+                self.result.cancelled = True
+                self.LOG.info(self.L_CLEAN_CANCELLED.format(index, total))
+                break
+
+            run = _FolderRun(
+                clean_f,
+                log.FolderLogger(self.LOG, clean_f.folder.name, buffered=True),
+                self.result,
+                self.trash
+            )
+            self.clean_folder(run)
+            pending.append(run)
+
+            if not len(self.trash):  # nothing waits to be trashed (batch is sent or nothing was added)
+                finish_pending()
+
+        self.trash.flush()
+        finish_pending()
+
+    def _clean_in_parallel(self):
+        """
+        Folders are independent, so each one is cleaned by a pool thread with its own result and buffered log.
+        The thread only collects paths to trash: they are sent by this thread in the common batches, as in the
+        sequential clean, and a folder is merged into the common result and log when its paths are sent.
+        """
+        total, handled = len(self.folders2clean), 0
+        pending: list[_FolderRun] = []
+
+        def clean(chunk: list[_FolderToClean]) -> list[_FolderRun]:
+            runs = []
+
+            for clean_f in chunk:
+                if self.is_cancelled():
+                    break
+
+                run = _FolderRun(
+                    clean_f,
+                    log.FolderLogger(self.LOG, clean_f.folder.name, buffered=True),
+                    _CleanResult(),
+                    utils.TrashBatch(None)
+                )
+                self.clean_folder(run)
+                runs.append(run)
+
+            return runs
+
+        def finish_pending():
+            nonlocal handled
+            for run in pending:
+                run.log.flush()
+                self.result.merge(run.result)
+                handled += 1
+
+                if self.progress:
+                    self.progress(handled, total, run.clean_f)
+
+            pending.clear()
+
+        size = max(1, total // (self.workers * self.CHUNKS_PER_WORKER))
+        chunks = [self.folders2clean[i:i + size] for i in range(0, total, size)]
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='SMCleaner-folder') as executor:
+            for future in as_completed([executor.submit(clean, chunk) for chunk in chunks]):
+                for run in future.result():
+                    self.trash.merge(run.trash)  # callbacks of its paths are called here, after the folder thread
+                    pending.append(run)
+
+                    if not len(self.trash):
+                        finish_pending()
+
+        self.trash.flush()
+        finish_pending()
+
+        if handled != total:
+            self.result.cancelled = True
+            self.LOG.info(self.L_CLEAN_CANCELLED.format(handled, total))
+
+    def clean(self):
+        self.LOG.init_file()
+
+        self.LOG.info(self.L_START_CLEAN)
+        self.LOG.info(self.L_ACTION.format(self.action.name.upper()))
+
+        if self.workers > 1:
+            self._clean_in_parallel()
+        else:
+            self._clean_sequentially()
 
         self.LOG.info(self.L_CLEAN_HANDLED.format(
             self.result.cleaned_folders,
             self.result.applied_shortcuts,
-            action_ps
+            self.action.data['ps']
         ))
         self.LOG.info(self.L_END_CLEAN)
         if self.LOG.file:
@@ -380,54 +936,199 @@ class SMCleaner:
         self.LOG.reset_file(keep_file=bool(self.result.errors), keep_reason='errors')
         return self.result
 
+    def clean_async(self) -> Future:
+        """
+        Run clean in a separate thread, future result is _CleanResult. Use progress callback to track it
+        and cancel() to stop it.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='SMCleaner')
+        future = executor.submit(self.clean)
+        executor.shutdown(wait=False)
+        return future
+
+
+@dataclass
+class _FolderDiff:
+    folder: SMFolder  # new folder
+    added: list[StartMenuShortcut]
+    removed: list[StartMenuShortcut]  # shortcuts of the old folder
+
+
+@dataclass
+class _MenuDiff:
+    added: list[SMFolder] = field(default_factory=lambda: [])
+    removed: list[SMFolder] = field(default_factory=lambda: [])  # old folders
+    changed: list[_FolderDiff] = field(default_factory=lambda: [])
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class _lazy_class_attribute:
+    """
+    Class attribute computed by the decorated function on first access, the value then replaces the descriptor.
+    """
+    def __init__(self, fn: Callable):
+        self.fn = fn
+        self.name = fn.__name__
+
+    def __get__(self, instance, owner):
+        value = self.fn(owner)
+        setattr(owner, self.name, value)
+        return value
+
 
 class StartMenu:
     clean_action = _CleanAction
     folder_to_clean = _FolderToClean
     clean_result = _CleanResult
-
-    default_dirs = namedtuple('_SMDirs', 'system user')(
-        StartMenuDir(
-            os.path.join(os.getenv('SystemDrive'), r'\ProgramData\Microsoft\Windows\Start Menu\Programs'),
-            'system'
-        ),
-        StartMenuDir(
-            os.path.join(os.getenv('AppData'), r'Microsoft\Windows\Start Menu\Programs'),
-            'user'
+    cleaner = SMCleaner
+    folder_diff = _FolderDiff
+    menu_diff = _MenuDiff
+    resolved_target = _ResolvedTarget
+    duplicate_group = _DuplicateGroup
+    scanner = SMScanner()
+    target_cache: Optional[TargetCache] = None
+
+    @_lazy_class_attribute
+    def default_dirs(cls):  # Windows environment is read on first access, not on import
+        return namedtuple('_SMDirs', 'system user')(
+            StartMenuDir(
+                os.path.join(os.getenv('SystemDrive'), r'\ProgramData\Microsoft\Windows\Start Menu\Programs'),
+                'system'
+            ),
+            StartMenuDir(
+                os.path.join(os.getenv('AppData'), r'Microsoft\Windows\Start Menu\Programs'),
+                'user'
+            )
         )
-    )
 
     @classmethod
     def update(cls) -> None:
         for d in cls.default_dirs:
             d.update_accessibility()
 
+    @classmethod
+    def find_dir(cls, path: str) -> StartMenuDir:
+        """
+        SM dir the path is inside. Paths built from the dir path (as scanned ones) are matched by its prefix,
+        other spellings of it (e.g. other separators or case on Windows) by os.path.commonpath.
+        """
+        for d in cls.default_dirs:
+            if path.startswith(d.prefix):
+                return d
+
+        for d in cls.default_dirs:
+            if os.path.commonpath([d.path, path]) == d.path:
+                return d
+
+        raise ValueError(f'"{path}" does not belong to any dir from StartMenu.default_dirs')
+
+    @classmethod
+    def merge_folders(cls, folders: Iterable[SMFolder]) -> list[SMFolder]:
+        """
+        Merge same-named folders (from different SM dirs) into StartMenuExtendedFolder, sorted by name.
+        """
+        index: dict[str, SMFolder] = {}
+
+        for new_folder in folders:
+            folder = index.get(new_folder.key)
+            index[new_folder.key] = new_folder if folder is None else StartMenuExtendedFolder([folder, new_folder])
+
+        return sorted(index.values(), key=lambda x: x.key)
+
+    @classmethod
+    def iter_folders(cls, dirs: Iterable[StartMenuDir] = None, *, batch_size: int = 32) -> Iterator[list[SMFolder]]:
+        """
+        Scan SM dirs and yield found folders by batches as soon as they are found.
+        Folders aren't merged (same-named folder can be yielded from each SM dir), see merge_folders.
+        """
+        batch = []
+        scanned = []  # shortcuts paths
+
+        for sm_dir in cls.default_dirs if dirs is None else dirs:
+            if not sm_dir.is_accessible:
+                continue
+
+            for full_path, shortcuts in cls.scanner.scan(sm_dir.path):
+                batch.append(StartMenuFolder(full_path, shortcuts=[StartMenuShortcut(p, sm_dir) for p in shortcuts]))
+                scanned.extend(shortcuts)
+
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+        cls.scanner.commit(full=dirs is None)
+
+        if dirs is None and cls.target_cache is not None:  # full scan, drop targets of disappeared shortcuts
+            cls.target_cache.retain(scanned)
+            cls.target_cache.save()
+
     @classmethod
     def get_folders(cls) -> list[SMFolder]:
+        return cls.merge_folders(folder for batch in cls.iter_folders() for folder in batch)
+
+    @classmethod
+    def scan_folders(cls, keys: Iterable[str]) -> list[SMFolder]:
+        """
+        Scan only top-level folders with the given keys (in all SM dirs), e.g. changed ones reported by watch.
+        Result is merged as get_folders one, not found (removed) folders are absent.
+        """
+        keys = set(keys)
         folders = []
 
         for sm_dir in cls.default_dirs:
             if not sm_dir.is_accessible:
                 continue
 
-            for item in os.listdir(sm_dir.path):
-                full_path = os.path.join(sm_dir.path, item)
+            try:
+                dirs, _ = cls.scanner.list_dir(sm_dir.path)
+            except OSError:
+                continue
+
+            for d in dirs:
+                if d.lower() in keys:
+                    path = os.path.join(sm_dir.path, d)
+                    shortcuts = [StartMenuShortcut(p, sm_dir) for p in cls.scanner.walk(path)]
+                    folders.append(StartMenuFolder(path, shortcuts=shortcuts))
+
+        return cls.merge_folders(folders)
 
-                if not os.path.isdir(full_path):
-                    continue
+    @classmethod
+    def diff(cls, old: list[SMFolder], new: list[SMFolder]) -> _MenuDiff:
+        """
+        Compare two get_folders results: folders are matched by SMFolder.key, shortcuts by path.
+        Folder is changed if its shortcuts or its paths (e.g. it appeared in one more SM dir) are changed.
+        """
+        diff = _MenuDiff()
+        old_index = {f.key: f for f in old}
+
+        for folder in new:
+            old_folder = old_index.pop(folder.key, None)
+
+            if old_folder is None:
+                diff.added.append(folder)
+                continue
 
-                new_folder = StartMenuFolder(path=full_path)
-                for index, folder in enumerate(folders):
-                    if folder.name == new_folder.name:
-                        folders[index] = StartMenuExtendedFolder([folder, new_folder])
-                        break
+            old_paths = {s.path: s for s in old_folder.shortcuts}
+            new_paths = {s.path for s in folder.shortcuts}
+            added = [s for s in folder.shortcuts if s.path not in old_paths]
+            removed = [s for p, s in old_paths.items() if p not in new_paths]
 
-                else:
-                    folders.append(new_folder)
+            if added or removed or old_folder.get_paths() != folder.get_paths():
+                diff.changed.append(_FolderDiff(folder, added, removed))
 
-        folders.sort(key=lambda x: x.name.lower())
-        return folders
+        diff.removed.extend(old_index.values())
+        return diff
 
     @classmethod
-    def clean(cls, action: _CleanAction, folders_to_clean: list[_FolderToClean]) -> _CleanResult:
-        return SMCleaner(action, folders_to_clean).clean()
+    def clean(cls,
+              action: _CleanAction,
+              folders_to_clean: list[_FolderToClean],
+              *,
+              progress: Callable[[int, int, _FolderToClean], None] = None,
+              workers: int = 1) -> _CleanResult:
+        return SMCleaner(action, folders_to_clean, progress=progress, workers=workers).clean()
@@ -1,5 +1,9 @@
 import os
 import sys
+import functools
+from typing import Callable, Optional
+from dataclasses import dataclass, field
+
 from send2trash import send2trash
 
 
@@ -65,45 +69,232 @@ def safe_mkdirs(p: str):
         return 1
 
 
-def rmove_dir(current_path: str, new_path: str, *, replace: bool = True):  # recursion move
+@dataclass
+class DirReport:  # result of a directory tree operation
+    done: list[str] = field(default_factory=lambda: [])  # moved / removed source paths
+    skipped: list[str] = field(default_factory=lambda: [])  # files which exist at the destination (replace=False)
+    failed: list[tuple[str, OSError]] = field(default_factory=lambda: [])
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _walk_tree(path: str) -> tuple[list[str], list[str]]:
     """
-    Move the shortcuts separately, not the entire folder as a whole.
+    Iterative (no recursion limit) walk, returns relative paths of (directories in pre-order, files).
     """
-    for entry in os.scandir(current_path):
-        entry: os.DirEntry
+    dirs, files, stack = [], [], ['']
 
-        if entry.is_dir():
-            subfolder_new_p = os.path.join(new_path, entry.name)
-            if not os.path.exists(subfolder_new_p):
-                safe_mkdir(subfolder_new_p)
-            rmove_dir(entry.path, subfolder_new_p)
+    while stack:
+        rel = stack.pop()
+        with os.scandir(os.path.join(path, rel)) as it:
+            for entry in it:
+                entry_rel = os.path.join(rel, entry.name)
 
-        else:
-            file_new_p = os.path.join(new_path, os.path.basename(entry.path))
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry_rel)
+                    stack.append(entry_rel)
+                else:
+                    files.append(entry_rel)
 
-            if replace:
-                os.replace(entry.path, file_new_p)
+    return dirs, files
 
-            elif not os.path.exists(file_new_p):
-                os.rename(entry.path, file_new_p)
 
-            else:  # if file exists and os.replace forbidden
-                pass  # todo: maybe send2trash(entry.path)
+def _rename_no_replace(src: str, dst: str):
+    if os.name != 'nt' and os.path.lexists(dst):  # os.rename replaces files on POSIX
+        raise FileExistsError(17, 'File exists', dst)
 
-    send2trash(current_path)
+    os.rename(src, dst)
 
 
-def recursion_rmdir(path: str):
-    for entry in os.scandir(path):
-        entry: os.DirEntry
+def rmove_dir(current_path: str, new_path: str, *, replace: bool = True) -> DirReport:
+    """
+    Move the shortcuts separately, not the entire folder as a whole: destination directories are created
+    ahead of files moving, then files are moved one by one, then emptied source is sent to recycle bin
+    (with skipped files, if there are no failed ones).
+    """
+    report = DirReport()
+    dirs, files = _walk_tree(current_path)
+    failed_dirs = set()
+
+    os.makedirs(new_path, exist_ok=True)
+    for d in dirs:  # pre-order, parents are created before children
+        try:
+            os.mkdir(os.path.join(new_path, d))
+        except FileExistsError:
+            pass
+        except OSError as e:
+            failed_dirs.add(d)
+            report.failed.append((os.path.join(current_path, d), e))
+
+    move = os.replace if replace else _rename_no_replace
+    for f in files:
+        if os.path.dirname(f) in failed_dirs:
+            continue
+
+        src = os.path.join(current_path, f)
+        try:
+            move(src, os.path.join(new_path, f))
+        except FileExistsError:
+            report.skipped.append(src)
+        except OSError as e:
+            report.failed.append((src, e))
+        else:
+            report.done.append(src)
+
+    if report.ok:
+        send2trash(current_path)
 
-        if entry.is_dir():
-            recursion_rmdir(entry.path)
+    return report
 
+
+class TrashBatch:
+    """
+    Collect paths and send them to the recycle bin by batches: each send2trash call has a high fixed cost
+    (one shell file operation on Windows), so one call per batch instead of one call per path.
+    Callback of each path is called after its batch is sent, with None or with the error of this path.
+    """
+
+    def __init__(self, size: Optional[int] = 256):
+        """
+        :param size: paths count which sends the batch, None - paths are only collected until flush() or merge()
+        """
+        self.size = size
+        self.items: list[tuple[str, Optional[Callable[[Optional[Exception]], None]]]] = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, path: str, callback: Callable[[Optional[Exception]], None] = None):
+        if not os.path.lexists(path):  # missing paths fail separately, so after a failed batch they mean "trashed"
+            e = FileNotFoundError(2, 'File not found', path)
+            return callback(e) if callback else None
+
+        self.items.append((path, callback))
+        if self.size is not None and len(self.items) >= self.size:
+            self.flush()
+
+    def merge(self, other: 'TrashBatch'):
+        """
+        Move paths collected by other batch (e.g. in another thread) to this one, full batches are sent.
+        """
+        items, other.items = other.items, []
+
+        for item in items:
+            self.items.append(item)
+            if self.size is not None and len(self.items) >= self.size:
+                self.flush()
+
+    def flush(self):
+        items, self.items = self.items, []
+        if not items:
+            return
+
+        try:
+            send2trash([p for p, _ in items])
+            errors = [None] * len(items)
+        except Exception:
+            errors = self._send_separately(items)
+
+        for (path, callback), e in zip(items, errors):
+            if callback:
+                callback(e)
+
+    @staticmethod
+    def _send_separately(items: list[tuple[str, Callable]]) -> list[Optional[Exception]]:
+        """
+        Find out failed paths of a failed batch, paths which don't exist anymore were trashed by the batch.
+        """
+        errors = []
+
+        for path, _ in items:
+            try:
+                if os.path.lexists(path):
+                    send2trash(path)
+            except Exception as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+
+        return errors
+
+
+def recursion_rmdir(path: str) -> DirReport:
+    report = DirReport()
+    dirs, files = _walk_tree(path)
+
+    for f in files:
+        try:
+            os.remove(p := os.path.join(path, f))
+        except OSError as e:
+            report.failed.append((p, e))
         else:
-            os.remove(entry.path)
+            report.done.append(p)
+
+    for d in reversed([''] + dirs):  # children are removed before parents
+        try:
+            os.rmdir(p := os.path.join(path, d))
+        except OSError as e:
+            report.failed.append((p, e))
+        else:
+            report.done.append(p)
+
+    return report
+
 
-    os.rmdir(path)
+# CreateFileW arguments of the directory access probe
+_FILE_ADD_FILE = 0x2
+_FILE_ADD_SUBDIRECTORY = 0x4
+_FILE_SHARE_ALL = 0x7  # read, write, delete
+_OPEN_EXISTING = 3
+_FILE_FLAG_BACKUP_SEMANTICS = 0x02000000  # required to open a directory
+
+
+@functools.cache
+def kernel32():  # kernel32.dll with prototypes of the used functions (Windows only)
+    import ctypes
+    from ctypes import wintypes
+
+    dll = ctypes.WinDLL('kernel32', use_last_error=True)
+    dll.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    dll.CreateFileW.restype = wintypes.HANDLE
+    dll.CloseHandle.argtypes = (wintypes.HANDLE,)
+    dll.GetDriveTypeW.argtypes = (wintypes.LPCWSTR,)
+    dll.GetDriveTypeW.restype = wintypes.UINT
+    dll.INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    return dll
+
+
+def can_write_dir(path: str) -> bool:
+    """
+    Read-only check that files and folders can be created in the directory. On Windows the directory is opened
+    with "add file / add subdirectory" access, which is checked against its ACL (os.access checks only
+    the read-only attribute there), on POSIX os.access is used. Nothing is written.
+    """
+    if os.name != 'nt':
+        return os.path.isdir(path) and os.access(path, os.W_OK | os.X_OK)
+
+    k32 = kernel32()
+    handle = k32.CreateFileW(path, _FILE_ADD_FILE | _FILE_ADD_SUBDIRECTORY, _FILE_SHARE_ALL, None,
+                             _OPEN_EXISTING, _FILE_FLAG_BACKUP_SEMANTICS, None)
+
+    if handle is None or handle == k32.INVALID_HANDLE_VALUE:  # access denied, not found, ...
+        return False
+
+    k32.CloseHandle(handle)
+    return os.path.isdir(path)
+
+
+_DRIVE_REMOTE = 4
+
+
+def is_remote_drive(root: str) -> bool:
+    """
+    Whether the drive root (e.g. "Z:\\") is a mapped network drive, always False on POSIX.
+    """
+    return os.name == 'nt' and kernel32().GetDriveTypeW(root) == _DRIVE_REMOTE
 
 
 def resource_path(relative_path):
@@ -0,0 +1,341 @@
+"""
+File system watcher of the Start Menu dirs. A backend (inotify on Linux, ReadDirectoryChangesW on Windows) reports
+changed paths, EventCoalescer debounces them into keys of changed top-level folders, so a burst of events
+(e.g. an installer which creates 200 shortcuts) is one rescan of the affected folders only.
+"""
+import os
+import sys
+import time
+import queue
+import select
+import struct
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Callable
+
+from . import log
+from .utils import kernel32
+
+
+LOG = log.getLogger(__name__)
+
+
+@dataclass
+class WatchChanges:
+    keys: set[str] = field(default_factory=set)  # SMFolder.key of changed top-level folders
+    full: bool = False  # a SM dir itself is changed (or events were lost), everything must be rescanned
+
+    def __bool__(self) -> bool:
+        return self.full or bool(self.keys)
+
+    def merge(self, other: 'WatchChanges') -> None:
+        self.keys |= other.keys
+        self.full = self.full or other.full
+
+
+class EventCoalescer:
+    """
+    Collect changed paths and give them out as one WatchChanges when no event came for `quiet` seconds,
+    or when `max_delay` seconds passed since the first collected event (so endless writes still update).
+    """
+    def __init__(self,
+                 roots: Iterable[str],
+                 *,
+                 quiet: float = 0.3,
+                 max_delay: float = 2.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.roots = [os.path.normpath(r) for r in roots]
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.clock = clock
+        self.changes = WatchChanges()
+        self.events = 0
+        self._first = self._last = 0.0
+
+    def add(self, path: str) -> None:
+        path = os.path.normpath(path)
+
+        for root in self.roots:
+            if path == root:
+                self.changes.full = True
+                break
+
+            if path.startswith(root) and path[len(root)] == os.sep:
+                self.changes.keys.add(path[len(root) + 1:].split(os.sep, 1)[0].lower())
+                break
+        else:
+            return
+
+        now = self.clock()
+        if not self.events:
+            self._first = now
+
+        self._last = now
+        self.events += 1
+
+    def due(self) -> Optional[float]:  # -> seconds until flush, None if nothing is collected
+        if not self.events:
+            return None
+
+        now = self.clock()
+        return max(0.0, min(self._last + self.quiet, self._first + self.max_delay) - now)
+
+    def flush(self) -> Optional[WatchChanges]:
+        if self.due() != 0.0:
+            return None
+
+        changes, self.changes = self.changes, WatchChanges()
+        LOG.debug(f'Coalesce {self.events} file system events: full rescan {changes.full}, '
+                  f'folders {sorted(changes.keys)}')
+        self.events = 0
+        return changes
+
+
+class WatchBackend(ABC):
+    def __init__(self, roots: Iterable[str]):
+        self.roots = list(roots)
+
+    @abstractmethod
+    def read(self, timeout: float) -> list[str]:
+        """
+        Wait up to timeout for events and return changed paths (a root itself if its events were lost).
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+# inotify(7)
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len (followed by name)
+
+
+class InotifyBackend(WatchBackend):
+    """
+    inotify watches a single directory, so every directory of the tree is watched and new ones are added as
+    they appear. Only names changes are watched (created, removed, renamed), shortcuts contents are not shown.
+    """
+    MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    def __init__(self, roots: Iterable[str]):
+        import ctypes
+
+        super().__init__(roots)
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.watches: dict[int, str] = {}  # watch descriptor: directory path
+        for root in self.roots:
+            self._add_tree(root)
+
+    def _add_tree(self, path: str) -> None:
+        # errors (directory removed meanwhile, watches limit) only leave the directory unwatched
+        for current, dirs, _ in os.walk(path):
+            if (wd := self._libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)) >= 0:
+                self.watches[wd] = current
+
+    def read(self, timeout: float) -> list[str]:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 << 10)
+        except BlockingIOError:
+            return []
+
+        paths, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            name = data[offset + _INOTIFY_EVENT.size:offset + _INOTIFY_EVENT.size + length].rstrip(b'\0')
+            offset += _INOTIFY_EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                paths.extend(self.roots)
+                continue
+
+            if (directory := self.watches.get(wd)) is None:
+                continue
+
+            if mask & IN_IGNORED:  # watched directory is removed
+                del self.watches[wd]
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+
+            paths.append(path)
+
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+# ReadDirectoryChangesW
+FILE_LIST_DIRECTORY = 0x1
+FILE_SHARE_ALL = 0x7  # read, write, delete
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x1
+FILE_NOTIFY_CHANGE_DIR_NAME = 0x2
+
+_NOTIFY_INFORMATION = struct.Struct('<3I')  # NextEntryOffset, Action, FileNameLength (followed by name)
+
+
+def _read_notify_information(data: bytes) -> list[str]:  # -> names (relative paths) of FILE_NOTIFY_INFORMATION
+    names, offset = [], 0
+
+    while True:
+        next_offset, _, length = _NOTIFY_INFORMATION.unpack_from(data, offset)
+        start = offset + _NOTIFY_INFORMATION.size
+        names.append(data[start:start + length].decode('utf-16-le'))
+
+        if not next_offset:
+            return names
+
+        offset += next_offset
+
+
+class ReadDirectoryChangesBackend(WatchBackend):
+    """
+    Each root is watched (with its subtree) by a blocking ReadDirectoryChangesW call in its own thread,
+    close() cancels the calls.
+    """
+    FILTER = FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_DIR_NAME
+
+    def __init__(self, roots: Iterable[str]):
+        import ctypes
+        from ctypes import wintypes
+
+        super().__init__(roots)
+        self._k32 = kernel32()
+        self._k32.ReadDirectoryChangesW.argtypes = (wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD, wintypes.BOOL,
+                                                    wintypes.DWORD, wintypes.LPDWORD, wintypes.LPVOID,
+                                                    wintypes.LPVOID)
+        self._k32.CancelIoEx.argtypes = (wintypes.HANDLE, wintypes.LPVOID)
+        self._ctypes = ctypes
+        self.queue: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self.closed = False
+        self.handles = []
+        self.threads = []
+
+        for root in self.roots:
+            handle = self._k32.CreateFileW(root, FILE_LIST_DIRECTORY, FILE_SHARE_ALL, None, OPEN_EXISTING,
+                                           FILE_FLAG_BACKUP_SEMANTICS, None)
+            if handle is None or handle == self._k32.INVALID_HANDLE_VALUE:
+                LOG.warning(f'Can\'t watch "{root}" ({self._ctypes.WinError(self._ctypes.get_last_error())})')
+                continue
+
+            thread = threading.Thread(target=self._watch, args=(root, handle), name=f'watch {root}', daemon=True)
+            self.handles.append(handle)
+            self.threads.append(thread)
+            thread.start()
+
+    def _watch(self, root: str, handle: int) -> None:
+        buffer = self._ctypes.create_string_buffer(64 << 10)
+        returned = self._ctypes.c_ulong()
+
+        while self._k32.ReadDirectoryChangesW(handle, buffer, len(buffer), True, self.FILTER,
+                                              self._ctypes.byref(returned), None, None):
+            if not returned.value:  # buffer overflow, events are lost
+                self.queue.put(root)
+                continue
+
+            for name in _read_notify_information(buffer.raw[:returned.value]):
+                self.queue.put(os.path.join(root, name))
+
+        if not self.closed:  # root is removed or became inaccessible
+            self.queue.put(root)
+
+    def read(self, timeout: float) -> list[str]:
+        try:
+            paths = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while True:
+            try:
+                paths.append(self.queue.get_nowait())
+            except queue.Empty:
+                return paths
+
+    def close(self) -> None:
+        self.closed = True
+
+        for handle in self.handles:
+            self._k32.CancelIoEx(handle, None)
+
+        for thread in self.threads:
+            thread.join()
+
+        for handle in self.handles:
+            self._k32.CloseHandle(handle)
+
+
+def get_backend(roots: Iterable[str]) -> Optional[WatchBackend]:
+    """
+    Backend of the platform, None if there is no one (or it failed to start) - changes are not watched then.
+    """
+    if sys.platform.startswith('linux'):
+        backend_class = InotifyBackend
+    elif os.name == 'nt':
+        backend_class = ReadDirectoryChangesBackend
+    else:
+        return None
+
+    try:
+        return backend_class(roots)
+
+    except (OSError, AttributeError) as e:  # AttributeError - no inotify functions in libc
+        LOG.warning(f'Failed to watch Start Menu dirs ({e.__class__.__name__}: {e})')
+        return None
+
+
+class Watcher:
+    """
+    Backend events coalesced into WatchChanges by poll().
+    """
+    def __init__(self, roots: Iterable[str], backend: WatchBackend, **coalescer_options):
+        self.backend = backend
+        self.coalescer = EventCoalescer(roots, **coalescer_options)
+
+    def poll(self, timeout: float) -> Optional[WatchChanges]:
+        """
+        Wait up to timeout (longer if collected events become due later) for coalesced changes.
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            due = self.coalescer.due()
+            wait = max(0.0, deadline - time.monotonic()) if due is None else due
+
+            for path in self.backend.read(wait):
+                self.coalescer.add(path)
+
+            if (changes := self.coalescer.flush()) is not None:
+                return changes
+
+            if self.coalescer.due() is None and time.monotonic() >= deadline:
+                return None
+
+    def close(self) -> None:
+        self.backend.close()
@@ -1,8 +1,10 @@
+import sys
 import argparse
 import cleaner
 
 
-parser = argparse.ArgumentParser('Start Menu Cleaner')
+parser = argparse.ArgumentParser('Start Menu Cleaner', add_help=False, allow_abbrev=False)  # the rest is for cli
+parser.add_argument('-h', '--help', action='store_true', help='show this help message and exit')
 parser.add_argument(
     '--logging',
     help=f'full - recording full work in a single file, '
@@ -17,11 +19,24 @@ parser.add_argument(
     choices=['classic', 'material'],
     default='material'
 )
+parser.add_argument(
+    '--headless',
+    help='clean without GUI (for scripts), see "--headless --help" for its arguments',
+    action='store_true'
+)
 
 
 def main():
-    args = parser.parse_args()
-    style = getattr(cleaner.gui.Style, args.style.upper())
+    args, rest = parser.parse_known_args()  # before any app data is set up: --help and errors only print
+
+    if not args.headless:
+        if args.help:
+            parser.print_help()
+            sys.exit(0)
+
+        if rest:
+            parser.error(f'unrecognized arguments: {" ".join(rest)}')
+
     if args.logging == 'full':
         cleaner.LOG.add_file_handler()
         cleaner.log.getLogger('cleaner.menu.clean').WRITE_LOG_FILE = False
@@ -29,6 +44,14 @@ def main():
     elif args.logging == 'cleaning':
         cleaner.log.getLogger('cleaner.menu.clean').KEEP_LOG_FILE = True
 
+    if args.headless:
+        from cleaner import cli
+        sys.exit(cli.main(rest + ['--help'] if args.help else rest))  # cli sets up app data after its arguments
+
+    cleaner.init()
+
+    style = getattr(cleaner.gui.Style, args.style.upper())
+
     cleaner.LOG.info(f'Application start ({style})')
 
     app = cleaner.widgets.QApplication([])
@@ -43,6 +66,7 @@ def main():
     cleaner.InaccessibleDirsWarning(window).warn()
 
     app.exec()
+    cleaner.StartMenu.target_cache.save()  # targets resolved one by one (icons, rename) since the last scan
 
 
 if __name__ == '__main__':